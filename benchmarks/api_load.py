@@ -0,0 +1,150 @@
+"""
+Teste de carga da API de disponibilidade (src/services/availability_api.py).
+
+    python -m benchmarks.api_load                          # carga sintética 1x, 10s, 64 conexões
+    python -m benchmarks.api_load --scale 10 --duration 30 --connections 128
+    python -m benchmarks.api_load --url http://127.0.0.1:8503   # servidor já em execução
+
+Sem --url, grava a carga sintética como snapshot temporário e sobe `python -m src.cli serve`
+em um subprocesso preso a um único núcleo (--cpu). Os clientes (asyncio, conexões keep-alive)
+rodam neste processo e alternam consultas de salas livres e de agenda em datas/horários
+aleatórios. Ao final imprime requisições por segundo e latências (p50/p95/p99).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+from urllib.parse import quote, urlsplit
+
+from src.core import pipeline
+from src.core.synthetic import WorkloadConfig, generate_workload
+from src.services.reccuring_service import expand_recurring_events
+
+def _targets(dfs, quantidade: int, seed: int) -> List[str]:
+    """Caminhos de consulta variados (metade salas livres, metade agenda de sala)"""
+    rng = random.Random(seed)
+    datas = sorted(expand_recurring_events(dfs['Reservas'])['Data Ocorrência'].unique())
+    salas = list(dfs['Salas']['Sala'])
+    alvos = []
+    for i in range(quantidade):
+        data = rng.choice(datas)
+        if i % 2 == 0:
+            inicio = rng.randint(7, 20)
+            alvos.append(f"/disponibilidade?data={data}&inicio={inicio:02d}:00&fim={inicio + rng.randint(1, 3):02d}:00")
+        else:
+            alvos.append(f"/salas/{quote(rng.choice(salas))}/agenda?data={data}")
+    return alvos
+
+async def _client(host: str, port: int, alvos: List[str], fim: float, latencias: List[float], erros: List[int]):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = random.randrange(len(alvos))
+    try:
+        while time.perf_counter() < fim:
+            alvo = alvos[i % len(alvos)]
+            i += 1
+            inicio = time.perf_counter()
+            writer.write(f"GET {alvo} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+            cabecalho = await reader.readuntil(b"\r\n\r\n")
+            tamanho = 0
+            for linha in cabecalho.split(b"\r\n"):
+                if linha.lower().startswith(b"content-length:"):
+                    tamanho = int(linha.split(b":")[1])
+            await reader.readexactly(tamanho)
+            latencias.append(time.perf_counter() - inicio)
+            if not cabecalho.startswith(b"HTTP/1.1 200"):
+                erros.append(1)
+    finally:
+        writer.close()
+
+async def _run(host: str, port: int, alvos: List[str], conexoes: int, duracao: float):
+    latencias: List[float] = []
+    erros: List[int] = []
+    # Aquecimento (preenche o cache de respostas do servidor como em uso real)
+    await _client(host, port, alvos, time.perf_counter() + min(2.0, duracao / 5), [], [])
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, alvos, inicio + duracao, latencias, erros) for _ in range(conexoes)))
+    return latencias, len(erros), time.perf_counter() - inicio
+
+def _wait_ready(host: str, port: int, processo: subprocess.Popen, timeout: float = 300):
+    limite = time.time() + timeout
+    while time.time() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError("O servidor terminou antes de ficar pronto")
+        try:
+            asyncio.run(asyncio.wait_for(asyncio.open_connection(host, port), 1))
+            return
+        except (OSError, asyncio.TimeoutError):
+            time.sleep(0.2)
+    raise RuntimeError("Servidor não respondeu a tempo")
+
+def _percentil(valores: List[float], p: float) -> float:
+    return valores[min(len(valores) - 1, int(len(valores) * p))] * 1000
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Servidor já em execução (senão sobe um com a carga sintética)")
+    parser.add_argument("--scale", type=int, default=1, help="Fator de escala da carga sintética")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8599, help="Porta do servidor iniciado pelo teste")
+    parser.add_argument("--cpu", type=int, default=0, help="Núcleo do servidor iniciado pelo teste (-1 = sem afinidade)")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos de medição")
+    parser.add_argument("--queries", type=int, default=2000, help="Consultas distintas no ciclo dos clientes")
+    parser.add_argument("--out", help="Grava o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    dfs = generate_workload(WorkloadConfig(seed=args.seed).scaled(args.scale))
+    alvos = _targets(dfs, args.queries, args.seed)
+
+    processo: Optional[subprocess.Popen] = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", args.port
+        snapshot = tempfile.mkdtemp(prefix="api_load-")
+        pipeline.save_snapshot(dfs, snapshot)
+        afinidade = None
+        if args.cpu >= 0 and hasattr(os, 'sched_setaffinity'):
+            afinidade = lambda: os.sched_setaffinity(0, {args.cpu})
+        processo = subprocess.Popen([sys.executable, "-m", "src.cli", "serve", "--snapshot", snapshot,
+                                     "--host", host, "--port", str(port)], preexec_fn=afinidade)
+        if hasattr(os, 'sched_setaffinity') and args.cpu >= 0 and len(os.sched_getaffinity(0)) > 1:
+            # Clientes fora do núcleo do servidor
+            os.sched_setaffinity(0, os.sched_getaffinity(0) - {args.cpu})
+
+    try:
+        if processo is not None:
+            _wait_ready(host, port, processo)
+        latencias, erros, decorrido = asyncio.run(_run(host, port, alvos, args.connections, args.duration))
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+    latencias.sort()
+    resultado = {
+        'requisicoes': len(latencias),
+        'erros': erros,
+        'segundos': round(decorrido, 2),
+        'req_por_segundo': round(len(latencias) / decorrido, 1),
+        'latencia_ms': {p: round(_percentil(latencias, q), 2) for p, q in
+                        (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))} if latencias else {},
+        'conexoes': args.connections,
+        'ocorrencias_escala': args.scale,
+        'servidor_cpu': None if args.url or args.cpu < 0 else args.cpu,
+    }
+    print(json.dumps(resultado, ensure_ascii=False, indent=2))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+    return 0 if erros == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Benchmark por etapa do pipeline sobre cargas sintéticas (1x/10x/100x o tamanho real).
+
+    python -m benchmarks.pipeline_bench                       # 1x, 10x e 100x
+    python -m benchmarks.pipeline_bench --scales 1,10 --repeat 3
+    python -m benchmarks.pipeline_bench --compare benchmarks/results/<anterior>.json
+
+Cada etapa é cronometrada sem tracemalloc (melhor de --repeat execuções) e depois
+executada uma vez com tracemalloc para medir o pico de memória. Etapas cuja projeção
+a partir da escala anterior passe de --max-seconds são registradas como puladas.
+Os resultados são gravados em JSON em benchmarks/results/.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from src.core.synthetic import WorkloadConfig, generate_workload
+from src.services.calendar_service import generate_color_palette, prepare_events
+from src.services.conflicts_service import find_conflicts
+from src.services.reccuring_service import expand_recurring_events
+from src.services.recommendation_service import generate_recommendations
+from src.services.validation_service import validate_reservations
+
+STAGES = ('validate', 'expand', 'conflicts', 'recommendations', 'prepare_events')
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), timeout=10).stdout.strip() or 'desconhecido'
+    except (OSError, subprocess.SubprocessError):
+        return 'desconhecido'
+
+def measure(func: Callable, repeat: int, memory: bool) -> Dict:
+    """Executa func e retorna tempo (melhor de `repeat`), pico de memória e o último resultado"""
+    tempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        resultado = func()
+        tempos.append(time.perf_counter() - inicio)
+
+    pico_mb = None
+    if memory:
+        tracemalloc.start()
+        func()
+        pico_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+
+    return {'segundos': min(tempos), 'pico_memoria_mb': pico_mb, 'resultado': resultado}
+
+def _estimate(nome: str, fator: int, anterior: Optional[Dict]) -> Optional[float]:
+    """Tempo projetado (linear) a partir da escala anterior; None se não houver medição"""
+    if not anterior or nome not in anterior['etapas'] or 'segundos' not in anterior['etapas'][nome]:
+        return None
+    return anterior['etapas'][nome]['segundos'] * fator / anterior['fator']
+
+def run_scale(fator: int, config: WorkloadConfig, stages: List[str], repeat: int, memory: bool,
+              limite_s: Optional[float] = None, anterior: Optional[Dict] = None) -> Dict:
+    dfs = generate_workload(config.scaled(fator))
+    df_reservas, df_salas, df_grupos = dfs['Reservas'], dfs['Salas'], dfs['Grupos']
+    entrada = {'df_reservas': df_reservas}
+
+    # Cada etapa depende da saída das anteriores, que sempre rodam (mesmo fora de --stages).
+    # Se expand ou conflicts for pulada por exceder o limite de tempo, as seguintes também são.
+    etapas_exec = [
+        ('validate', lambda e: validate_reservations(e['df_reservas'], df_salas, df_grupos), 'df_reservas', 'relatorio'),
+        ('expand', lambda e: expand_recurring_events(e['df_reservas']), 'df_reservas', 'df_expandido'),
+        ('conflicts', lambda e: find_conflicts(e['df_expandido']), 'df_expandido', 'conflitos'),
+        ('recommendations', lambda e: generate_recommendations(e['df_expandido'], df_salas, df_grupos,
+                                                               e['conflitos']), 'conflitos', 'sugestoes'),
+        ('prepare_events', lambda e: prepare_events(e['df_expandido'], e['cores'], e['ids_em_conflito']),
+         'df_expandido', 'eventos'),
+    ]
+    ultima = max(i for i, (nome, *_) in enumerate(etapas_exec) if nome in stages)
+
+    etapas = {}
+    for nome, func, chave_entrada, chave_saida in etapas_exec[:ultima + 1]:
+        if nome == 'prepare_events':
+            entrada['cores'] = generate_color_palette(sorted(entrada['df_expandido']['Grupo'].unique()))
+            entrada['ids_em_conflito'] = ({c['id_reserva1'] for c in entrada['conflitos']} |
+                                          {c['id_reserva2'] for c in entrada['conflitos']})
+
+        estimativa = _estimate(nome, fator, anterior)
+        if limite_s is not None and estimativa is not None and estimativa > limite_s:
+            etapas[nome] = {'pulada': True, 'estimativa_s': round(estimativa, 1)}
+            if nome in ('expand', 'conflicts'):
+                break
+            continue
+
+        m = measure(lambda: func(entrada), repeat, memory and nome in stages)
+        entrada[chave_saida] = m.pop('resultado')
+        etapas[nome] = {**m, 'linhas_entrada': len(entrada[chave_entrada]), 'linhas_saida': len(entrada[chave_saida])}
+
+    for nome, etapa in list(etapas.items()):
+        if nome not in stages:
+            del etapas[nome]
+            continue
+        if etapa.get('pulada'):
+            continue
+        etapa['linhas_por_segundo'] = round(etapa['linhas_entrada'] / etapa['segundos'], 1) if etapa['segundos'] else None
+        etapa['segundos'] = round(etapa['segundos'], 4)
+        if etapa['pico_memoria_mb'] is not None:
+            etapa['pico_memoria_mb'] = round(etapa['pico_memoria_mb'], 2)
+
+    return {'fator': fator, 'reservas': len(df_reservas), 'salas': len(df_salas), 'grupos': len(df_grupos),
+            'etapas': etapas}
+
+def compare(atual: Dict, anterior: Dict):
+    """Imprime a razão de tempo (atual / anterior) por escala e etapa"""
+    anteriores = {r['fator']: r['etapas'] for r in anterior['escalas']}
+    print(f"\nComparação com {anterior.get('commit')} ({anterior.get('data')}):")
+    for escala in atual['escalas']:
+        for nome, etapa in escala['etapas'].items():
+            base = anteriores.get(escala['fator'], {}).get(nome)
+            if base and base.get('segundos') and etapa.get('segundos'):
+                razao = etapa['segundos'] / base['segundos']
+                alerta = "  ⚠ regressão" if razao > 1.2 else ""
+                print(f"  {escala['fator']:>4}x {nome:<16} {base['segundos']:>9.3f}s → {etapa['segundos']:>9.3f}s "
+                      f"({razao:.2f}x){alerta}")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1,10,100", help="Fatores de escala separados por vírgula")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"Etapas medidas ({', '.join(STAGES)})")
+    parser.add_argument("--repeat", type=int, default=1, help="Execuções cronometradas por etapa (usa a melhor)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--conflict-density", type=float, default=WorkloadConfig.densidade_conflitos)
+    parser.add_argument("--max-seconds", type=float, default=600,
+                        help="Pula a etapa se a projeção a partir da escala anterior passar deste limite (0 = sem limite)")
+    parser.add_argument("--no-memory", action="store_true", help="Não mede pico de memória (mais rápido)")
+    parser.add_argument("--out", help="Arquivo JSON de saída (padrão: benchmarks/results/<data>-<commit>.json)")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    desconhecidas = set(stages) - set(STAGES)
+    if not stages or desconhecidas:
+        parser.error(f"Etapas desconhecidas: {', '.join(sorted(desconhecidas))}")
+    config = WorkloadConfig(seed=args.seed, densidade_conflitos=args.conflict_density)
+
+    resultado = {
+        'commit': _git_commit(),
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'config': {'reservas': config.reservas, 'salas': config.salas, 'grupos': config.grupos,
+                   'mix': config.mix, 'densidade_conflitos': config.densidade_conflitos, 'seed': config.seed},
+        'escalas': [],
+    }
+
+    anterior = None
+    for fator in sorted(int(f) for f in args.scales.split(',')):
+        escala = run_scale(fator, config, stages, args.repeat, not args.no_memory, args.max_seconds or None, anterior)
+        resultado['escalas'].append(escala)
+        anterior = escala
+        for nome, etapa in escala['etapas'].items():
+            if etapa.get('pulada'):
+                print(f"{fator:>4}x {nome:<16} pulada (projeção de {etapa['estimativa_s']:.0f}s > --max-seconds)")
+                continue
+            memoria = f"{etapa['pico_memoria_mb']:>8.1f} MB" if etapa['pico_memoria_mb'] is not None else ""
+            print(f"{fator:>4}x {nome:<16} {etapa['linhas_entrada']:>8} → {etapa['linhas_saida']:>8} linhas "
+                  f"{etapa['segundos']:>9.3f}s {etapa['linhas_por_segundo'] or 0:>12.0f} linhas/s {memoria}",
+                  flush=True)
+
+    saida = args.out or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{resultado['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {saida}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(resultado, json.load(f))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,418 @@
+"""
+Teste de carga de sessões simultâneas do app Streamlit: latência das reexecuções (reruns) e
+memória do servidor.
+
+    python -m benchmarks.session_load                          # 8 sessões, 20 interações cada
+    python -m benchmarks.session_load --sessions 32 --interactions 50 --scale 4
+    python -m benchmarks.session_load --url http://127.0.0.1:8501 --pid 12345   # servidor já em execução
+
+Sem --url, grava a carga sintética como snapshot temporário e sobe `streamlit run app.py` em um
+subprocesso (dados offline, sem Google Sheets; cache de resultados em diretório temporário).
+Os clientes são headless: falam o protocolo do navegador pelo websocket (`/_stcore/stream`),
+mandam o estado dos widgets a cada interação e medem do envio até o fim da execução
+(`script_finished`). Widgets dentro de fragmentos reexecutam só o fragmento, como no navegador.
+
+Cada sessão abre o app e faz interações aleatórias entre:
+- calendario_semana: navega para outra semana (valor do componente do calendário);
+- calendario_filtro: dia da semana, grupo ou "Apenas Conflitos";
+- conflitos_pagina / conflitos_ordem: paginação e ordenação da lista de conflitos;
+- exportacao: troca o formato e baixa a exportação das reservas (pedido do arquivo + download).
+
+Ao final imprime p50/p95 por tipo de interação e geral, a abertura das sessões e a memória
+(RSS) do servidor: antes das sessões, pico e ao final. Com --url, a memória só é medida com --pid.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+import pandas as pd
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError, HTTPRequest
+from tornado.websocket import websocket_connect
+
+from benchmarks.pipeline_bench import _git_commit
+from src.core import pipeline
+from src.core.synthetic import WorkloadConfig, generate_workload
+from src.services.reccuring_service import expand_recurring_events
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INTERACOES = ('calendario_semana', 'calendario_filtro', 'conflitos_pagina', 'conflitos_ordem', 'exportacao')
+
+# Status de script_finished que encerram uma execução (a de FINISHED_EARLY_FOR_RERUN continua)
+FIM_EXECUCAO = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY)
+
+class SessionClient:
+    """Uma sessão do navegador: conexão websocket, widgets da última tela e estado enviado ao servidor"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip('/')
+        self.widgets: Dict[str, tuple] = {}  # id → (tipo, proto, fragment_id)
+        self.estados: Dict[str, WidgetState] = {}
+        self.session_id = ""
+        self.excecoes: List[str] = []
+        self._ws = None
+
+    async def connect(self):
+        ws_url = self.url.replace('http', 'ws', 1) + "/_stcore/stream"
+        self._ws = await websocket_connect(HTTPRequest(ws_url), subprotocols=["streamlit"],
+                                          max_message_size=1024 * 1024 * 1024)
+
+    def close(self):
+        if self._ws is not None:
+            self._ws.close()
+
+    async def _receive(self) -> ForwardMsg:
+        bruto = await self._ws.read_message()
+        if bruto is None:
+            raise ConnectionError("O servidor fechou a conexão")
+        msg = ForwardMsg()
+        msg.ParseFromString(bruto)
+        return msg
+
+    async def run(self, fragment_id: str = "") -> float:
+        """Reexecuta o app (ou só o fragmento) com o estado atual dos widgets; retorna os segundos até o fim"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.widgets.extend(self.estados.values())
+        novos: Dict[str, tuple] = {}
+        fragmentos = set()
+        inicio = time.perf_counter()
+        await self._ws.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            recebida = await self._receive()
+            tipo = recebida.WhichOneof("type")
+            if tipo == "new_session":
+                self.session_id = recebida.new_session.initialize.session_id or self.session_id
+            elif tipo == "delta" and recebida.delta.WhichOneof("type") == "new_element":
+                fragmentos.add(recebida.delta.fragment_id)
+                self._element(recebida.delta.new_element, recebida.delta.fragment_id, novos)
+            elif tipo == "script_finished" and recebida.script_finished in FIM_EXECUCAO:
+                segundos = time.perf_counter() - inicio
+                break
+        # Numa execução parcial, os widgets dos fragmentos redesenhados são substituídos; os demais ficam
+        if fragment_id:
+            novos = {**{i: w for i, w in self.widgets.items() if w[2] not in fragmentos}, **novos}
+        self.widgets = novos
+        return segundos
+
+    def _element(self, elemento, fragment_id: str, widgets: Dict[str, tuple]):
+        tipo = elemento.WhichOneof("type")
+        if tipo == "exception":
+            self.excecoes.append(elemento.exception.message)
+            return
+        proto = getattr(elemento, tipo)
+        widget_id = proto.id if 'id' in proto.DESCRIPTOR.fields_by_name else ''
+        if widget_id:
+            widgets[widget_id] = (tipo, proto, fragment_id)
+
+    def widget(self, chave: Optional[str] = None, rotulo: Optional[str] = None,
+               prefixo: Optional[str] = None) -> Optional[tuple]:
+        """Widget da tela atual pela key (fim do id), pelo início da key ou pelo rótulo"""
+        for widget_id, (tipo, proto, fragment_id) in self.widgets.items():
+            key = widget_id.rsplit('-', 1)[-1] if chave or prefixo else None
+            if (chave and key == chave) or (prefixo and prefixo in widget_id) or \
+                    (rotulo and getattr(proto, 'label', None) == rotulo):
+                return widget_id, tipo, proto, fragment_id
+        return None
+
+    async def set_widget(self, widget: tuple, **valor) -> float:
+        """Altera o valor do widget (campo do WidgetState: string_value, int_value...) e reexecuta"""
+        widget_id, _, _, fragment_id = widget
+        estado = WidgetState(id=widget_id, **valor)
+        self.estados = {i: e for i, e in self.estados.items() if i in self.widgets}
+        self.estados[widget_id] = estado
+        return await self.run(fragment_id)
+
+    async def download(self, widget: tuple, http: AsyncHTTPClient) -> int:
+        """Pede o arquivo de um download_button com dados sob demanda e o baixa; retorna os bytes"""
+        proto = widget[2]
+        if proto.deferred_file_id:
+            msg = BackMsg()
+            msg.deferred_file_request.file_id = proto.deferred_file_id
+            msg.deferred_file_request.session_id = self.session_id
+            await self._ws.write_message(msg.SerializeToString(), binary=True)
+            while True:
+                recebida = await self._receive()
+                if recebida.WhichOneof("type") == "deferred_file_response":
+                    resposta = recebida.deferred_file_response
+                    if resposta.error_msg:
+                        raise RuntimeError(resposta.error_msg)
+                    url = resposta.url
+                    break
+        else:
+            url = proto.url
+        arquivo = await http.fetch(urljoin(self.url + '/', url.lstrip('/')))
+        return len(arquivo.body)
+
+def _semanas(dfs) -> List[pd.Timestamp]:
+    """Segundas-feiras do período com ocorrências (janelas do calendário)"""
+    datas = pd.to_datetime(expand_recurring_events(dfs['Reservas'])['Data Ocorrência'], dayfirst=True)
+    inicio = (datas.min() - timedelta(days=datas.min().weekday())).normalize()
+    return list(pd.date_range(inicio, datas.max(), freq='7D'))
+
+def _opcao(rng: random.Random, proto) -> str:
+    return rng.choice(list(proto.options))
+
+async def _interaction(tipo: str, cliente: SessionClient, rng: random.Random, semanas: List[pd.Timestamp],
+                       http: AsyncHTTPClient) -> Optional[float]:
+    """Executa uma interação do tipo; None se o widget não estiver na tela"""
+    if tipo == 'calendario_semana':
+        widget = cliente.widget(prefixo='full_calendar_')
+        if widget is None:
+            return None
+        semana = rng.choice(semanas)
+        vista = {'type': 'resourceTimeGridWeek', 'title': '',
+                 'activeStart': semana.isoformat(), 'activeEnd': (semana + timedelta(days=7)).isoformat(),
+                 'currentStart': semana.isoformat(), 'currentEnd': (semana + timedelta(days=7)).isoformat()}
+        return await cliente.set_widget(widget, json_value=json.dumps({'callback': 'eventsSet',
+                                                                       'eventsSet': {'view': vista}}))
+    if tipo == 'calendario_filtro':
+        escolha = rng.randrange(3)
+        if escolha == 0:
+            widget = cliente.widget(chave='calendar_start_weekday')
+            return widget and await cliente.set_widget(widget, string_value=_opcao(rng, widget[2]))
+        if escolha == 1:
+            widget = cliente.widget(rotulo='Grupos:')
+            return widget and await cliente.set_widget(widget, string_value=_opcao(rng, widget[2]))
+        widget = cliente.widget(chave='calendar_only_conflicts')
+        atual = cliente.estados.get(widget[0]) if widget else None
+        return widget and await cliente.set_widget(widget, bool_value=not (atual and atual.bool_value))
+    if tipo == 'conflitos_pagina':
+        widget = cliente.widget(chave='conflicts_list_page')
+        if widget is None:
+            return None
+        proto = widget[2]
+        ultima = int(proto.max) if proto.has_max else 1
+        pagina = rng.randint(1, max(1, ultima))
+        if proto.data_type == NumberInput.INT:
+            return await cliente.set_widget(widget, int_value=pagina)
+        return await cliente.set_widget(widget, double_value=float(pagina))
+    if tipo == 'conflitos_ordem':
+        widget = cliente.widget(chave='conflicts_sort')
+        return widget and await cliente.set_widget(widget, string_value=_opcao(rng, widget[2]))
+    if tipo == 'exportacao':
+        formato = cliente.widget(chave='reservas_export_format')
+        if formato is None:
+            return None
+        segundos = await cliente.set_widget(formato, int_value=rng.randrange(len(formato[2].options)))
+        botao = cliente.widget(chave='reservas_export_download')
+        if botao is None:
+            return None
+        inicio = time.perf_counter()
+        await cliente.download(botao, http)
+        return segundos + time.perf_counter() - inicio
+    raise ValueError(f"Interação desconhecida: {tipo}")
+
+async def _session(url: str, n: int, interacoes: int, pausa: float, semanas: List[pd.Timestamp], seed: int,
+                   largada: asyncio.Event, latencias: Dict[str, List[float]], erros: List[str],
+                   excecoes: List[str]):
+    rng = random.Random(seed + n)
+    http = AsyncHTTPClient()
+    cliente = SessionClient(url)
+    try:
+        await cliente.connect()
+        await largada.wait()
+        latencias['abertura'].append(await cliente.run())
+        for _ in range(interacoes):
+            await asyncio.sleep(rng.uniform(0, 2 * pausa))
+            tipo = rng.choice(INTERACOES)
+            try:
+                segundos = await _interaction(tipo, cliente, rng, semanas, http)
+            except HTTPClientError as e:
+                # Download do arquivo (ex.: 404 se o servidor já descartou o arquivo gerado); a sessão segue
+                erros.append(f"sessão {n}: download em '{tipo}': {e}")
+                continue
+            if segundos is None:
+                erros.append(f"sessão {n}: widget de '{tipo}' não encontrado")
+            else:
+                latencias[tipo].append(segundos)
+    except Exception as e:
+        erros.append(f"sessão {n}: {type(e).__name__}: {e}")
+    finally:
+        excecoes.extend(cliente.excecoes)
+        cliente.close()
+
+async def _warm_up(url: str, timeout: float = 600):
+    """Primeira sessão: espera o pipeline publicar o resultado completo (sem barra de progresso)"""
+    cliente = SessionClient(url)
+    await cliente.connect()
+    limite = time.time() + timeout
+    try:
+        while True:
+            await cliente.run()
+            if not any(tipo == 'progress' for tipo, _, _ in cliente.widgets.values()) and \
+                    cliente.widget(chave='conflicts_sort') is not None:
+                return
+            if time.time() > limite:
+                raise RuntimeError("O app não terminou de carregar a tempo")
+            await asyncio.sleep(1)
+    finally:
+        cliente.close()
+
+async def _run(url: str, sessoes: int, interacoes: int, pausa: float, semanas: List[pd.Timestamp], seed: int):
+    latencias: Dict[str, List[float]] = {tipo: [] for tipo in ('abertura',) + INTERACOES}
+    erros: List[str] = []
+    excecoes: List[str] = []
+    await _warm_up(url)
+    largada = asyncio.Event()
+    tarefas = [asyncio.create_task(_session(url, n, interacoes, pausa, semanas, seed, largada, latencias,
+                                            erros, excecoes)) for n in range(sessoes)]
+    await asyncio.sleep(0.5)  # todas conectadas antes da largada
+    inicio = time.perf_counter()
+    largada.set()
+    await asyncio.gather(*tarefas)
+    return latencias, erros, excecoes, time.perf_counter() - inicio
+
+class MemorySampler(threading.Thread):
+    """Amostra o RSS (MB) de um processo a cada `intervalo` segundos, via /proc"""
+
+    def __init__(self, pid: int, intervalo: float = 0.25):
+        super().__init__(daemon=True)
+        self.pid, self.intervalo = pid, intervalo
+        self.amostras: List[float] = []
+        self._parar = threading.Event()
+
+    def rss_mb(self) -> Optional[float]:
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for linha in f:
+                    if linha.startswith("VmRSS:"):
+                        return int(linha.split()[1]) / 1024
+        except OSError:
+            return None
+        return None
+
+    def run(self):
+        while not self._parar.is_set():
+            rss = self.rss_mb()
+            if rss is not None:
+                self.amostras.append(rss)
+            self._parar.wait(self.intervalo)
+
+    def stop(self):
+        self._parar.set()
+        self.join()
+
+def _wait_ready(url: str, processo: subprocess.Popen, timeout: float = 300):
+    limite = time.time() + timeout
+    while time.time() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError("O servidor terminou antes de ficar pronto")
+        try:
+            with urllib.request.urlopen(url + "/_stcore/health", timeout=1) as resposta:
+                if resposta.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError("Servidor não respondeu a tempo")
+
+def _percentil(valores: List[float], p: float) -> float:
+    return valores[min(len(valores) - 1, int(len(valores) * p))] * 1000
+
+def _resumo(valores: List[float]) -> Dict:
+    valores = sorted(valores)
+    if not valores:
+        return {'n': 0}
+    return {'n': len(valores), 'p50_ms': round(_percentil(valores, 0.5), 1),
+            'p95_ms': round(_percentil(valores, 0.95), 1), 'max_ms': round(valores[-1] * 1000, 1)}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Servidor já em execução (senão sobe um com a carga sintética)")
+    parser.add_argument("--pid", type=int, help="PID do servidor em --url (para medir a memória)")
+    parser.add_argument("--scale", type=int, default=1, help="Fator de escala da carga sintética")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8598, help="Porta do servidor iniciado pelo teste")
+    parser.add_argument("--sessions", type=int, default=8, help="Sessões simultâneas")
+    parser.add_argument("--interactions", type=int, default=20, help="Interações por sessão")
+    parser.add_argument("--think", type=float, default=0.5,
+                        help="Pausa média (s) entre as interações de uma sessão (uniforme entre 0 e o dobro)")
+    parser.add_argument("--out", help="Grava o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    dfs = generate_workload(WorkloadConfig(seed=args.seed).scaled(args.scale))
+    semanas = _semanas(dfs)
+
+    processo: Optional[subprocess.Popen] = None
+    pid = args.pid
+    if args.url:
+        url = args.url.rstrip('/')
+    else:
+        url = f"http://127.0.0.1:{args.port}"
+        temporario = tempfile.mkdtemp(prefix="session_load-")
+        snapshot = os.path.join(temporario, "snapshot")
+        pipeline.save_snapshot(dfs, snapshot)
+        secrets = os.path.join(temporario, "secrets.toml")
+        with open(secrets, 'w', encoding='utf-8') as f:
+            f.write(f"snapshot_dir = {json.dumps(snapshot)}\n"
+                    f"result_cache_dir = {json.dumps(os.path.join(temporario, 'cache'))}\n")
+        processo = subprocess.Popen([sys.executable, "-m", "streamlit", "run", "app.py",
+                                     "--server.port", str(args.port), "--server.address", "127.0.0.1",
+                                     "--server.headless", "true", "--server.fileWatcherType", "none",
+                                     "--browser.gatherUsageStats", "false", "--secrets.files", secrets],
+                                    cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        pid = processo.pid
+
+    memoria = MemorySampler(pid) if pid else None
+    try:
+        if processo is not None:
+            _wait_ready(url, processo)
+        inicial = memoria.rss_mb() if memoria else None
+        if memoria:
+            memoria.start()
+        latencias, erros, excecoes, decorrido = asyncio.run(
+            _run(url, args.sessions, args.interactions, args.think, semanas, args.seed))
+        final = memoria.rss_mb() if memoria else None
+    finally:
+        if memoria and memoria.is_alive():
+            memoria.stop()
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+    interacoes = [s for tipo in INTERACOES for s in latencias[tipo]]
+    resultado = {
+        'commit': _git_commit(),
+        'sessoes': args.sessions,
+        'interacoes_por_sessao': args.interactions,
+        'pausa_media_s': args.think,
+        'ocorrencias_escala': args.scale,
+        'segundos': round(decorrido, 2),
+        'abertura': _resumo(latencias['abertura']),
+        'interacoes': _resumo(interacoes),
+        'por_tipo': {tipo: _resumo(latencias[tipo]) for tipo in INTERACOES},
+        'memoria_servidor_mb': {
+            'antes': round(inicial, 1) if inicial else None,
+            'pico': round(max(memoria.amostras), 1) if memoria and memoria.amostras else None,
+            'final': round(final, 1) if final else None,
+        },
+        'excecoes_no_app': len(excecoes),
+        'erros': erros[:20],
+    }
+    print(json.dumps(resultado, ensure_ascii=False, indent=2))
+    if excecoes:
+        print(f"Exceções no app (primeira): {excecoes[0]}", file=sys.stderr)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+    return 0 if not erros and not excecoes else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
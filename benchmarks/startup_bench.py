@@ -0,0 +1,151 @@
+"""
+Benchmark de inicialização do app Streamlit: custo de import de cada módulo e tempo até a
+primeira renderização completa.
+
+    python -m benchmarks.startup_bench
+    python -m benchmarks.startup_bench --baseline benchmarks/results/startup-<anterior>.json
+    python -m benchmarks.startup_bench --max-import-ms 2000
+
+- Import: `python -X importtime -c "import app"` em um processo novo; lista os módulos do projeto
+  e os pacotes de terceiros mais caros (tempo acumulado, em ms).
+- Primeira renderização: processo novo que executa app.py com o AppTest do Streamlit sobre um
+  snapshot sintético; medido a frio (cache de resultados vazio) e a quente (cache em disco pronto).
+
+Com --baseline, sai com código 1 se alguma métrica piorar mais que --tolerance (padrão 20%);
+com --max-import-ms, também se o import do app passar desse limite.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+# Métricas comparadas com a linha de base (menor é melhor)
+METRICAS = ('import_app_ms', 'primeira_renderizacao_fria_s', 'primeira_renderizacao_quente_s')
+
+def import_costs(modulo: str = "app", top: int = 10) -> Dict:
+    """Tempo acumulado de import (ms) do módulo, dos módulos src.* e dos pacotes de terceiros mais caros"""
+    saida = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"], cwd=RAIZ,
+                           capture_output=True, text=True, timeout=300).stderr
+    acumulado: Dict[str, float] = {}
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        partes = linha[len("import time:"):].split("|")
+        try:
+            acumulado[partes[2].strip()] = int(partes[1]) / 1000
+        except ValueError:
+            continue  # cabeçalho
+    projeto = {m: round(t, 1) for m, t in acumulado.items() if m.startswith("src.")}
+    terceiros = {m: round(t, 1) for m, t in acumulado.items()
+                 if "." not in m and m not in (modulo, "src") and not m.startswith("_")}
+    return {
+        'total_ms': round(acumulado.get(modulo, 0.0), 1),
+        'projeto_ms': dict(sorted(projeto.items(), key=lambda x: -x[1])),
+        'terceiros_ms': dict(sorted(terceiros.items(), key=lambda x: -x[1])[:top]),
+    }
+
+def _render_child(snapshot: str, cache_dir: str):
+    """Executado em processo novo: mede do início do processo até o fim da primeira execução do app"""
+    inicio = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(RAIZ, "app.py"), default_timeout=600)
+    at.secrets["snapshot_dir"] = snapshot
+    at.secrets["result_cache_dir"] = cache_dir
+    at.run()
+    print(json.dumps({'segundos': time.perf_counter() - inicio,
+                      'excecoes': [e.message for e in at.exception]}))
+
+def first_render(snapshot: str, cache_dir: str) -> Dict:
+    inicio = time.perf_counter()
+    saida = subprocess.run([sys.executable, "-m", "benchmarks.startup_bench", "--child-render", snapshot, cache_dir],
+                           cwd=RAIZ, capture_output=True, text=True, timeout=900)
+    total = time.perf_counter() - inicio
+    linhas = [l for l in saida.stdout.splitlines() if l.startswith("{")]
+    if not linhas:
+        raise RuntimeError(f"Falha ao renderizar o app:\n{saida.stderr[-2000:]}")
+    resultado = json.loads(linhas[-1])
+    # Inclui o início do interpretador (o processo inteiro até a primeira tela)
+    return {'segundos': round(total, 3), 'excecoes': resultado['excecoes']}
+
+def regressions(atual: Dict, base: Dict, tolerancia: float) -> List[str]:
+    problemas = []
+    for metrica in METRICAS:
+        if base.get(metrica) and atual.get(metrica) and atual[metrica] > base[metrica] * (1 + tolerancia):
+            problemas.append(f"{metrica}: {base[metrica]} → {atual[metrica]} "
+                             f"(+{(atual[metrica] / base[metrica] - 1) * 100:.0f}%)")
+    return problemas
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--child-render"]:
+        _render_child(*argv[1:3])
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1, help="Fator de escala da carga sintética")
+    parser.add_argument("--repeat", type=int, default=3, help="Medições de import (usa a melhor)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Piora aceita em relação à linha de base")
+    parser.add_argument("--max-import-ms", type=float, help="Orçamento absoluto para o import do app")
+    parser.add_argument("--out", help="Arquivo JSON de saída (padrão: benchmarks/results/startup-<data>.json)")
+    args = parser.parse_args(argv)
+
+    from benchmarks.pipeline_bench import _git_commit
+    from src.core import pipeline
+    from src.core.synthetic import WorkloadConfig, generate_workload
+
+    imports = min((import_costs() for _ in range(args.repeat)), key=lambda r: r['total_ms'])
+
+    snapshot = tempfile.mkdtemp(prefix="startup-snapshot-")
+    cache_dir = tempfile.mkdtemp(prefix="startup-cache-")
+    pipeline.save_snapshot(generate_workload(WorkloadConfig().scaled(args.scale)), snapshot)
+    fria = first_render(snapshot, cache_dir)
+    quente = first_render(snapshot, cache_dir)
+
+    resultado = {
+        'commit': _git_commit(),
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'escala': args.scale,
+        'import_app_ms': imports['total_ms'],
+        'primeira_renderizacao_fria_s': fria['segundos'],
+        'primeira_renderizacao_quente_s': quente['segundos'],
+        'excecoes': fria['excecoes'] + quente['excecoes'],
+        'imports': imports,
+    }
+
+    print(f"import app: {imports['total_ms']:.0f} ms")
+    for nome, ms in list(imports['projeto_ms'].items())[:10]:
+        print(f"  {nome:<40} {ms:>8.1f} ms")
+    print("terceiros:")
+    for nome, ms in imports['terceiros_ms'].items():
+        print(f"  {nome:<40} {ms:>8.1f} ms")
+    print(f"primeira renderização: {fria['segundos']:.2f}s a frio, {quente['segundos']:.2f}s com cache")
+    for excecao in resultado['excecoes']:
+        print(f"⚠ exceção no app: {excecao}")
+
+    saida = args.out or os.path.join(RESULTS_DIR, f"startup-{datetime.now():%Y%m%d-%H%M%S}-{resultado['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {saida}")
+
+    problemas = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            problemas += regressions(resultado, json.load(f), args.tolerance)
+    if args.max_import_ms and imports['total_ms'] > args.max_import_ms:
+        problemas.append(f"import_app_ms: {imports['total_ms']} > orçamento de {args.max_import_ms}")
+    for problema in problemas:
+        print(f"⚠ regressão: {problema}")
+    return 1 if problemas or resultado['excecoes'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Verificação ponta a ponta do write-back (src/core/writeback.py) sobre uma planilha em memória.
+
+    python -m benchmarks.writeback_check
+    python -m benchmarks.writeback_check --scale 10 --changes 40
+
+Gera uma carga sintética, grava as abas em uma FakeSpreadsheet e aceita, para reservas em
+conflito, realocações (só para salas livres em todas as datas da série) e adiamentos de 30 min.
+As alterações são gravadas de uma vez na FakeWorksheet e conferidas:
+- uma leitura e um único batch_update por gravação, com valores gravados como texto (RAW);
+- nenhuma reserva realocada entra em conflito na sala de destino;
+- o resultado corrigido em memória (patch_result) é igual a um pipeline completo sobre a aba gravada;
+- uma linha alterada na planilha depois da leitura é rejeitada, sem ser sobrescrita.
+Sai com código 1 se alguma verificação falhar.
+"""
+import argparse
+import sys
+import time
+from typing import List
+
+from src.core import pipeline, writeback
+from src.core.fake_spreadsheet import FakeSpreadsheet
+from src.core.synthetic import WorkloadConfig, generate_workload
+from src.services.gsheet_service import RESERVAS_COLUMNS, process_worksheet
+
+def _load(planilha: FakeSpreadsheet):
+    """Mesma leitura de load_all_data_gsheets, sobre a planilha em memória"""
+    return {
+        'Reservas': process_worksheet(planilha.worksheet("Reservas"), RESERVAS_COLUMNS),
+        'Salas': process_worksheet(planilha.worksheet("Salas"), ['Sala', 'Capacidade']),
+        'Grupos': process_worksheet(planilha.worksheet("Controle de Pastorais"), ['Grupo', '# Participantes']),
+    }
+
+def _accept_changes(result: pipeline.PipelineResult, maximo: int) -> List[writeback.Change]:
+    """
+    Uma alteração por reserva em conflito: realocação para a primeira sala livre em toda a série,
+    ou adiamento de 30 min. Cada alteração é escolhida sobre o resultado já corrigido pelas anteriores,
+    como se o usuário as aceitasse uma a uma.
+    """
+    todas = sorted(set(result.df_reservas['Sala']) | set(result.df_salas['Sala']))
+    changes: List[writeback.Change] = []
+    atual, linhas = result, set()
+    for conflito in result.conflitos:
+        if len(changes) >= maximo:
+            break
+        id_reserva = conflito['id_reserva2']
+        ocorrencia = atual.df_expandido.index[atual.df_expandido['id_reserva'] == id_reserva]
+        if ocorrencia.empty:
+            continue
+        linha = atual.df_reservas.index.get_loc(ocorrencia[0])
+        if linha in linhas:
+            continue
+        livres = writeback.series_free_rooms(atual, id_reserva, [s for s in todas if s != conflito['sala']])
+        try:
+            change = (writeback.relocation(atual, id_reserva, livres[0]) if livres
+                      else writeback.time_shift(atual, id_reserva, 30))
+        except ValueError:
+            continue
+        # A versão da linha é a da leitura original (é o que a planilha tem até a gravação)
+        change.versao_linha = writeback.row_version(result.df_reservas.iloc[linha][RESERVAS_COLUMNS])
+        changes.append(change)
+        linhas.add(linha)
+        atual = writeback.patch_result(atual, [change])
+    return changes
+
+def run(config: WorkloadConfig, maximo: int) -> List[str]:
+    falhas: List[str] = []
+    dfs = generate_workload(config)
+    planilha = FakeSpreadsheet({'Reservas': dfs['Reservas'], 'Salas': dfs['Salas'],
+                                'Controle de Pastorais': dfs['Grupos']})
+    aba = planilha.worksheet("Reservas")
+    result = pipeline.run_pipeline(_load(planilha), [])
+    print(f"{len(result.df_reservas)} reservas, {len(result.df_expandido)} ocorrências, {len(result.conflitos)} conflitos")
+
+    inicio = time.perf_counter()
+    changes = _accept_changes(result, maximo)
+    realocacoes = [c for c in changes if 'Sala' in c.novos]
+    print(f"{len(changes)} alterações aceitas ({len(realocacoes)} realocações) em {time.perf_counter() - inicio:.2f}s")
+
+    aba.chamadas.clear()
+    gravado = writeback.apply_changes(aba, changes)
+    if gravado.rejeitadas or len(gravado.aplicadas) != len(changes):
+        falhas.append(f"alterações rejeitadas sem alteração concorrente: {[m for _, m in gravado.rejeitadas]}")
+    if aba.chamadas != {'get_all_values': 1, 'batch_update': 1}:
+        falhas.append(f"chamadas à API na gravação: {aba.chamadas} (esperado 1 leitura e 1 batch_update)")
+    if aba.value_input_option != 'RAW':
+        falhas.append(f"batch_update com value_input_option={aba.value_input_option!r} (esperado 'RAW')")
+
+    corrigido = writeback.patch_result(result, gravado.aplicadas)
+    completo = pipeline.run_pipeline(_load(planilha), [])
+    if sorted(corrigido.df_expandido['id_reserva']) != sorted(completo.df_expandido['id_reserva']):
+        falhas.append("ocorrências do resultado corrigido diferem do pipeline completo")
+    if sorted(c['id'] for c in corrigido.conflitos) != sorted(c['id'] for c in completo.conflitos):
+        falhas.append("conflitos do resultado corrigido diferem do pipeline completo")
+
+    for change in realocacoes:
+        rotulo = completo.df_reservas.index[change.linha]
+        ids = set(completo.df_expandido.loc[completo.df_expandido.index == rotulo, 'id_reserva'])
+        novos = [c for c in completo.conflitos
+                 if c['sala'] == change.novos['Sala'] and (c['id_reserva1'] in ids or c['id_reserva2'] in ids)]
+        if novos:
+            falhas.append(f"{change.descricao}: {len(novos)} conflito(s) na sala de destino")
+    print(f"Conflitos: {len(result.conflitos)} → {len(completo.conflitos)}")
+
+    # Alteração concorrente: a linha muda na planilha depois da leitura e a gravação é rejeitada
+    if gravado.aplicadas:
+        change = gravado.aplicadas[0]
+        coluna = RESERVAS_COLUMNS.index('Responsável') + 1
+        aba.update_cell(change.linha + writeback.PRIMEIRA_LINHA, coluna, "Outra pessoa")
+        antes = [list(l) for l in aba.values]
+        repetido = writeback.apply_changes(aba, [writeback.Change(change.linha, change.versao_linha, change.novos,
+                                                                  change.descricao)])
+        if not repetido.rejeitadas or aba.values != antes:
+            falhas.append("alteração concorrente não foi rejeitada (ou a linha foi sobrescrita)")
+    return falhas
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1, help="Fator de escala da carga sintética")
+    parser.add_argument("--changes", type=int, default=20, help="Máximo de alterações aceitas")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    falhas = run(WorkloadConfig(seed=args.seed).scaled(args.scale), args.changes)
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    print("OK" if not falhas else f"{len(falhas)} verificação(ões) falharam")
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Execução do pipeline sem Streamlit.
+
+    python -m src.cli pull --spreadsheet-id ID --credentials sa.json --snapshot dados/
+    python -m src.cli run --snapshot dados/ --out resultados/
+    python -m src.cli serve --snapshot dados/ --port 8503
+    python -m src.cli simulate --snapshot dados/ --scenarios cenarios.json --out comparacao.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from src.core import instrumentation, pipeline, scenarios, writeback
+from src.core.sqlite_store import OccurrenceStore
+from src.core.worker import input_version
+from src.services.availability_api import AvailabilityApi
+from src.services.reccuring_service import expand_recurring_events
+
+def _print_diagnostics(diagnostics):
+    for d in diagnostics:
+        # Linha na planilha (a posição 0 é a linha 2, logo abaixo do cabeçalho)
+        linha = f" (linha {d.row + writeback.PRIMEIRA_LINHA})" if d.row is not None else ""
+        print(f"[{d.level}] {d.stage}{linha}: {d.message}", file=sys.stderr)
+
+def _load_credentials(caminho: str):
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+def cmd_pull(args) -> int:
+    diagnostics = []
+    dfs = pipeline.load_from_gsheets(args.spreadsheet_id, _load_credentials(args.credentials), diagnostics)
+    _print_diagnostics(diagnostics)
+    if not dfs:
+        return 1
+    pipeline.save_snapshot(dfs, args.snapshot, args.format)
+    print(f"Snapshot salvo em {args.snapshot} ({', '.join(f'{n}: {len(df)}' for n, df in dfs.items())})")
+    return 0
+
+def _load(args, diagnostics):
+    if args.snapshot:
+        return pipeline.load_snapshot(args.snapshot, diagnostics)
+    return pipeline.load_from_gsheets(args.spreadsheet_id, _load_credentials(args.credentials), diagnostics)
+
+def cmd_run(args) -> int:
+    diagnostics = []
+    recorder = instrumentation.Recorder()
+    with recorder.activate():
+        with instrumentation.stage('load') as m:
+            dfs = _load(args, diagnostics)
+            m.linhas_saida = len(dfs.get('Reservas', []))
+
+        store = OccurrenceStore(args.sqlite) if args.sqlite else None
+        if args.profile:
+            with instrumentation.profile(args.profile) as perfil:
+                result = pipeline.run_pipeline(dfs, diagnostics, store)
+        else:
+            result = pipeline.run_pipeline(dfs, diagnostics, store)
+
+    _print_diagnostics(result.diagnostics)
+    pipeline.write_results(result, args.out)
+    with open(os.path.join(args.out, "metricas.json"), 'w', encoding='utf-8') as f:
+        json.dump(recorder.to_dict(), f, ensure_ascii=False, indent=2)
+    if args.profile:
+        with open(os.path.join(args.out, "perfil.txt"), 'w', encoding='utf-8') as f:
+            f.write(perfil['relatorio'])
+    print(f"{len(result.df_expandido)} ocorrências, {len(result.conflitos)} conflitos, "
+          f"{len(result.sugestoes)} sugestões → {args.out}")
+    return 0 if result.ok else 1
+
+def cmd_serve(args) -> int:
+    diagnostics = []
+    dfs = _load(args, diagnostics)
+    df_reservas = dfs.get('Reservas')
+    if df_reservas is None or df_reservas.empty or not pipeline.validate(df_reservas, diagnostics):
+        _print_diagnostics(diagnostics)
+        return 1
+    # A API só precisa das ocorrências expandidas (conflitos e sugestões não entram no índice)
+    df_validas = pipeline.valid_reservations(df_reservas, dfs.get('Salas'), dfs.get('Grupos'), diagnostics)
+    df_expandido = expand_recurring_events(df_validas, diagnostics)
+    _print_diagnostics(diagnostics)
+
+    api = AvailabilityApi(args.host, args.port, args.cors_origin)
+    api.publish(input_version(dfs), df_expandido, dfs['Salas'])
+    print(f"API de disponibilidade em http://{args.host}:{args.port} ({len(df_expandido)} ocorrências)", flush=True)
+    try:
+        asyncio.run(api.serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def cmd_simulate(args) -> int:
+    diagnostics = []
+    cenarios = scenarios.load_scenarios(args.scenarios)
+    result = pipeline.run_pipeline(_load(args, diagnostics), diagnostics)
+    _print_diagnostics(result.diagnostics)
+    if not result.ok:
+        return 1
+    avaliacoes = scenarios.evaluate_scenarios(result, cenarios, args.workers)
+
+    print(f"Atual: {len(result.conflitos)} conflitos")
+    for a in avaliacoes:
+        print(f"{a['nome']}: {a['conflitos']} conflitos ({a['delta_conflitos']:+d}), "
+              f"utilização {a['utilizacao_media']}% ({a['delta_utilizacao']:+.1f}), "
+              f"{a['reservas_alteradas']} reservas alteradas")
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(avaliacoes, f, ensure_ascii=False, indent=2)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Pipeline de reservas de salas")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    pull = sub.add_parser("pull", help="Baixa a planilha e salva um snapshot local")
+    pull.add_argument("--spreadsheet-id", required=True)
+    pull.add_argument("--credentials", required=True, help="JSON da service account")
+    pull.add_argument("--snapshot", required=True, help="Diretório de destino")
+    pull.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    pull.set_defaults(func=cmd_pull)
+
+    run = sub.add_parser("run", help="Expande recorrências, detecta conflitos e gera sugestões")
+    origem = run.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--snapshot", help="Diretório com Reservas/Salas/Grupos (.csv ou .parquet)")
+    origem.add_argument("--spreadsheet-id")
+    run.add_argument("--credentials", help="JSON da service account (com --spreadsheet-id)")
+    run.add_argument("--out", required=True, help="Diretório de saída")
+    run.add_argument("--sqlite", help="Grava as ocorrências neste banco SQLite e usa consultas indexadas")
+    run.add_argument("--profile", choices=instrumentation.available_profilers(),
+                     help="Grava o perfil da execução em perfil.txt")
+    run.set_defaults(func=cmd_run)
+
+    serve = sub.add_parser("serve", help="Serve a API JSON de disponibilidade das salas")
+    origem = serve.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--snapshot", help="Diretório com Reservas/Salas/Grupos (.csv ou .parquet)")
+    origem.add_argument("--spreadsheet-id")
+    serve.add_argument("--credentials", help="JSON da service account (com --spreadsheet-id)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8503)
+    serve.add_argument("--cors-origin", help="Origem liberada via CORS (ex.: https://reservas.exemplo.org); padrão: nenhuma")
+    serve.set_defaults(func=cmd_serve)
+
+    simulate = sub.add_parser("simulate", help="Compara cenários (mudanças de sala, horário e recorrência em lote)")
+    origem = simulate.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--snapshot", help="Diretório com Reservas/Salas/Grupos (.csv ou .parquet)")
+    origem.add_argument("--spreadsheet-id")
+    simulate.add_argument("--credentials", help="JSON da service account (com --spreadsheet-id)")
+    simulate.add_argument("--scenarios", required=True, help="JSON com a lista de cenários")
+    simulate.add_argument("--workers", type=int, help="Processos em paralelo (padrão: núcleos disponíveis)")
+    simulate.add_argument("--out", help="Grava a comparação em JSON")
+    simulate.set_defaults(func=cmd_simulate)
+
+    return parser
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'spreadsheet_id', None) and not args.credentials:
+        parser.error("--credentials é obrigatório com --spreadsheet-id")
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
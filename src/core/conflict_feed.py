@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+# Campos de cada conflito guardados no feed (o suficiente para identificá-lo sem o resultado inteiro)
+RESUMO = ('id', 'sala', 'data', 'grupo1', 'horario1', 'grupo2', 'horario2')
+
+MAX_ENTRIES = 50
+
+@dataclass(frozen=True)
+class ConflictDelta:
+    """Mudanças nos conflitos entre duas versões publicadas dos dados"""
+    versao_anterior: str
+    versao: str
+    gerado_em: float
+    novos: List[Dict] = field(default_factory=list)
+    resolvidos: List[Dict] = field(default_factory=list)
+    mantidos: int = 0
+
+    @property
+    def vazio(self) -> bool:
+        return not self.novos and not self.resolvidos
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+def _resumo(conflito: Dict) -> Dict:
+    return {campo: conflito.get(campo) for campo in RESUMO}
+
+def diff_conflicts(anteriores: Dict[str, Dict], atuais: List[Dict], versao_anterior: str = "",
+                   versao: str = "", gerado_em: Optional[float] = None) -> ConflictDelta:
+    """
+    Compara os conflitos atuais com os anteriores (id → resumo) pelo `id` estável de cada conflito
+    (sala, data e as duas reservas): novos, resolvidos e quantos se mantiveram.
+    """
+    ids_atuais = {c['id'] for c in atuais}
+    return ConflictDelta(
+        versao_anterior=versao_anterior,
+        versao=versao,
+        gerado_em=time.time() if gerado_em is None else gerado_em,
+        novos=[_resumo(c) for c in atuais if c['id'] not in anteriores],
+        resolvidos=[resumo for id_, resumo in anteriores.items() if id_ not in ids_atuais],
+        mantidos=len(ids_atuais & anteriores.keys()),
+    )
+
+class ConflictFeed:
+    """
+    Feed de mudanças nos conflitos a cada nova versão dos dados. Guarda só o resumo dos conflitos
+    da versão atual (para o próximo diff) e as últimas `max_entries` mudanças (deque limitado).
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.entradas: deque = deque(maxlen=max_entries)
+        self.versao: Optional[str] = None
+        self._atuais: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def update(self, versao: str, conflitos: List[Dict], gerado_em: Optional[float] = None) -> Optional[ConflictDelta]:
+        """Registra a versão publicada; retorna a mudança em relação à anterior (None na primeira ou se igual)"""
+        with self._lock:
+            if versao == self.versao:
+                return None
+            delta = None
+            if self.versao is not None:
+                delta = diff_conflicts(self._atuais, conflitos, self.versao, versao, gerado_em)
+                if not delta.vazio:
+                    self.entradas.append(delta)
+            self.versao = versao
+            self._atuais = {c['id']: _resumo(c) for c in conflitos}
+            return delta
+
+    @property
+    def ultima(self) -> Optional[ConflictDelta]:
+        return self.entradas[-1] if self.entradas else None
+
+    def since(self, versao: Optional[str] = None) -> List[ConflictDelta]:
+        """Mudanças posteriores à `versao` (todas as guardadas se a versão for desconhecida)"""
+        if versao is not None and versao == self.versao:
+            return []
+        entradas = list(self.entradas)
+        for i, delta in enumerate(entradas):
+            if delta.versao_anterior == versao:
+                return entradas[i:]
+        return entradas
+
+    def to_dict(self, versao: Optional[str] = None) -> Dict:
+        return {'versao': self.versao, 'mudancas': [d.to_dict() for d in self.since(versao)]}
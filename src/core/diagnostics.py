@@ -0,0 +1,21 @@
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """Aviso ou erro gerado por uma etapa do pipeline, sem depender do Streamlit"""
+    level: str              # 'info' | 'warning' | 'error'
+    stage: str              # 'load' | 'validate' | 'expand' | 'conflicts' | 'recommendations' | ...
+    message: str
+    row: Optional[int] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+def add(diagnostics: Optional[List[Diagnostic]], level: str, stage: str, message: str, row: Optional[int] = None):
+    """Registra um diagnóstico se a lista foi fornecida (chamadores podem passar None)"""
+    if diagnostics is not None:
+        diagnostics.append(Diagnostic(level, stage, message, row))
+
+def has_errors(diagnostics: List[Diagnostic]) -> bool:
+    return any(d.level == 'error' for d in diagnostics)
@@ -0,0 +1,83 @@
+import re
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+A1 = re.compile(r'^([A-Z]+)(\d+)$')
+
+def column_letter(n: int) -> str:
+    """1 → A, 27 → AA"""
+    letras = ""
+    while n:
+        n, resto = divmod(n - 1, 26)
+        letras = chr(ord('A') + resto) + letras
+    return letras
+
+def _cell(a1: str):
+    m = A1.match(a1.split('!')[-1])
+    if not m:
+        raise ValueError(f"Célula A1 inválida: {a1}")
+    coluna = 0
+    for letra in m.group(1):
+        coluna = coluna * 26 + ord(letra) - ord('A') + 1
+    return int(m.group(2)), coluna
+
+class FakeWorksheet:
+    """
+    Aba em memória com o subconjunto da API do gspread.Worksheet usado pelo app
+    (get_all_values, get_all_records, batch_update, update_cell). Conta as chamadas
+    para que testes e benchmarks verifiquem quantas idas à API cada operação faria.
+    """
+
+    def __init__(self, title: str, values: List[List[str]]):
+        self.title = title
+        self.values = [list(map(str, linha)) for linha in values]
+        self.chamadas: Dict[str, int] = {}
+        self.value_input_option: Optional[str] = None   # do último batch_update
+
+    @classmethod
+    def from_dataframe(cls, title: str, df: pd.DataFrame) -> "FakeWorksheet":
+        return cls(title, [list(df.columns)] + df.astype(str).values.tolist())
+
+    def _contar(self, metodo: str):
+        self.chamadas[metodo] = self.chamadas.get(metodo, 0) + 1
+
+    def get_all_values(self) -> List[List[str]]:
+        self._contar('get_all_values')
+        return [list(linha) for linha in self.values]
+
+    def get_all_records(self) -> List[Dict[str, str]]:
+        self._contar('get_all_records')
+        cabecalho, *linhas = self.values or [[]]
+        return [dict(zip(cabecalho, linha + [""] * (len(cabecalho) - len(linha)))) for linha in linhas]
+
+    def _set(self, linha: int, coluna: int, valor):
+        while len(self.values) < linha:
+            self.values.append([])
+        atual = self.values[linha - 1]
+        atual.extend([""] * (coluna - len(atual)))
+        atual[coluna - 1] = str(valor)
+
+    def update_cell(self, linha: int, coluna: int, valor):
+        self._contar('update_cell')
+        self._set(linha, coluna, valor)
+
+    def batch_update(self, data: List[Dict], value_input_option: Optional[str] = None, **kwargs):
+        """Aceita apenas intervalos de uma célula ('C5') — o formato gerado pelo write-back"""
+        self._contar('batch_update')
+        self.value_input_option = value_input_option
+        for item in data:
+            linha, coluna = _cell(item['range'])
+            self._set(linha, coluna, item['values'][0][0])
+        return {'totalUpdatedCells': len(data)}
+
+class FakeSpreadsheet:
+    """Planilha em memória: abas por nome, como gspread.Spreadsheet.worksheet()"""
+
+    def __init__(self, abas: Dict[str, pd.DataFrame]):
+        self._abas = {nome: FakeWorksheet.from_dataframe(nome, df) for nome, df in abas.items()}
+
+    def worksheet(self, nome: str) -> FakeWorksheet:
+        if nome not in self._abas:
+            raise KeyError(f"Aba não encontrada: {nome}")
+        return self._abas[nome]
@@ -0,0 +1,145 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional
+
+# Instrumentação leve das etapas do pipeline e das seções da interface.
+# Não depende do Streamlit: o registro ativo fica em um threading.local, então cada
+# sessão (thread do script) ou processo headless tem o seu.
+
+_local = threading.local()
+
+@dataclass
+class StageMetric:
+    nome: str
+    linhas_entrada: Optional[int] = None
+    linhas_saida: Optional[int] = None
+    cache: Optional[str] = None             # 'hit' | 'miss' | None (etapa sem cache)
+    segundos: float = 0.0
+    memoria_delta_mb: Optional[float] = None
+    nivel: int = 0                          # profundidade (etapas aninhadas)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass
+class Recorder:
+    """Coleta as métricas de uma execução (um rerun do app ou uma chamada do CLI)"""
+    metrics: List[StageMetric] = field(default_factory=list)
+    inicio: float = field(default_factory=time.time)
+
+    @contextmanager
+    def activate(self):
+        anterior = getattr(_local, 'recorder', None)
+        _local.recorder = self
+        try:
+            yield self
+        finally:
+            _local.recorder = anterior
+
+    def to_dict(self) -> Dict:
+        return {
+            'inicio': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.inicio)),
+            'total_s': round(sum(m.segundos for m in self.metrics if m.nivel == 0), 4),
+            'etapas': [m.to_dict() for m in self.metrics],
+        }
+
+def current_recorder() -> Optional[Recorder]:
+    return getattr(_local, 'recorder', None)
+
+def _stack() -> List[StageMetric]:
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+def rss_mb() -> Optional[float]:
+    """Memória residente do processo em MB (psutil se disponível, senão /proc), ou None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def row_count(obj) -> Optional[int]:
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+@contextmanager
+def stage(nome: str, linhas_entrada: Optional[int] = None, cached: bool = False):
+    """
+    Mede tempo e variação de memória de um bloco. O chamador pode preencher
+    `linhas_saida` na métrica retornada. Com cached=True a etapa conta como 'hit'
+    a menos que a função em cache chame mark_miss() (o corpo só roda quando não há cache).
+    """
+    pilha = _stack()
+    metric = StageMetric(nome, linhas_entrada=linhas_entrada, cache='hit' if cached else None, nivel=len(pilha))
+    recorder = current_recorder()
+    if recorder is not None:
+        recorder.metrics.append(metric)
+    pilha.append(metric)
+    memoria_inicio = rss_mb()
+    inicio = time.perf_counter()
+    try:
+        yield metric
+    finally:
+        metric.segundos = round(time.perf_counter() - inicio, 4)
+        memoria_fim = rss_mb()
+        if memoria_inicio is not None and memoria_fim is not None:
+            metric.memoria_delta_mb = round(memoria_fim - memoria_inicio, 2)
+        pilha.pop()
+
+def mark_miss():
+    """Chamado dentro de funções em cache: marca a etapa em andamento como 'miss'"""
+    pilha = _stack()
+    if pilha and pilha[-1].cache is not None:
+        pilha[-1].cache = 'miss'
+
+# ---------------------------------------------------------------------------
+# Perfilamento sob demanda (uma execução)
+# ---------------------------------------------------------------------------
+
+def available_profilers() -> List[str]:
+    ferramentas = ['cProfile']
+    try:
+        import pyinstrument  # noqa: F401
+        ferramentas.append('pyinstrument')
+    except ImportError:
+        pass
+    return ferramentas
+
+@contextmanager
+def profile(ferramenta: str = 'cProfile', linhas: int = 40):
+    """Perfila o bloco; o relatório em texto fica em resultado['relatorio'] ao final"""
+    resultado = {'ferramenta': ferramenta, 'relatorio': ''}
+    if ferramenta == 'pyinstrument':
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield resultado
+        finally:
+            profiler.stop()
+            resultado['relatorio'] = profiler.output_text(unicode=True, color=False)
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield resultado
+    finally:
+        profiler.disable()
+        saida = io.StringIO()
+        pstats.Stats(profiler, stream=saida).sort_stats('cumulative').print_stats(linhas)
+        resultado['relatorio'] = saida.getvalue()
@@ -0,0 +1,198 @@
+import json
+import os
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+from src.core import diagnostics as diag
+from src.core import instrumentation
+from src.core.diagnostics import Diagnostic
+from src.core.sqlite_store import OccurrenceStore
+from src.services import gsheet_service
+from src.services.calendar_service import build_events
+from src.services.conflicts_service import find_conflicts
+from src.services.reccuring_service import expand_recurring_events
+from src.services.recommendation_service import generate_recommendations
+from src.services.validation_service import invalid_rows, validar_estrutura_dados, validate_reservations
+
+# Abas esperadas em um snapshot (mesmos nomes retornados por load_all_data_gsheets)
+SNAPSHOT_TABLES = ('Reservas', 'Salas', 'Grupos')
+
+# Fases de um resultado parcial (run_pipeline com on_stage), na ordem em que ficam prontas
+FASE_OCORRENCIAS = 'ocorrencias'    # ocorrências e eventos (sem destaque de conflitos)
+FASE_CONFLITOS = 'conflitos'        # + conflitos e eventos destacados; faltam as sugestões
+FASE_COMPLETA = 'completo'
+
+@dataclass
+class PipelineResult:
+    """Saída do pipeline: dados de entrada, ocorrências expandidas, conflitos, sugestões e diagnósticos"""
+    df_reservas: pd.DataFrame
+    df_salas: pd.DataFrame
+    df_grupos: pd.DataFrame
+    df_expandido: pd.DataFrame = field(default_factory=pd.DataFrame)
+    conflitos: List[Dict] = field(default_factory=list)
+    sugestoes: List[Dict] = field(default_factory=list)
+    eventos: List[Dict] = field(default_factory=list)
+    diagnostics: List[Diagnostic] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    fase: str = FASE_COMPLETA
+
+    @property
+    def ok(self) -> bool:
+        # Reservas inválidas (erro de validação com linha) ficam fora, mas não invalidam o resultado
+        return not any(d.level == 'error' and not (d.stage == 'validate' and d.row is not None)
+                       for d in self.diagnostics)
+
+    @property
+    def completo(self) -> bool:
+        return self.fase == FASE_COMPLETA
+
+def load_from_gsheets(spreadsheet_id: str, creds_dict: Dict,
+                      diagnostics: Optional[List[Diagnostic]] = None) -> Dict[str, pd.DataFrame]:
+    return gsheet_service.load_all_data_gsheets(spreadsheet_id, creds_dict, diagnostics)
+
+def load_snapshot(diretorio: str, diagnostics: Optional[List[Diagnostic]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Lê um snapshot salvo em disco (Reservas/Salas/Grupos em .parquet ou .csv).
+    Os valores são lidos como texto, igual ao que vem da planilha.
+    """
+    dfs = {}
+    for nome in SNAPSHOT_TABLES:
+        parquet = os.path.join(diretorio, f"{nome}.parquet")
+        csv = os.path.join(diretorio, f"{nome}.csv")
+        if os.path.exists(parquet):
+            dfs[nome] = pd.read_parquet(parquet).astype(str)
+        elif os.path.exists(csv):
+            dfs[nome] = pd.read_csv(csv, dtype=str, keep_default_na=False)
+        else:
+            diag.add(diagnostics, 'warning', 'load', f"Aba '{nome}' não encontrada no snapshot {diretorio}")
+    return dfs
+
+def save_snapshot(dfs: Dict[str, pd.DataFrame], diretorio: str, formato: str = 'csv'):
+    """Grava as abas carregadas em disco para execuções offline"""
+    os.makedirs(diretorio, exist_ok=True)
+    for nome, df in dfs.items():
+        if formato == 'parquet':
+            df.astype(str).to_parquet(os.path.join(diretorio, f"{nome}.parquet"), index=False)
+        else:
+            df.to_csv(os.path.join(diretorio, f"{nome}.csv"), index=False)
+
+def validate(df_reservas: pd.DataFrame, diagnostics: Optional[List[Diagnostic]] = None) -> bool:
+    valido, erros = validar_estrutura_dados(df_reservas)
+    for erro in erros:
+        diag.add(diagnostics, 'error', 'validate', erro)
+    return valido
+
+def valid_reservations(df_reservas: pd.DataFrame, df_salas: Optional[pd.DataFrame] = None,
+                       df_grupos: Optional[pd.DataFrame] = None,
+                       diagnostics: Optional[List[Diagnostic]] = None) -> pd.DataFrame:
+    """
+    Valida as reservas linha a linha e devolve só as que podem ser expandidas. Cada problema vira
+    um diagnóstico da etapa 'validate' com a linha da reserva; linhas com erro ficam de fora.
+    """
+    relatorio = validate_reservations(df_reservas, df_salas, df_grupos)
+    for problema in relatorio.itertuples(index=False):
+        diag.add(diagnostics, problema.nivel, 'validate',
+                 f"{problema.coluna}: {problema.mensagem} ('{problema.valor}')", problema.linha)
+    invalidas = invalid_rows(relatorio)
+    return df_reservas[~df_reservas.index.isin(invalidas)] if len(invalidas) else df_reservas
+
+def run_pipeline(dfs: Dict[str, pd.DataFrame], diagnostics: Optional[List[Diagnostic]] = None,
+                 store: Optional[OccurrenceStore] = None,
+                 on_stage: Optional[Callable[[PipelineResult], None]] = None) -> PipelineResult:
+    """
+    Executa validação → expansão das recorrências → conflitos → eventos do calendário → sugestões.
+    Com `store`, as ocorrências são gravadas no SQLite e conflitos/salas livres saem de consultas indexadas.
+    Com `on_stage`, recebe resultados parciais (fase FASE_OCORRENCIAS e FASE_CONFLITOS) assim que
+    cada etapa termina, para que a interface mostre o calendário antes das sugestões ficarem prontas.
+    Não depende do Streamlit; problemas são devolvidos em result.diagnostics.
+    """
+    result = PipelineResult(
+        df_reservas=dfs.get('Reservas', pd.DataFrame()),
+        df_salas=dfs.get('Salas', pd.DataFrame()),
+        df_grupos=dfs.get('Grupos', pd.DataFrame()),
+        diagnostics=diagnostics if diagnostics is not None else [],
+    )
+
+    if result.df_reservas.empty:
+        diag.add(result.diagnostics, 'error', 'load', "A aba 'Reservas' não foi encontrada ou está vazia.")
+        return result
+    if not validate(result.df_reservas, result.diagnostics):
+        return result
+
+    with instrumentation.stage('validate', len(result.df_reservas)) as m:
+        df_validas = valid_reservations(result.df_reservas, result.df_salas, result.df_grupos, result.diagnostics)
+        m.linhas_saida = len(df_validas)
+    result.timings['validate'] = m.segundos
+    if df_validas.empty:
+        diag.add(result.diagnostics, 'error', 'validate',
+                 "Nenhuma reserva válida: todas as linhas da aba Reservas têm erros de validação.")
+        result.df_expandido = expand_recurring_events(df_validas, result.diagnostics)
+        return result
+
+    with instrumentation.stage('expand', len(df_validas)) as m:
+        result.df_expandido = expand_recurring_events(df_validas, result.diagnostics)
+        m.linhas_saida = len(result.df_expandido)
+    result.timings['expand'] = m.segundos
+
+    if store is not None:
+        with instrumentation.stage('store', len(result.df_expandido)) as m:
+            store.load(result.df_reservas, result.df_expandido, result.df_salas)
+            m.linhas_saida = len(result.df_expandido)
+        result.timings['store'] = m.segundos
+
+    if on_stage is not None:
+        with instrumentation.stage('events: parcial', len(result.df_expandido)):
+            # Sem diagnostics: os avisos dos eventos saem uma única vez, na versão final
+            eventos = build_events(result.df_expandido, [])
+        on_stage(replace(result, eventos=eventos, diagnostics=list(result.diagnostics), fase=FASE_OCORRENCIAS))
+
+    with instrumentation.stage('conflicts', len(result.df_expandido)) as m:
+        result.conflitos = store.find_conflicts() if store is not None else find_conflicts(result.df_expandido)
+        m.linhas_saida = len(result.conflitos)
+    result.timings['conflicts'] = m.segundos
+
+    with instrumentation.stage('events', len(result.df_expandido)) as m:
+        result.eventos = build_events(result.df_expandido, result.conflitos, result.diagnostics)
+        m.linhas_saida = len(result.eventos)
+    result.timings['events'] = m.segundos
+
+    if on_stage is not None:
+        on_stage(replace(result, diagnostics=list(result.diagnostics), fase=FASE_CONFLITOS))
+
+    with instrumentation.stage('recommendations', len(result.conflitos)) as m:
+        result.sugestoes = generate_recommendations(result.df_expandido, result.df_salas, result.df_grupos,
+                                                    result.conflitos,
+                                                    store.available_rooms if store is not None else None)
+        m.linhas_saida = len(result.sugestoes)
+    result.timings['recommendations'] = m.segundos
+
+    return result
+
+def _json_default(valor):
+    # Sugestões guardam conjuntos de salas; numpy/pandas escalares viram texto
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor)
+    return str(valor)
+
+def write_results(result: PipelineResult, diretorio: str):
+    """Grava ocorrências (CSV), conflitos, sugestões e diagnósticos (JSON) em disco"""
+    os.makedirs(diretorio, exist_ok=True)
+    result.df_expandido.to_csv(os.path.join(diretorio, "ocorrencias.csv"), index=False)
+    arquivos = {
+        "conflitos.json": result.conflitos,
+        "sugestoes.json": result.sugestoes,
+        "diagnosticos.json": [d.to_dict() for d in result.diagnostics],
+        "resumo.json": {
+            'reservas': len(result.df_reservas),
+            'ocorrencias': len(result.df_expandido),
+            'conflitos': len(result.conflitos),
+            'sugestoes': len(result.sugestoes),
+            'erros': sum(d.level == 'error' for d in result.diagnostics),
+            'avisos': sum(d.level == 'warning' for d in result.diagnostics),
+            'tempos_s': {etapa: round(t, 4) for etapa, t in result.timings.items()},
+        },
+    }
+    for nome, conteudo in arquivos.items():
+        with open(os.path.join(diretorio, nome), 'w', encoding='utf-8') as f:
+            json.dump(conteudo, f, ensure_ascii=False, indent=2, default=_json_default)
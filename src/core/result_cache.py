@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+
+import pandas as pd
+from src.core.diagnostics import Diagnostic
+from src.core.pipeline import PipelineResult
+
+# Módulos cujo código altera o resultado do pipeline: mudou o código, muda a chave do cache
+PIPELINE_MODULES = (
+    'src/core/pipeline.py',
+    'src/core/sqlite_store.py',
+    'src/services/reccuring_service.py',
+    'src/services/conflicts_service.py',
+    'src/services/recommendation_service.py',
+    'src/services/room_catalog_service.py',
+    'src/services/calendar_service.py',
+    'src/services/validation_service.py',
+    'src/services/filter_service.py',       # DIAS_SEMANA, usado na validação
+    'src/utils/sequence_generator.py',
+)
+
+FORMAT_VERSION = 1
+MAX_ENTRIES_PER_NAMESPACE = 3
+
+logger = logging.getLogger(__name__)
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def code_version() -> str:
+    md5 = hashlib.md5(str(FORMAT_VERSION).encode())
+    for modulo in PIPELINE_MODULES:
+        with open(os.path.join(_RAIZ, modulo), 'rb') as f:
+            md5.update(f.read())
+    return md5.hexdigest()[:12]
+
+CODE_VERSION = code_version()
+
+def _to_json(valor):
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor)
+    return str(valor)
+
+class ResultCache:
+    """
+    Cache em disco dos resultados do pipeline, um diretório por (namespace, versão dos dados, versão do código):
+
+        <diretorio>/<namespace>/<versao>-<CODE_VERSION>/
+            reservas|salas|grupos|ocorrencias|conflitos.parquet, sugestoes|eventos|diagnosticos.json
+
+    Tabelas vão em Parquet (colunar); sugestões e eventos, que têm listas/dicionários aninhados, em JSON.
+    Cada entrada é gravada num diretório temporário e renomeada no fim, então uma leitura nunca
+    encontra uma entrada pela metade. LATEST aponta para a última entrada gravada do namespace.
+    """
+
+    def __init__(self, diretorio: str, max_entries: int = MAX_ENTRIES_PER_NAMESPACE):
+        self.diretorio = diretorio
+        self.max_entries = max_entries
+
+    def key(self, versao: str) -> str:
+        return f"{versao}-{CODE_VERSION}"
+
+    def _path(self, namespace: str, chave: str = "") -> str:
+        return os.path.join(self.diretorio, namespace, chave)
+
+    def latest(self, namespace: str) -> Optional[str]:
+        """Versão dos dados da última entrada gravada (compatível com o código atual), ou None"""
+        try:
+            with open(self._path(namespace, "LATEST"), encoding='utf-8') as f:
+                chave = f.read().strip()
+        except OSError:
+            return None
+        versao, _, codigo = chave.rpartition('-')
+        if codigo != CODE_VERSION or not os.path.isdir(self._path(namespace, chave)):
+            return None
+        return versao
+
+    def load(self, namespace: str, versao: str) -> Optional[PipelineResult]:
+        caminho = self._path(namespace, self.key(versao))
+        if not os.path.isdir(caminho):
+            return None
+        # Entrada ilegível (arquivo truncado, Parquet corrompido, JSON inválido) conta como ausente
+        try:
+            ler = lambda nome: pd.read_parquet(os.path.join(caminho, f"{nome}.parquet"))
+            tabelas = {nome: ler(nome) for nome in ('reservas', 'salas', 'grupos', 'ocorrencias', 'conflitos')}
+            with open(os.path.join(caminho, "sugestoes.json"), encoding='utf-8') as f:
+                sugestoes = json.load(f)
+            with open(os.path.join(caminho, "eventos.json"), encoding='utf-8') as f:
+                eventos = json.load(f)
+            with open(os.path.join(caminho, "diagnosticos.json"), encoding='utf-8') as f:
+                diagnostics = [Diagnostic(**d) for d in json.load(f)]
+            # Conjuntos viram listas no JSON; restaura o tipo original
+            for sug in sugestoes:
+                for campo in ('outras_salas_livres_g1', 'outras_salas_livres_g2'):
+                    sug[campo] = set(sug[campo])
+        except Exception:
+            logger.warning("Entrada do cache de resultados ilegível (%s)", caminho, exc_info=True)
+            return None
+
+        return PipelineResult(
+            df_reservas=tabelas['reservas'],
+            df_salas=tabelas['salas'],
+            df_grupos=tabelas['grupos'],
+            df_expandido=tabelas['ocorrencias'],
+            conflitos=tabelas['conflitos'].to_dict('records'),
+            sugestoes=sugestoes,
+            eventos=eventos,
+            diagnostics=diagnostics,
+        )
+
+    def save(self, namespace: str, versao: str, result: PipelineResult):
+        os.makedirs(self._path(namespace), exist_ok=True)
+        chave = self.key(versao)
+        destino = self._path(namespace, chave)
+        if not os.path.isdir(destino):
+            temporario = tempfile.mkdtemp(prefix=".tmp-", dir=self._path(namespace))
+            try:
+                tabelas = {
+                    'reservas': result.df_reservas, 'salas': result.df_salas, 'grupos': result.df_grupos,
+                    'ocorrencias': result.df_expandido, 'conflitos': pd.DataFrame(result.conflitos),
+                }
+                for nome, df in tabelas.items():
+                    df.to_parquet(os.path.join(temporario, f"{nome}.parquet"))
+                arquivos = {
+                    'sugestoes.json': result.sugestoes,
+                    'eventos.json': result.eventos,
+                    'diagnosticos.json': [d.to_dict() for d in result.diagnostics],
+                }
+                for nome, conteudo in arquivos.items():
+                    with open(os.path.join(temporario, nome), 'w', encoding='utf-8') as f:
+                        json.dump(conteudo, f, ensure_ascii=False, default=_to_json)
+                os.replace(temporario, destino)
+            except Exception:
+                shutil.rmtree(temporario, ignore_errors=True)
+                raise
+
+        with open(self._path(namespace, "LATEST.tmp"), 'w', encoding='utf-8') as f:
+            f.write(chave)
+        os.replace(self._path(namespace, "LATEST.tmp"), self._path(namespace, "LATEST"))
+        self.prune(namespace, manter=chave)
+
+    def prune(self, namespace: str, manter: str):
+        """Mantém só as `max_entries` entradas mais recentes do namespace"""
+        base = self._path(namespace)
+        entradas: List[str] = sorted(
+            (e for e in os.listdir(base) if os.path.isdir(os.path.join(base, e)) and not e.startswith('.')),
+            key=lambda e: os.path.getmtime(os.path.join(base, e)), reverse=True)
+        for entrada in entradas[self.max_entries:]:
+            if entrada != manter:
+                shutil.rmtree(os.path.join(base, entrada), ignore_errors=True)
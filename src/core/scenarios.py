@@ -0,0 +1,202 @@
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from src.core import diagnostics as diag
+from src.core.diagnostics import Diagnostic
+from src.core.pipeline import PipelineResult
+from src.core.writeback import patch_occurrences, shift_interval
+from src.services.occupancy_service import build_occupancy_cube, occupancy_period, overall_utilization
+
+# Tipos de transformação de um cenário
+SALA = 'sala'              # valor: nome da sala de destino
+HORARIO = 'horario'        # valor: minutos de deslocamento (negativo = mais cedo)
+RECORRENCIA = 'recorrencia'  # valor: 'Quinzenal', 'Mensal-2º', 'Semanal-Quarta', '' (evento único)...
+TIPOS = (SALA, HORARIO, RECORRENCIA)
+
+@dataclass
+class Transform:
+    """
+    Alteração em lote das reservas que satisfazem `filtro` (coluna → valor ou lista de valores;
+    valores terminados em '*' comparam só o início, ex.: {'Recorrência': 'Quinzenal*'}).
+    Filtro vazio seleciona todas as reservas.
+    """
+    tipo: str
+    filtro: Dict[str, Any]
+    valor: Any
+
+@dataclass
+class Scenario:
+    """Plano alternativo: transformações aplicadas em ordem (cada uma vê o efeito das anteriores)"""
+    nome: str
+    transformacoes: List[Transform] = field(default_factory=list)
+
+def room_move(filtro: Dict[str, Any], sala: str) -> Transform:
+    return Transform(SALA, filtro, sala)
+
+def time_shift(filtro: Dict[str, Any], minutos: int) -> Transform:
+    return Transform(HORARIO, filtro, minutos)
+
+def recurrence_change(filtro: Dict[str, Any], recorrencia: str) -> Transform:
+    return Transform(RECORRENCIA, filtro, recorrencia)
+
+def load_scenarios(caminho: str) -> List[Scenario]:
+    """
+    Lê cenários de um JSON:
+    [{"nome": "...", "transformacoes": [{"tipo": "sala", "filtro": {...}, "valor": "Sala 3"}, ...]}]
+    """
+    with open(caminho, encoding='utf-8') as f:
+        dados = json.load(f)
+    cenarios = []
+    for item in dados:
+        transformacoes = [Transform(t['tipo'], t.get('filtro', {}), t.get('valor')) for t in item.get('transformacoes', [])]
+        for t in transformacoes:
+            if t.tipo not in TIPOS:
+                raise ValueError(f"Tipo de transformação desconhecido em '{item.get('nome')}': {t.tipo}")
+        cenarios.append(Scenario(item.get('nome', f"Cenário {len(cenarios) + 1}"), transformacoes))
+    return cenarios
+
+def _matches(coluna: pd.Series, valores) -> pd.Series:
+    texto = coluna.astype(str).str.strip()
+    selecao = pd.Series(False, index=coluna.index)
+    for valor in valores if isinstance(valores, (list, tuple, set)) else [valores]:
+        valor = str(valor).strip()
+        selecao |= texto.str.startswith(valor[:-1]) if valor.endswith('*') else texto == valor
+    return selecao
+
+def _dia(linha: pd.Series) -> str:
+    """Dia da semana da reserva no formato da recorrência ('Quarta', 'Sábado')"""
+    recorrencia = str(linha.get('Recorrência', '')).strip()
+    if '-' in recorrencia:
+        return recorrencia.rsplit('-', 1)[1]
+    return str(linha.get('Dia da semana', '')).strip().replace('-feira', '')
+
+def _recorrencia(atual: pd.Series, valor: str) -> str:
+    """Completa o dia da semana quando o novo valor só traz o tipo ('Quinzenal' → 'Quinzenal-Quarta')"""
+    valor = str(valor or '').strip()
+    if not valor:
+        return ''
+    tipo = valor.split('-')[0]
+    partes_necessarias = 3 if tipo == 'Mensal' else 2
+    return valor if len(valor.split('-')) >= partes_necessarias else f"{valor}-{_dia(atual)}"
+
+def apply_transforms(df_reservas: pd.DataFrame, transformacoes: List[Transform],
+                     diagnostics: Optional[List[Diagnostic]] = None) -> Dict[int, Dict[str, str]]:
+    """
+    Alterações do cenário por linha (posição em df_reservas → {coluna: novo valor}), sem tocar
+    em df_reservas: as transformações trabalham sobre uma visão copy-on-write das linhas alteradas.
+    Deslocamentos de horário que cruzariam a meia-noite não são aplicados (ficam nos diagnósticos).
+    """
+    alteradas: Dict[int, Dict[str, str]] = {}
+
+    def valor_atual(pos: int, coluna: str):
+        return alteradas.get(pos, {}).get(coluna, df_reservas.iat[pos, df_reservas.columns.get_loc(coluna)])
+
+    for t in transformacoes:
+        selecao = pd.Series(True, index=range(len(df_reservas)))
+        for coluna, valores in t.filtro.items():
+            if coluna not in df_reservas:
+                raise KeyError(f"Coluna do filtro não existe em Reservas: {coluna}")
+            atual = pd.Series([valor_atual(p, coluna) for p in range(len(df_reservas))]) if alteradas else \
+                df_reservas[coluna].reset_index(drop=True)
+            selecao &= _matches(atual, valores)
+
+        for pos in selecao[selecao].index:
+            if t.tipo == SALA:
+                alteradas.setdefault(pos, {})['Sala'] = str(t.valor)
+            elif t.tipo == HORARIO:
+                try:
+                    novos = shift_interval(valor_atual(pos, 'Hora Início'), valor_atual(pos, 'Hora fim'), int(t.valor))
+                except ValueError as e:
+                    diag.add(diagnostics, 'warning', 'scenario', f"{df_reservas['Grupo'].iat[pos]}: {e} (não aplicado)",
+                             df_reservas.index[pos])
+                    continue
+                alteradas.setdefault(pos, {}).update(novos)
+            elif t.tipo == RECORRENCIA:
+                linha = df_reservas.iloc[pos].copy()
+                linha['Recorrência'] = valor_atual(pos, 'Recorrência')
+                alteradas.setdefault(pos, {})['Recorrência'] = _recorrencia(linha, t.valor)
+            else:
+                raise ValueError(f"Tipo de transformação desconhecido: {t.tipo}")
+    return alteradas
+
+def _metricas(df_expandido: pd.DataFrame, conflitos: List[Dict], salas: List[str], periodo) -> Dict:
+    por_grupo = Counter()
+    for c in conflitos:
+        por_grupo[c['grupo1']] += 1
+        por_grupo[c['grupo2']] += 1
+    return {
+        'ocorrencias': len(df_expandido),
+        'conflitos': len(conflitos),
+        'utilizacao_media': overall_utilization(build_occupancy_cube(df_expandido, salas, periodo)),
+        'periodo': periodo,
+        'conflitos_por_grupo': por_grupo,
+        'ocorrencias_por_grupo': Counter(df_expandido['Grupo']),
+    }
+
+def baseline_metrics(result: PipelineResult) -> Dict:
+    salas = list(result.df_salas['Sala']) if 'Sala' in result.df_salas else []
+    # O período da situação atual vale para todos os cenários (utilizações comparáveis entre si)
+    return _metricas(result.df_expandido, result.conflitos, salas, occupancy_period(result.df_expandido))
+
+def evaluate_scenario(result: PipelineResult, cenario: Scenario, base: Optional[Dict] = None) -> Dict:
+    """
+    Aplica o cenário sobre o resultado (sem modificá-lo) e compara com a situação atual:
+    conflitos, utilização média e impacto por grupo. Só as reservas alteradas são reexpandidas
+    e só os (sala, data) afetados têm os conflitos recalculados.
+    """
+    base = base or baseline_metrics(result)
+    diagnostics: List[Diagnostic] = []
+    alteradas = apply_transforms(result.df_reservas, cenario.transformacoes, diagnostics)
+    if alteradas:
+        _, df_expandido, conflitos, _ = patch_occurrences(result, alteradas, diagnostics)
+    else:
+        df_expandido, conflitos = result.df_expandido, result.conflitos
+    salas = list(result.df_salas['Sala']) if 'Sala' in result.df_salas else []
+    atual = _metricas(df_expandido, conflitos, salas, base['periodo'])
+
+    grupos_alterados = Counter(result.df_reservas['Grupo'].iloc[sorted(alteradas)]) if alteradas else Counter()
+    grupos = {}
+    for grupo in sorted(set(base['conflitos_por_grupo']) | set(atual['conflitos_por_grupo']) | set(grupos_alterados)):
+        antes, depois = base['conflitos_por_grupo'][grupo], atual['conflitos_por_grupo'][grupo]
+        ocorrencias = atual['ocorrencias_por_grupo'][grupo] - base['ocorrencias_por_grupo'][grupo]
+        if antes != depois or grupos_alterados[grupo] or ocorrencias:
+            grupos[grupo] = {'reservas_alteradas': grupos_alterados[grupo], 'conflitos': depois,
+                             'delta_conflitos': depois - antes, 'delta_ocorrencias': ocorrencias}
+
+    return {
+        'nome': cenario.nome,
+        'reservas_alteradas': len(alteradas),
+        'ocorrencias': atual['ocorrencias'],
+        'conflitos': atual['conflitos'],
+        'delta_conflitos': atual['conflitos'] - base['conflitos'],
+        'utilizacao_media': atual['utilizacao_media'],
+        'delta_utilizacao': round(atual['utilizacao_media'] - base['utilizacao_media'], 1),
+        'grupos': grupos,
+        'diagnostics': [d.message for d in diagnostics],
+    }
+
+# Resultado base de cada processo do pool (enviado uma vez, no initializer)
+_BASE: Dict[str, Any] = {}
+
+def _init_worker(result: PipelineResult, base: Dict):
+    _BASE['result'], _BASE['metricas'] = result, base
+
+def _evaluate_in_worker(cenario: Scenario) -> Dict:
+    return evaluate_scenario(_BASE['result'], cenario, _BASE['metricas'])
+
+def evaluate_scenarios(result: PipelineResult, cenarios: List[Scenario], workers: Optional[int] = None) -> List[Dict]:
+    """
+    Avalia vários cenários em paralelo (um processo por núcleo, o resultado base é enviado uma vez
+    por processo). Com workers=1, ou um único cenário, roda no processo atual. Ordem preservada.
+    """
+    base = baseline_metrics(result)
+    workers = min(workers or os.cpu_count() or 1, len(cenarios))
+    if workers <= 1:
+        return [evaluate_scenario(result, c, base) for c in cenarios]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(result, base)) as pool:
+        return list(pool.map(_evaluate_in_worker, cenarios))
@@ -0,0 +1,200 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+from src.services.conflicts_service import calculate_end_hours, convert_series_to_minutes, convert_to_minutes
+from src.utils import sequence_generator
+
+# Colunas da planilha → colunas das tabelas
+COLUNAS_RESERVA = {
+    'Sala': 'sala', 'Dia da semana': 'dia_semana', 'Data Início': 'data_inicio', 'Data Fim': 'data_fim',
+    'Hora Início': 'hora_inicio', 'Hora fim': 'hora_fim', 'Recorrência': 'recorrencia', 'Grupo': 'grupo',
+    'Atividade': 'atividade', 'Responsável': 'responsavel', 'Status': 'status',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reservas (
+    linha INTEGER PRIMARY KEY,
+    sala TEXT, dia_semana TEXT, data_inicio TEXT, data_fim TEXT, hora_inicio TEXT, hora_fim TEXT,
+    recorrencia TEXT, grupo TEXT, atividade TEXT, responsavel TEXT, status TEXT
+);
+CREATE TABLE IF NOT EXISTS ocorrencias (
+    pos INTEGER PRIMARY KEY,            -- posição da linha em df_expandido
+    id_reserva TEXT,
+    sala TEXT,
+    grupo TEXT,
+    atividade TEXT,
+    responsavel TEXT,
+    status TEXT,
+    dia_semana TEXT,
+    data TEXT,                          -- AAAA-MM-DD (ordenável)
+    data_br TEXT,                       -- DD/MM/AAAA, como na planilha
+    hora_inicio TEXT,
+    hora_fim TEXT,                      -- hora fim calculada (vazia = início + 3h)
+    inicio_min INTEGER,
+    fim_min INTEGER
+);
+CREATE TABLE IF NOT EXISTS salas (
+    sala TEXT PRIMARY KEY,
+    capacidade REAL
+);
+CREATE INDEX IF NOT EXISTS ix_ocorrencias_sala_data_inicio ON ocorrencias (sala, data, inicio_min);
+CREATE INDEX IF NOT EXISTS ix_ocorrencias_grupo_data ON ocorrencias (grupo, data);
+"""
+
+# Mesma regra de find_conflicts: na mesma sala e dia, ordenados por hora de início,
+# b conflita com a se começa antes do fim de a e é de outro grupo
+SQL_CONFLITOS = """
+SELECT a.sala, a.data_br, a.dia_semana,
+       a.id_reserva, a.grupo, a.atividade, a.hora_inicio, a.hora_fim, a.responsavel, a.status,
+       b.id_reserva, b.grupo, b.atividade, b.hora_inicio, b.hora_fim, b.responsavel, b.status
+FROM ocorrencias a
+JOIN ocorrencias b
+  ON b.sala = a.sala AND b.data = a.data
+ AND (b.hora_inicio > a.hora_inicio OR (b.hora_inicio = a.hora_inicio AND b.pos > a.pos))
+ AND b.hora_inicio < a.hora_fim
+WHERE a.grupo IS NOT b.grupo
+ORDER BY a.sala, a.data_br, a.hora_inicio, a.pos, b.hora_inicio, b.pos
+"""
+
+SQL_SALAS_LIVRES = """
+SELECT s.sala FROM salas s
+WHERE NOT EXISTS (
+    SELECT 1 FROM ocorrencias o
+    WHERE o.sala = s.sala AND o.data = ? AND o.inicio_min < ? AND o.fim_min > ?
+)
+ORDER BY s.sala
+"""
+
+def _data_iso(data_br: str) -> Optional[str]:
+    try:
+        dia, mes, ano = data_br.split('/')
+        return f"{ano}-{mes}-{dia}"
+    except (AttributeError, ValueError):
+        return None
+
+def _texto(valor) -> Optional[str]:
+    return None if pd.isna(valor) else str(valor)
+
+class OccurrenceStore:
+    """
+    Armazenamento opcional em SQLite das reservas e ocorrências expandidas, com índices em
+    (sala, data, início) e (grupo, data). Conflitos, salas livres e filtros viram consultas SQL
+    indexadas em vez de varreduras nos DataFrames. É uma cópia a mais: o snapshot continua com
+    df_expandido em memória (as páginas, o cubo de ocupação, os feeds e o write-back leem o
+    DataFrame), então o store não reduz a memória do processo, mesmo com arquivo em disco (`caminho`).
+
+    Uma conexão por store, compartilhada entre threads e serializada por um lock.
+    """
+
+    def __init__(self, caminho: str = ":memory:"):
+        if caminho != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        self.caminho = caminho
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript("PRAGMA journal_mode=WAL;" if caminho != ":memory:" else "")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def load(self, df_reservas: pd.DataFrame, df_expandido: pd.DataFrame, df_salas: pd.DataFrame):
+        """Substitui todo o conteúdo em uma única transação (executemany por tabela)"""
+        reservas = df_reservas.reindex(columns=list(COLUNAS_RESERVA))
+        linhas_reservas = [(i, *map(_texto, valores)) for i, valores in
+                           enumerate(reservas.itertuples(index=False, name=None))]
+
+        df = df_expandido
+        hora_fim = calculate_end_hours(df['Hora Início'], df['Hora fim'])
+        data_iso = pd.to_datetime(df['Data Ocorrência'], format='%d/%m/%Y', errors='coerce').dt.strftime('%Y-%m-%d')
+        linhas_ocorrencias = list(zip(
+            range(len(df)),
+            df['id_reserva'].astype(str),
+            df['Sala'].map(_texto), df['Grupo'].map(_texto), df['Atividade'].map(_texto),
+            df['Responsável'].map(_texto), df['Status'].map(_texto), df['Dia da semana'].map(_texto),
+            data_iso.where(data_iso.notna(), None), df['Data Ocorrência'].map(_texto),
+            df['Hora Início'].map(_texto), hora_fim,
+            convert_series_to_minutes(df['Hora Início']).tolist(), convert_series_to_minutes(hora_fim).tolist(),
+        ))
+
+        capacidade = pd.to_numeric(df_salas['Capacidade'], errors='coerce').fillna(0) if not df_salas.empty else []
+        linhas_salas = list(zip(df_salas['Sala'].map(_texto), capacidade)) if not df_salas.empty else []
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM reservas")
+            self._conn.execute("DELETE FROM ocorrencias")
+            self._conn.execute("DELETE FROM salas")
+            self._conn.executemany(f"INSERT INTO reservas VALUES ({','.join('?' * 12)})", linhas_reservas)
+            self._conn.executemany(f"INSERT INTO ocorrencias VALUES ({','.join('?' * 14)})", linhas_ocorrencias)
+            self._conn.executemany("INSERT OR REPLACE INTO salas VALUES (?, ?)", linhas_salas)
+        with self._lock:
+            self._conn.execute("ANALYZE")
+
+    def count(self, tabela: str = "ocorrencias") -> int:
+        if tabela not in ("reservas", "ocorrencias", "salas"):
+            raise ValueError(f"Tabela desconhecida: {tabela}")
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+
+    def find_conflicts(self) -> List[Dict]:
+        """Mesmo resultado (e formato) de conflicts_service.find_conflicts"""
+        with self._lock:
+            linhas = self._conn.execute(SQL_CONFLITOS).fetchall()
+        conflitos = []
+        for (sala, data, dia_semana, id1, grupo1, ativ1, ini1, fim1, resp1, status1,
+             id2, grupo2, ativ2, ini2, fim2, resp2, status2) in linhas:
+            conflitos.append({
+                'id': sequence_generator.generate_id([sala, data, id1, id2]),
+                'sala': sala,
+                'data': data,
+                'dia_semana': dia_semana,
+                'id_reserva1': id1,
+                'grupo1': grupo1,
+                'atividade1': ativ1,
+                'horario1': f"{ini1}-{fim1}",
+                'responsavel1': resp1,
+                'status1': status1,
+                'id_reserva2': id2,
+                'grupo2': grupo2,
+                'atividade2': ativ2,
+                'horario2': f"{ini2}-{fim2}",
+                'responsavel2': resp2,
+                'status2': status2,
+            })
+        return conflitos
+
+    def available_rooms(self, data: str, hora_inicio: str, hora_fim: str) -> List[str]:
+        """Salas sem ocorrência sobreposta ao horário (data DD/MM/AAAA), como search_available_rooms"""
+        with self._lock:
+            linhas = self._conn.execute(SQL_SALAS_LIVRES,
+                                        (_data_iso(data), convert_to_minutes(hora_fim),
+                                         convert_to_minutes(hora_inicio))).fetchall()
+        return [sala for (sala,) in linhas]
+
+    def occurrences(self, data_inicio: Optional[str] = None, data_fim: Optional[str] = None,
+                    salas: Optional[Iterable[str]] = None, grupos: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Ocorrências filtradas por intervalo de datas (AAAA-MM-DD, fim exclusivo), salas e grupos,
+        ordenadas por data e hora. `pos` é a posição da linha em df_expandido.
+        """
+        condicoes, parametros = [], []
+        if data_inicio:
+            condicoes.append("data >= ?")
+            parametros.append(data_inicio)
+        if data_fim:
+            condicoes.append("data < ?")
+            parametros.append(data_fim)
+        for coluna, valores in (('sala', salas), ('grupo', grupos)):
+            if valores:
+                valores = list(valores)
+                condicoes.append(f"{coluna} IN ({','.join('?' * len(valores))})")
+                parametros.extend(valores)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        with self._lock:
+            return pd.read_sql_query(f"SELECT * FROM ocorrencias {where} ORDER BY data, inicio_min, pos",
+                                     self._conn, params=parametros)
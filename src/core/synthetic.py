@@ -0,0 +1,89 @@
+import random
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Dict
+
+import pandas as pd
+
+DIAS = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']  # ordem de datetime.weekday()
+ATIVIDADES = ['Reunião', 'Formação', 'Ensaio', 'Encontro', 'Oração', 'Catequese']
+RESPONSAVEIS = ['Ana', 'João', 'Maria', 'José', 'Paulo', 'Marta', 'Pedro', 'Lúcia']
+
+@dataclass(frozen=True)
+class WorkloadConfig:
+    """
+    Parâmetros da carga sintética. Os valores padrão reproduzem o tamanho da base real (1x).
+    mix: proporção de cada tipo de recorrência ('' = evento único).
+    densidade_conflitos: fração das reservas criadas de propósito no mesmo horário/sala de outra.
+    """
+    reservas: int = 120
+    salas: int = 8
+    grupos: int = 24
+    mix: Dict[str, float] = field(default_factory=lambda: {'Semanal': 0.4, 'Quinzenal': 0.2, 'Mensal': 0.2, '': 0.2})
+    densidade_conflitos: float = 0.1
+    seed: int = 42
+
+    def scaled(self, fator: int) -> 'WorkloadConfig':
+        """Mesma carga multiplicada por `fator` (salas e grupos crescem junto, mantendo a densidade)"""
+        return replace(self, reservas=self.reservas * fator, salas=self.salas * fator, grupos=self.grupos * fator)
+
+def _dia_semana_coluna(dia: str) -> str:
+    return dia if dia in ('Sábado', 'Domingo') else f"{dia}-feira"
+
+def _primeira_data(rnd: random.Random, dia: str) -> datetime:
+    """Primeira ocorrência do dia da semana a partir de uma data entre janeiro e março"""
+    base = datetime(2026, 1, 1) + timedelta(days=rnd.randint(0, 89))
+    return base + timedelta(days=(DIAS.index(dia) - base.weekday()) % 7)
+
+def _recorrencia(rnd: random.Random, tipo: str, dia: str) -> str:
+    if tipo == 'Mensal':
+        return f"Mensal-{rnd.randint(1, 4)}º-{dia}"
+    return f"{tipo}-{dia}" if tipo else ''
+
+def generate_workload(config: WorkloadConfig = WorkloadConfig()) -> Dict[str, pd.DataFrame]:
+    """
+    Gera as abas Reservas/Salas/Grupos no mesmo formato (texto) retornado por load_all_data_gsheets.
+    A mesma configuração (incluindo seed) sempre gera os mesmos dados.
+    """
+    rnd = random.Random(config.seed)
+    salas = [f"Sala {i}" for i in range(1, config.salas + 1)]
+    grupos = [f"Grupo {i}" for i in range(1, config.grupos + 1)]
+    tipos, pesos = zip(*config.mix.items())
+
+    linhas = []
+    for _ in range(config.reservas):
+        if linhas and rnd.random() < config.densidade_conflitos:
+            # Conflito proposital: outro grupo, mesma sala/dia/recorrência, começando dentro do horário
+            base = rnd.choice(linhas)
+            h = int(base['Hora Início'][:2])
+            linhas.append({**base,
+                           'Grupo': rnd.choice([g for g in grupos if g != base['Grupo']] or grupos),
+                           'Hora Início': f"{h:02d}:30",
+                           'Hora fim': f"{min(h + rnd.randint(1, 2), 23):02d}:30",
+                           'Atividade': rnd.choice(ATIVIDADES)})
+            continue
+
+        dia = rnd.choice(DIAS)
+        tipo = rnd.choices(tipos, pesos)[0]
+        inicio = _primeira_data(rnd, dia)
+        h = rnd.randint(7, 20)
+        linhas.append({
+            'Sala': rnd.choice(salas),
+            'Dia da semana': _dia_semana_coluna(dia),
+            'Data Início': inicio.strftime('%d/%m/%Y'),
+            'Data Fim': (datetime(2026, rnd.randint(6, 12), rnd.randint(1, 28)).strftime('%d/%m/%Y')
+                         if tipo and rnd.random() < 0.8 else ''),
+            'Hora Início': f"{h:02d}:{rnd.choice(['00', '30'])}",
+            'Hora fim': f"{min(h + rnd.randint(1, 3), 23):02d}:00",
+            'Recorrência': _recorrencia(rnd, tipo, dia),
+            'Grupo': rnd.choice(grupos),
+            'Atividade': rnd.choice(ATIVIDADES),
+            'Responsável': '/'.join(rnd.sample(RESPONSAVEIS, rnd.randint(1, 3))),
+            'Status': rnd.choice(['Confirmado', 'Confirmado', 'Pendente']),
+        })
+
+    return {
+        'Reservas': pd.DataFrame(linhas),
+        'Salas': pd.DataFrame({'Sala': salas, 'Capacidade': [str(rnd.randint(10, 80)) for _ in salas]}),
+        'Grupos': pd.DataFrame({'Grupo': grupos, '# Participantes': [str(rnd.randint(5, 60)) for _ in grupos]}),
+    }
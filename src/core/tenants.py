@@ -0,0 +1,148 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import pandas as pd
+from src.core import pipeline
+from src.core.result_cache import ResultCache
+from src.core.sqlite_store import OccurrenceStore
+from src.core.worker import PipelineWorker, Snapshot
+
+DEFAULT_TENANT = "default"
+
+@dataclass(frozen=True)
+class Tenant:
+    """Uma unidade (paróquia/prédio) com sua própria planilha ou snapshot local"""
+    id: str
+    nome: str
+    tipo: str                   # 'gsheets' | 'snapshot'
+    chave: str                  # spreadsheet_id ou diretório do snapshot
+    creds: Dict = field(default_factory=dict, compare=False, hash=False, repr=False)
+
+def _tenant_from(id: str, nome: str, config: Mapping, creds_padrao: Dict) -> Tenant:
+    if config.get("snapshot_dir"):
+        return Tenant(id, nome, 'snapshot', str(config["snapshot_dir"]))
+    creds = dict(config["gcp_service_account"]) if "gcp_service_account" in config else creds_padrao
+    return Tenant(id, nome, 'gsheets', str(config.get("spreadsheet_id", "")), creds)
+
+def parse_tenants(config: Mapping) -> List[Tenant]:
+    """
+    Lê as unidades da configuração (secrets.toml):
+
+        [tenants.santo_afonso]
+        nome = "Paróquia Santo Afonso"
+        spreadsheet_id = "..."          # ou snapshot_dir = "..."
+
+    Sem a seção [tenants], usa spreadsheet_id/snapshot_dir do nível raiz como unidade única.
+    A service account do nível raiz vale para todas, salvo se a unidade definir a sua.
+    """
+    creds_padrao = dict(config["gcp_service_account"]) if "gcp_service_account" in config else {}
+    tenants = config.get("tenants") or {}
+    if not tenants:
+        return [_tenant_from(DEFAULT_TENANT, config.get("nome", "Paróquia Santo Afonso"), config, creds_padrao)]
+    return [_tenant_from(id, cfg.get("nome", id), cfg, creds_padrao) for id, cfg in tenants.items()]
+
+def _tamanho_mb(valor) -> float:
+    """Estimativa (rasa) de memória de listas de dicionários de conflitos/sugestões"""
+    total = sys.getsizeof(valor)
+    for item in valor:
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            total += sum(sys.getsizeof(v) for v in item.values())
+    return total / 1024 ** 2
+
+def snapshot_size_mb(snapshot: Optional[Snapshot]) -> float:
+    if snapshot is None:
+        return 0.0
+    r = snapshot.result
+    dfs = (r.df_reservas, r.df_salas, r.df_grupos, r.df_expandido)
+    return (sum(df.memory_usage(deep=True).sum() for df in dfs) / 1024 ** 2
+            + _tamanho_mb(r.conflitos) + _tamanho_mb(r.sugestoes) + _tamanho_mb(r.eventos))
+
+class TenantRegistry:
+    """
+    Um PipelineWorker por unidade, criado sob demanda. Os workers ficam em ordem de uso (LRU)
+    e, quando a soma dos snapshots passa de `memoria_max_mb`, os menos usados são descartados
+    (a unidade volta a ser carregada se for acessada de novo). O número de carregamentos
+    simultâneos da planilha é limitado por `max_cargas`. Com `cache`, cada unidade grava e
+    reaproveita seus resultados em disco (namespace = id da unidade); com `sqlite_dir`, cada unidade
+    tem seu banco SQLite (<sqlite_dir>/<id>.sqlite3) para as consultas indexadas do pipeline.
+    """
+
+    def __init__(self, tenants: List[Tenant], memoria_max_mb: float = 512, max_cargas: int = 4,
+                 intervalo_s: Optional[float] = None, cache: Optional[ResultCache] = None,
+                 sqlite_dir: Optional[str] = None):
+        self.tenants = {t.id: t for t in tenants}
+        self.memoria_max_mb = memoria_max_mb
+        self._intervalo_s = intervalo_s
+        self._cache = cache
+        self._sqlite_dir = sqlite_dir
+        self._cargas = threading.BoundedSemaphore(max_cargas)
+        self._workers: "OrderedDict[str, PipelineWorker]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._tamanhos: Dict[str, Tuple[Snapshot, float]] = {}
+        self._ao_descartar: List[Callable[[str], None]] = []
+        self.descartes = 0
+
+    def on_evict(self, callback: Callable[[str], None]):
+        """Registra uma função chamada com o id da unidade descartada (ex.: limpar feeds)"""
+        self._ao_descartar.append(callback)
+
+    def _loader(self, tenant: Tenant):
+        def carregar(diagnostics) -> Dict[str, pd.DataFrame]:
+            with self._cargas:
+                if tenant.tipo == 'snapshot':
+                    return pipeline.load_snapshot(tenant.chave, diagnostics)
+                return pipeline.load_from_gsheets(tenant.chave, tenant.creds, diagnostics)
+        return carregar
+
+    def get(self, tenant_id: str) -> PipelineWorker:
+        """Worker da unidade (criado e iniciado na primeira vez); marca a unidade como usada agora"""
+        with self._lock:
+            worker = self._workers.get(tenant_id)
+            if worker is None:
+                store = (OccurrenceStore(os.path.join(self._sqlite_dir, f"{tenant_id}.sqlite3"))
+                         if self._sqlite_dir else None)
+                worker = PipelineWorker(self._loader(self.tenants[tenant_id]), self._intervalo_s,
+                                        self._cache, tenant_id, store).start()
+                self._workers[tenant_id] = worker
+            self._workers.move_to_end(tenant_id)
+        self.enforce_budget(manter=tenant_id)
+        return worker
+
+    def _size_mb(self, tenant_id: str, worker: PipelineWorker) -> float:
+        # O tamanho só é recalculado quando o worker publica um novo snapshot
+        snapshot = worker.snapshot
+        anterior = self._tamanhos.get(tenant_id)
+        if anterior is None or anterior[0] is not snapshot:
+            anterior = (snapshot, snapshot_size_mb(snapshot))
+            self._tamanhos[tenant_id] = anterior
+        return anterior[1]
+
+    def usage(self) -> Dict[str, float]:
+        """Memória estimada (MB) por unidade carregada, da menos para a mais usada recentemente"""
+        with self._lock:
+            return {id: round(self._size_mb(id, w), 1) for id, w in self._workers.items()}
+
+    def enforce_budget(self, manter: Optional[str] = None):
+        """Descarta as unidades menos usadas até caber no orçamento (nunca a unidade `manter`)"""
+        descartadas = []
+        with self._lock:
+            tamanhos = {id: self._size_mb(id, w) for id, w in self._workers.items()}
+            total = sum(tamanhos.values())
+            for id in list(self._workers):
+                if total <= self.memoria_max_mb:
+                    break
+                if id == manter or self._workers[id].snapshot is None:
+                    continue
+                self._workers.pop(id).stop()
+                self._tamanhos.pop(id, None)
+                total -= tamanhos[id]
+                descartadas.append(id)
+            self.descartes += len(descartadas)
+        for id in descartadas:
+            for callback in self._ao_descartar:
+                callback(id)
@@ -0,0 +1,211 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+from src.core import instrumentation, pipeline
+from src.core.conflict_feed import ConflictFeed
+from src.core.diagnostics import Diagnostic
+from src.core.pipeline import PipelineResult
+from src.core.result_cache import ResultCache
+from src.core.sqlite_store import OccurrenceStore
+from src.utils.sequence_generator import generate_version
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[List[Diagnostic]], Dict[str, pd.DataFrame]]
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    Resultado publicado pelo worker. Nunca é alterado depois de publicado: uma atualização
+    gera um novo Snapshot e troca a referência. Quem lê não deve modificar os DataFrames/listas.
+    """
+    versao: str
+    geracao: int
+    gerado_em: float
+    result: PipelineResult
+    metricas: Dict
+    origem: str = 'calculado'   # 'calculado' | 'cache' (em disco) | 'alteracao' (write-back) | 'parcial'
+
+def input_version(dfs: Dict[str, pd.DataFrame]) -> str:
+    """Versão dos dados de entrada (todas as abas), usada para evitar recálculos sem mudança"""
+    return "-".join(generate_version(dfs[nome]) if nome in dfs else "0" for nome in pipeline.SNAPSHOT_TABLES)
+
+class PipelineWorker:
+    """
+    Worker único por processo que executa o pipeline em uma thread própria e publica
+    snapshots imutáveis. As sessões só leem `snapshot` (troca de referência atômica,
+    sem lock); um refresh pedido por várias sessões ao mesmo tempo gera uma única execução.
+    """
+
+    def __init__(self, loader: Loader, intervalo_s: Optional[float] = None,
+                 cache: Optional[ResultCache] = None, namespace: str = "default",
+                 store: Optional[OccurrenceStore] = None):
+        self._loader = loader
+        self._intervalo_s = intervalo_s
+        self._cache = cache
+        self._namespace = namespace
+        self._store = store
+        self._snapshot: Optional[Snapshot] = None
+        self._pedido = threading.Event()
+        self._publicado = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._parar = False
+        self.geracao_pedida = 0
+        self.em_execucao = False
+        self.ultimo_erro: Optional[str] = None
+        # Mudanças nos conflitos entre versões publicadas (novos, resolvidos, mantidos)
+        self.feed = ConflictFeed()
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        return self._snapshot
+
+    def start(self):
+        if self._thread is None:
+            self.geracao_pedida = 1
+            self._pedido.set()
+            self._thread = threading.Thread(target=self._loop, name="pipeline-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Encerra a thread após a execução em andamento (o snapshot atual continua legível)"""
+        self._parar = True
+        self._pedido.set()
+
+    def request_refresh(self) -> int:
+        """Pede um novo cálculo; retorna a geração a aguardar com wait_for()"""
+        with self._publicado:
+            if not self._pedido.is_set():
+                self.geracao_pedida += 1
+                self._pedido.set()
+            return self.geracao_pedida
+
+    def wait_for(self, geracao: int = 1, timeout: Optional[float] = None) -> Optional[Snapshot]:
+        """Bloqueia até existir um snapshot da geração pedida (ou posterior)"""
+        with self._publicado:
+            self._publicado.wait_for(lambda: self._snapshot is not None and self._snapshot.geracao >= geracao,
+                                     timeout)
+        return self._snapshot
+
+    def _loop(self):
+        while True:
+            self._pedido.wait(self._intervalo_s)
+            if self._parar:
+                if self._store is not None:
+                    self._store.close()
+                return
+            with self._publicado:
+                geracao = self.geracao_pedida if self._pedido.is_set() else self.geracao_pedida + 1
+                self.geracao_pedida = geracao
+                self._pedido.clear()
+            self._run(geracao)
+
+    def _run(self, geracao: int):
+        self.em_execucao = True
+        try:
+            recorder = instrumentation.Recorder()
+            diagnostics: List[Diagnostic] = []
+            with recorder.activate():
+                if self._snapshot is None:
+                    self._publish_latest_cached(geracao)
+                with instrumentation.stage('load') as m:
+                    dfs = self._loader(diagnostics)
+                    m.linhas_saida = len(dfs.get('Reservas', []))
+                atual = self._snapshot
+                if not dfs and atual is not None:
+                    # Falha ao carregar: não troca dados válidos por um resultado vazio
+                    raise RuntimeError("; ".join(d.message for d in diagnostics) or "Nenhum dado carregado")
+                versao = input_version(dfs)
+                if atual is not None and atual.versao == versao and atual.origem != 'parcial':
+                    # Mesmos dados: republica o resultado anterior com a nova geração
+                    result, origem = atual.result, atual.origem
+                else:
+                    result, origem = self._compute(versao, geracao, dfs, diagnostics)
+            self._publish(Snapshot(versao, geracao, time.time(), result, recorder.to_dict(), origem))
+            self.ultimo_erro = None
+        except Exception as e:
+            self.ultimo_erro = str(e)
+            # Mantém o último snapshot válido, mas libera quem está esperando
+            atual = self._snapshot
+            if atual is None:
+                vazio = PipelineResult(pd.DataFrame(), pd.DataFrame(), pd.DataFrame(),
+                                       diagnostics=[Diagnostic('error', 'worker', f"Falha no pipeline: {e}")])
+                atual = Snapshot("", geracao, time.time(), vazio, {})
+            else:
+                result = atual.result
+                if not result.completo:
+                    # Falhou no meio: o parcial vira definitivo (com o erro) para a interface parar de esperar
+                    result = replace(result, fase=pipeline.FASE_COMPLETA, diagnostics=result.diagnostics + [
+                        Diagnostic('error', 'worker', f"Falha no pipeline: {e}")])
+                atual = Snapshot(atual.versao, geracao, atual.gerado_em, result, atual.metricas, atual.origem)
+            self._publish(atual)
+        finally:
+            self.em_execucao = False
+
+    def _publish_latest_cached(self, geracao: int):
+        """Partida a frio: publica o último resultado em disco enquanto a planilha é recarregada"""
+        if self._cache is None:
+            return
+        versao = self._cache.latest(self._namespace)
+        if versao is None:
+            return
+        with instrumentation.stage('cache: partida') as m:
+            result = self._cache.load(self._namespace, versao)
+            m.linhas_saida = len(result.df_expandido) if result else 0
+        if result is not None:
+            self._publish(Snapshot(versao, geracao, time.time(), result, {}, 'cache'))
+
+    def _compute(self, versao: str, geracao: int, dfs: Dict[str, pd.DataFrame], diagnostics: List[Diagnostic]):
+        if self._cache is not None:
+            with instrumentation.stage('cache: leitura', cached=True) as m:
+                result = self._cache.load(self._namespace, versao)
+                if result is None:
+                    instrumentation.mark_miss()
+            if result is not None:
+                return result, 'cache'
+
+        # Partida a frio sem nada a mostrar: publica resultados parciais a cada etapa concluída
+        parcial = None
+        if self._snapshot is None:
+            parcial = lambda r: self._publish(Snapshot(versao, geracao, time.time(), r, {}, 'parcial'))
+        result = pipeline.run_pipeline(dfs, diagnostics, self._store, parcial)
+        if self._cache is not None and result.ok:
+            with instrumentation.stage('cache: gravação'):
+                self._save_cached(versao, result)
+        return result, 'calculado'
+
+    def _save_cached(self, versao: str, result: PipelineResult):
+        """Uma falha ao gravar o cache (disco, pyarrow, serialização) não pode descartar um resultado válido"""
+        try:
+            self._cache.save(self._namespace, versao, result)
+        except Exception:
+            logger.warning("Não foi possível gravar o cache de resultados (%s, versão %s)",
+                           self._namespace, versao, exc_info=True)
+
+    def publish_patch(self, result: PipelineResult) -> Snapshot:
+        """
+        Publica um resultado corrigido localmente (ex.: alterações gravadas na planilha) sem recarregar.
+        A versão é a dos dados corrigidos: se a próxima leitura da planilha trouxer os mesmos valores,
+        o resultado é reaproveitado.
+        """
+        versao = input_version({'Reservas': result.df_reservas, 'Salas': result.df_salas,
+                                'Grupos': result.df_grupos})
+        atual = self._snapshot
+        snapshot = Snapshot(versao, atual.geracao if atual else 1, time.time(), result,
+                            atual.metricas if atual else {}, 'alteracao')
+        self._publish(snapshot)
+        if self._cache is not None:
+            self._save_cached(versao, result)
+        return snapshot
+
+    def _publish(self, snapshot: Snapshot):
+        if snapshot.versao and snapshot.result.completo:
+            self.feed.update(snapshot.versao, snapshot.result.conflitos, snapshot.gerado_em)
+        with self._publicado:
+            self._snapshot = snapshot
+            self._publicado.notify_all()
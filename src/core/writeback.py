@@ -0,0 +1,213 @@
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from src.core import diagnostics as diag
+from src.core.diagnostics import Diagnostic
+from src.core.fake_spreadsheet import column_letter
+from src.core.pipeline import PipelineResult, valid_reservations
+from src.services.calendar_service import build_events
+from src.services.conflicts_service import calculate_end_hours, convert_series_to_minutes, convert_to_minutes, find_conflicts
+from src.services.gsheet_service import RESERVAS_COLUMNS
+from src.services.reccuring_service import expand_recurring_events
+from src.services.recommendation_service import generate_recommendations
+from src.utils.sequence_generator import generate_id
+
+# Linha 1 da aba é o cabeçalho: a reserva na posição i do DataFrame está na linha i + 2
+PRIMEIRA_LINHA = 2
+
+@dataclass
+class Change:
+    """
+    Alteração aceita em uma linha da aba Reservas. `versao_linha` é a versão da linha quando os
+    dados foram lidos: se a planilha mudou desde então, a alteração é rejeitada em vez de sobrescrever.
+    Reservas recorrentes ocupam uma única linha, então a alteração vale para toda a série.
+    """
+    linha: int                      # posição em df_reservas (0 = primeira reserva)
+    versao_linha: str
+    novos: Dict[str, str]
+    descricao: str = ""
+
+@dataclass
+class ApplyResult:
+    aplicadas: List[Change] = field(default_factory=list)
+    rejeitadas: List[Tuple[Change, str]] = field(default_factory=list)
+
+def row_version(valores) -> str:
+    return generate_id([str(v).strip() for v in valores])
+
+def _reservation_row(result: PipelineResult, id_reserva: str) -> int:
+    """Posição em df_reservas da reserva que gerou a ocorrência (o índice de df_expandido é o da reserva)"""
+    ocorrencias = result.df_expandido[result.df_expandido['id_reserva'] == id_reserva]
+    if ocorrencias.empty:
+        raise KeyError(f"Ocorrência não encontrada: {id_reserva}")
+    return result.df_reservas.index.get_loc(ocorrencias.index[0])
+
+def _change(result: PipelineResult, linha: int, novos: Dict[str, str], descricao: str) -> Change:
+    atual = result.df_reservas.iloc[linha]
+    return Change(linha, row_version(atual[RESERVAS_COLUMNS]), novos, descricao)
+
+def _intervals(df_expandido: pd.DataFrame) -> pd.DataFrame:
+    """(data, sala, início, fim) em minutos; reservas que passam da meia-noite ocupam até o fim do dia"""
+    inicio = convert_series_to_minutes(df_expandido['Hora Início'])
+    fim = convert_series_to_minutes(calculate_end_hours(df_expandido['Hora Início'], df_expandido['Hora fim']))
+    return pd.DataFrame({'data': df_expandido['Data Ocorrência'].to_numpy(), 'sala': df_expandido['Sala'].to_numpy(),
+                         'inicio': inicio.to_numpy(), 'fim': fim.where(fim > inicio, 24 * 60).to_numpy()})
+
+def series_free_rooms(result: PipelineResult, id_reserva: str, salas: Iterable[str]) -> List[str]:
+    """
+    Salas de `salas` (na mesma ordem) livres em todas as ocorrências da série da reserva:
+    as sugestões olham só a data do conflito, mas a realocação muda a série inteira.
+    """
+    salas = list(salas)
+    df = result.df_expandido
+    rotulo = result.df_reservas.index[_reservation_row(result, id_reserva)]
+    serie = df[df.index == rotulo]
+    outras = df[(df.index != rotulo) & df['Sala'].isin(salas) & df['Data Ocorrência'].isin(set(serie['Data Ocorrência']))]
+    if outras.empty:
+        return salas
+    pares = _intervals(serie)[['data', 'inicio', 'fim']].merge(_intervals(outras), on='data', suffixes=('', '_outra'))
+    sobrepostas = (pares['inicio'] < pares['fim_outra']) & (pares['inicio_outra'] < pares['fim'])
+    ocupadas = set(pares.loc[sobrepostas, 'sala'])
+    return [s for s in salas if s not in ocupadas]
+
+def relocation(result: PipelineResult, id_reserva: str, sala: str) -> Change:
+    """
+    Muda a reserva (série inteira, se recorrente) para outra sala.
+    ValueError se a sala estiver ocupada em alguma das datas da série.
+    """
+    if not series_free_rooms(result, id_reserva, [sala]):
+        raise ValueError(f"{sala} está ocupada em ao menos uma data da série")
+    linha = _reservation_row(result, id_reserva)
+    grupo = result.df_reservas.iloc[linha]['Grupo']
+    return _change(result, linha, {'Sala': sala}, f"{grupo}: {result.df_reservas.iloc[linha]['Sala']} → {sala}")
+
+def shift_time(horario: str, minutos: int) -> str:
+    """
+    Desloca um horário HH:MM em `minutos`. ValueError se o resultado sair do dia (00:00–23:59):
+    a reserva passaria a cruzar a meia-noite, e a validação rejeita fim igual ou anterior ao início.
+    """
+    total = convert_to_minutes(horario) + minutos
+    if not 0 <= total < 24 * 60:
+        raise ValueError(f"Deslocar {horario} em {minutos:+d} min cruza a meia-noite")
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+def shift_interval(inicio: str, fim, minutos: int) -> Dict[str, str]:
+    """Novos 'Hora Início' e 'Hora fim' (se informada) deslocados em `minutos`; ValueError se cruzar a meia-noite"""
+    novos = {'Hora Início': shift_time(str(inicio).strip(), minutos)}
+    if str(fim).strip() not in ('', 'nan'):
+        novos['Hora fim'] = shift_time(str(fim).strip(), minutos)
+    return novos
+
+def time_shift(result: PipelineResult, id_reserva: str, minutos: int) -> Change:
+    """
+    Desloca início e fim da reserva (série inteira, se recorrente) em `minutos`.
+    ValueError se o novo horário cruzar a meia-noite.
+    """
+    linha = _reservation_row(result, id_reserva)
+    atual = result.df_reservas.iloc[linha]
+    novos = shift_interval(atual['Hora Início'], atual['Hora fim'], minutos)
+    return _change(result, linha, novos, f"{atual['Grupo']}: {atual['Hora Início']} → {novos['Hora Início']}")
+
+def apply_changes(worksheet, changes: List[Change], diagnostics: Optional[List[Diagnostic]] = None) -> ApplyResult:
+    """
+    Grava as alterações na aba com uma leitura (verificação das versões das linhas) e uma única
+    chamada batch_update. Linhas alteradas por outra pessoa desde a leitura são rejeitadas.
+    `worksheet` é um gspread.Worksheet ou um FakeWorksheet.
+    """
+    resultado = ApplyResult()
+    if not changes:
+        return resultado
+
+    cabecalho, *linhas = worksheet.get_all_values() or [[]]
+    posicoes = {nome: i for i, nome in enumerate(cabecalho)}
+    faltantes = [c for c in RESERVAS_COLUMNS if c not in posicoes]
+    if faltantes:
+        for change in changes:
+            resultado.rejeitadas.append((change, f"Colunas faltantes na aba: {faltantes}"))
+        return resultado
+
+    celulas = []
+    for change in changes:
+        if change.linha >= len(linhas):
+            resultado.rejeitadas.append((change, "A linha não existe mais na planilha"))
+            continue
+        valores = linhas[change.linha] + [""] * len(cabecalho)
+        if row_version(valores[posicoes[c]] for c in RESERVAS_COLUMNS) != change.versao_linha:
+            resultado.rejeitadas.append((change, "A reserva foi alterada na planilha desde a última leitura"))
+            continue
+        for coluna, valor in change.novos.items():
+            celulas.append({'range': f"{column_letter(posicoes[coluna] + 1)}{change.linha + PRIMEIRA_LINHA}",
+                            'values': [[valor]]})
+        resultado.aplicadas.append(change)
+
+    if celulas:
+        # RAW: a planilha guarda exatamente o texto que o app lê e versiona ("08:30" não vira hora, "101" não vira número)
+        worksheet.batch_update(celulas, value_input_option='RAW')
+    for change, motivo in resultado.rejeitadas:
+        diag.add(diagnostics, 'warning', 'writeback', f"{change.descricao}: {motivo}", change.linha)
+    return resultado
+
+def patch_occurrences(result: PipelineResult, novos_por_linha: Dict[int, Dict[str, str]],
+                      diagnostics: Optional[List[Diagnostic]] = None
+                      ) -> Tuple[pd.DataFrame, pd.DataFrame, List[Dict], set]:
+    """
+    Aplica novos valores a linhas de df_reservas (posição → {coluna: valor}) sem alterar `result`:
+    reexpande só essas reservas e recalcula os conflitos só nos (sala, data) afetados.
+    As linhas alteradas passam pela mesma validação do pipeline (as com erro ficam de fora).
+    Retorna (df_reservas, df_expandido, conflitos, {(sala, data) afetados}).
+    """
+    df_reservas = result.df_reservas.copy()
+    for linha, novos in novos_por_linha.items():
+        for coluna, valor in novos.items():
+            df_reservas.iloc[linha, df_reservas.columns.get_loc(coluna)] = valor
+    rotulos = df_reservas.index[sorted(novos_por_linha)]
+
+    antigas = result.df_expandido.index.isin(rotulos)
+    validas = valid_reservations(df_reservas.loc[rotulos], result.df_salas, result.df_grupos, diagnostics)
+    novas = expand_recurring_events(validas, diagnostics)
+    df_expandido = pd.concat([result.df_expandido[~antigas], novas]).sort_index(kind='stable')
+
+    # Conflitos só podem mudar nos (sala, data) das ocorrências removidas ou criadas
+    afetados = set()
+    for df in (result.df_expandido[antigas], novas):
+        afetados |= set(zip(df['Sala'], df['Data Ocorrência']))
+    chaves = pd.Series(list(zip(df_expandido['Sala'], df_expandido['Data Ocorrência'])), index=df_expandido.index)
+    recalculados = find_conflicts(df_expandido[chaves.isin(afetados).to_numpy()])
+    mantidos = [c for c in result.conflitos if (c['sala'], c['data']) not in afetados]
+    # Mesma ordem de find_conflicts: por (sala, data) e, dentro do grupo, pela ordem original
+    conflitos = sorted(mantidos + recalculados, key=lambda c: (c['sala'], c['data']))
+    return df_reservas, df_expandido, conflitos, afetados
+
+def patch_result(result: PipelineResult, changes: List[Change],
+                 diagnostics: Optional[List[Diagnostic]] = None) -> PipelineResult:
+    """
+    Aplica as alterações ao resultado em memória sem recarregar a planilha: reexpande só as
+    reservas alteradas e recalcula conflitos/sugestões só nos (sala, data) e datas afetados.
+    Não modifica `result` (pode ser o snapshot compartilhado); devolve um novo PipelineResult.
+    """
+    if not changes:
+        return result
+
+    novos_por_linha: Dict[int, Dict[str, str]] = {}
+    for change in changes:
+        novos_por_linha.setdefault(change.linha, {}).update(change.novos)
+    df_reservas, df_expandido, conflitos, afetados = patch_occurrences(result, novos_por_linha, diagnostics)
+
+    # Salas livres mudam em todas as salas das datas afetadas
+    datas = {data for _, data in afetados}
+    sugestoes_por_id = {s['id_conflito']: s for s in result.sugestoes}
+    refazer = [c for c in conflitos if c['data'] in datas or c['id'] not in sugestoes_por_id]
+    sugestoes_por_id.update({s['id_conflito']: s for s in
+                             generate_recommendations(df_expandido, result.df_salas, result.df_grupos, refazer)})
+
+    return replace(
+        result,
+        df_reservas=df_reservas,
+        df_expandido=df_expandido,
+        conflitos=conflitos,
+        sugestoes=[sugestoes_por_id[c['id']] for c in conflitos],
+        eventos=build_events(df_expandido, conflitos, diagnostics),
+        diagnostics=list(result.diagnostics),
+        timings={},
+    )
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+import pandas as pd
+from src.core.tenants import DEFAULT_TENANT
+from src.services.occupancy_service import build_availability_index, free_rooms, room_schedule
+
+HORARIO = re.compile(r'^\d{1,2}:\d{2}$')
+
+# Respostas já serializadas por (unidade, versão, caminho, data de hoje quando omitida); limpa ao encher
+MAX_RESPOSTAS = 4096
+
+STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+class ApiError(Exception):
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+def _data(valor: Optional[str]) -> str:
+    """Aceita DD/MM/AAAA ou AAAA-MM-DD (padrão: hoje); devolve DD/MM/AAAA, como na planilha"""
+    if not valor:
+        return datetime.now().strftime('%d/%m/%Y')
+    for formato in ('%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(valor, formato).strftime('%d/%m/%Y')
+        except ValueError:
+            pass
+    raise ApiError(400, f"Data inválida: {valor} (use DD/MM/AAAA ou AAAA-MM-DD)")
+
+def _horario(params: Dict, nome: str) -> str:
+    valor = params.get(nome, [""])[0]
+    if not HORARIO.match(valor):
+        raise ApiError(400, f"Parâmetro '{nome}' obrigatório no formato HH:MM")
+    return valor.zfill(5)
+
+class AvailabilityApi:
+    """
+    API JSON local (asyncio) de disponibilidade das salas, para quiosques e formulários:
+
+        GET /disponibilidade?data=DD/MM/AAAA&inicio=HH:MM&fim=HH:MM   → salas livres
+        GET /salas/<sala>/agenda?data=DD/MM/AAAA                      → reservas da sala no dia
+        GET /                                                         → unidades, versões e salas
+
+    Outras unidades ficam em /<unidade>/disponibilidade e /<unidade>/salas/... As consultas usam
+    o índice de disponibilidade (occupancy_service), reconstruído só quando a versão publicada muda.
+    Roda em um event loop próprio (uma thread), com conexões keep-alive.
+    Sem autenticação: por padrão só atende a máquina local (127.0.0.1) e não envia cabeçalho CORS;
+    `cors_origin` libera a leitura por páginas de outra origem (ex.: o formulário de reservas).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8503, cors_origin: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.cors_origin = cors_origin
+        self.versoes: Dict[str, str] = {}
+        self._indices: Dict[str, Dict] = {}
+        self._respostas: Dict[Tuple[str, str, str, str], bytes] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def publish(self, versao: str, df_expandido: pd.DataFrame, df_salas: pd.DataFrame,
+                tenant: str = DEFAULT_TENANT) -> bool:
+        """Publica uma nova versão dos dados da unidade. Retorna True se o índice foi reconstruído."""
+        if versao == self.versoes.get(tenant):
+            return False
+        with self._lock:
+            if versao == self.versoes.get(tenant):
+                return False
+            index = build_availability_index(df_expandido, df_salas)
+            # Troca atômica: o event loop lê os dicionários sem lock
+            self._indices = {**self._indices, tenant: index}
+            self.versoes = {**self.versoes, tenant: versao}
+        return True
+
+    def remove(self, tenant: str):
+        """Libera o índice de uma unidade (ex.: descartada do cache)"""
+        with self._lock:
+            self._indices = {t: i for t, i in self._indices.items() if t != tenant}
+            self.versoes = {t: v for t, v in self.versoes.items() if t != tenant}
+
+    @staticmethod
+    def api_path(recurso: str, tenant: str = DEFAULT_TENANT) -> str:
+        prefixo = "" if tenant == DEFAULT_TENANT else f"/{quote(tenant)}"
+        return f"{prefixo}/{recurso}"
+
+    def query(self, alvo: str) -> Tuple[int, bytes]:
+        """Resolve um caminho com query string (ex.: '/disponibilidade?data=...') em (status, corpo JSON)"""
+        url = urlsplit(alvo)
+        partes = [unquote(p) for p in url.path.strip('/').split('/') if p]
+        indices, versoes = self._indices, self.versoes
+
+        if not partes:
+            corpo = {t: {'versao': versoes.get(t), 'salas': i['salas']} for t, i in indices.items()}
+            return 200, json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+
+        tenant = DEFAULT_TENANT
+        if partes[0] in indices and partes[0] not in ('disponibilidade', 'salas'):
+            tenant, partes = partes[0], partes[1:]
+        index = indices.get(tenant)
+        if index is None:
+            return 404, json.dumps({'erro': f"Unidade não carregada: {tenant}"}, ensure_ascii=False).encode('utf-8')
+
+        params = parse_qs(url.query)
+        # Sem `data`, a consulta é sobre hoje: a data resolvida entra na chave (a resposta muda à meia-noite)
+        hoje = "" if params.get('data', [""])[0] else _data("")
+        chave = (tenant, versoes.get(tenant, ""), alvo, hoje)
+        corpo = self._respostas.get(chave)
+        if corpo is not None:
+            return 200, corpo
+
+        try:
+            if partes == ['disponibilidade']:
+                data = _data(params.get('data', [""])[0])
+                inicio, fim = _horario(params, 'inicio'), _horario(params, 'fim')
+                if fim <= inicio:
+                    raise ApiError(400, "'fim' deve ser depois de 'inicio'")
+                resposta = {'data': data, 'inicio': inicio, 'fim': fim,
+                            'salas_livres': free_rooms(index, data, inicio, fim)}
+            elif len(partes) == 3 and partes[0] == 'salas' and partes[2] == 'agenda':
+                sala = partes[1]
+                if sala not in index['salas']:
+                    raise ApiError(404, f"Sala não encontrada: {sala}")
+                data = _data(params.get('data', [""])[0])
+                resposta = {'sala': sala, 'data': data, 'reservas': room_schedule(index, sala, data)}
+            else:
+                raise ApiError(404, f"Recurso não encontrado: {url.path}")
+        except ApiError as e:
+            return e.status, json.dumps({'erro': str(e)}, ensure_ascii=False).encode('utf-8')
+
+        resposta['versao'] = chave[1]
+        corpo = json.dumps(resposta, ensure_ascii=False).encode('utf-8')
+        if len(self._respostas) >= MAX_RESPOSTAS:
+            self._respostas = {}
+        self._respostas[chave] = corpo
+        return 200, corpo
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                cabecalho = await reader.readuntil(b"\r\n\r\n")
+                linhas = cabecalho.decode('latin-1').split("\r\n")
+                metodo, alvo, versao_http = (linhas[0].split(" ") + ["", ""])[:3]
+                headers = {k.strip().lower(): v.strip() for k, _, v in (l.partition(":") for l in linhas[1:] if l)}
+                if headers.get('content-length'):
+                    await reader.readexactly(int(headers['content-length']))
+
+                if metodo == "GET":
+                    status, corpo = self.query(alvo)
+                else:
+                    status, corpo = 405, b'{"erro": "Use GET"}'
+
+                manter = (headers.get('connection', '').lower() != 'close'
+                          and (versao_http == "HTTP/1.1" or headers.get('connection', '').lower() == 'keep-alive'))
+                cors = f"Access-Control-Allow-Origin: {self.cors_origin}\r\n" if self.cors_origin else ""
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(corpo)}\r\n"
+                    f"{cors}"
+                    f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode('latin-1') + corpo)
+                await writer.drain()
+                if not manter:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """Atende até o servidor ser fechado (uso direto em um event loop, ex.: CLI)"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self):
+        """Inicia o event loop da API em uma thread própria"""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        pronto = threading.Event()
+        erro = []
+
+        async def iniciar():
+            try:
+                self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            except OSError as e:
+                erro.append(e)
+            finally:
+                pronto.set()
+
+        def rodar():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(iniciar())
+            if not erro:
+                self._loop.run_forever()
+
+        threading.Thread(target=rodar, name="availability-api", daemon=True).start()
+        pronto.wait()
+        if erro:
+            self._loop = None
+            raise erro[0]
+
+    def stop(self):
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+        self._server = None
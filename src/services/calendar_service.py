@@ -1,5 +1,7 @@
 import pandas as pd
-import streamlit as st
+from typing import List, Optional
+from src.core import diagnostics as diag
+from src.core.diagnostics import Diagnostic
 
 def prepare_resources(df_expandido):
     resources = []
@@ -12,13 +14,13 @@ def prepare_resources(df_expandido):
         resources.append(resource)
     return resources
 
-def prepare_events(df_expandido, group_colors, ids_em_conflito):
+def prepare_events(df_expandido, group_colors, ids_em_conflito, diagnostics: Optional[List[Diagnostic]] = None):
     events = []
     for _, row in df_expandido.iterrows():
         tem_conflito = row['id_reserva'] in ids_em_conflito
         
         # Combine date and time for start and end
-        data_ocorrencia = convert_date_format(row['Data Ocorrência'])
+        data_ocorrencia = convert_date_format(row['Data Ocorrência'], diagnostics)
         start_datetime = f"{data_ocorrencia}T{row['Hora Início']}:00-03:00"
         end_datetime = f"{data_ocorrencia}T{row['Hora fim']}:00-03:00"
         
@@ -49,6 +51,15 @@ def prepare_events(df_expandido, group_colors, ids_em_conflito):
         events.append(event)
     return events
 
+def build_events(df_expandido, conflitos, diagnostics: Optional[List[Diagnostic]] = None):
+    """
+    Eventos do calendário para todas as ocorrências (cores por grupo na ordem de
+    aparição, a mesma usada pelo índice de filtros da página).
+    """
+    groups = tuple(df_expandido['Grupo'].dropna().unique())
+    ids_em_conflito = {c['id_reserva1'] for c in conflitos} | {c['id_reserva2'] for c in conflitos}
+    return prepare_events(df_expandido, generate_color_palette(groups), ids_em_conflito, diagnostics)
+
 def generate_color_palette(groups):
     """Generate a color palette for rooms"""
     colors = [
@@ -181,7 +192,7 @@ def get_calendar_modes():
             "Agenda",
         )
 
-def convert_date_format(date_str):
+def convert_date_format(date_str, diagnostics: Optional[List[Diagnostic]] = None):
     """Convert dd/mm/yyyy to yyyy-mm-dd format"""
     try:
         if pd.isna(date_str):
@@ -196,5 +207,5 @@ def convert_date_format(date_str):
             return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
         return date_str
     except Exception as e:
-        st.sidebar.error(f"Error converting date {date_str}: {e}")
+        diag.add(diagnostics, 'error', 'events', f"Error converting date {date_str}: {e}")
         return None
\ No newline at end of file
@@ -1,6 +1,6 @@
 import pandas as pd
 from typing import List, Dict
-import streamlit as st
+from datetime import datetime
 from src.utils import sequence_generator
 
 def calculate_end_hour(hora_inicio: str, hora_fim: str) -> str:
@@ -23,6 +23,24 @@ def calculate_end_hour(hora_inicio: str, hora_fim: str) -> str:
         return "22:00"  # Fallback
 
 
+def calculate_end_hours(horas_inicio: pd.Series, horas_fim: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de calculate_end_hour para uma coluna inteira.
+    Mantém a hora fim informada; quando vazia, soma 3 horas à hora início.
+    """
+    fim = horas_fim.astype(str).str.strip()
+    informada = horas_fim.notna() & (fim != '') & (fim != 'nan')
+
+    partes = horas_inicio.astype(str).str.strip().str.extract(r'^(\d+):(\d+)$')
+    h = pd.to_numeric(partes[0], errors='coerce')
+    m = pd.to_numeric(partes[1], errors='coerce')
+    calculada = (((h + 3) % 24).astype('Int64').astype(str).str.zfill(2) + ':' +
+                 m.astype('Int64').astype(str).str.zfill(2))
+    calculada = calculada.where(h.notna() & m.notna(), "22:00")  # Fallback
+
+    return fim.where(informada, calculada)
+
+
 def convert_to_minutes(horario: str) -> int:
     """Converte horário HH:MM para minutos desde meia-noite"""
     try:
@@ -32,6 +50,13 @@ def convert_to_minutes(horario: str) -> int:
         return 0
 
 
+def convert_series_to_minutes(horarios: pd.Series) -> pd.Series:
+    """Versão vetorizada de convert_to_minutes; horários inválidos viram 0"""
+    partes = horarios.astype(str).str.strip().str.extract(r'^(\d+):(\d+)$')
+    minutos = pd.to_numeric(partes[0], errors='coerce') * 60 + pd.to_numeric(partes[1], errors='coerce')
+    return minutos.fillna(0).astype(int)
+
+
 def verify_overbooking(h1_inicio: str, h1_fim: str, h2_inicio: str, h2_fim: str) -> bool:
     """
     Verifica se dois intervalos de horário se sobrepõem
@@ -45,7 +70,6 @@ def verify_overbooking(h1_inicio: str, h1_fim: str, h2_inicio: str, h2_fim: str)
     # Não há sobreposição se um termina antes do outro começar
     return not (fim1 <= inicio2 or fim2 <= inicio1)
 
-@st.cache_data
 def find_conflicts(df_expandido: pd.DataFrame) -> List[Dict]:
     """
     Detecta conflitos de horário considerando TODAS as opções (Opção 1 e 2)
@@ -109,4 +133,35 @@ def find_conflicts(df_expandido: pd.DataFrame) -> List[Dict]:
     return conflitos
 
 def has_conflict(id, conflict_ids):    
-    return id in conflict_ids
\ No newline at end of file
+    return id in conflict_ids
+
+def build_conflict_store(conflitos: List[Dict], sugestoes: List[Dict]) -> Dict[str, Dict]:
+    """
+    Indexa conflitos e sugestões pelo id do conflito.
+    Cada registro traz o conflito, sua sugestão (ou None) e chaves de ordenação já calculadas.
+    """
+    sugestoes_por_id = {s['id_conflito']: s for s in sugestoes}
+    store = {}
+    for conf in conflitos:
+        sug = sugestoes_por_id.get(conf['id'])
+        store[conf['id']] = {
+            'conflito': conf,
+            'sugestao': sug,
+            'data_ordem': datetime.strptime(conf['data'], '%d/%m/%Y'),
+            'resolvido': bool(sug and sug['resolvido']),
+            'conflito_curto': bool(sug and sug.get('ajuste_tempo')),
+        }
+    return store
+
+# Chaves de ordenação disponíveis na listagem de conflitos
+CONFLICT_SORT_KEYS = {
+    "Data": lambda r: (r['data_ordem'], r['conflito']['horario1']),
+    "Sala": lambda r: (r['conflito']['sala'], r['data_ordem'], r['conflito']['horario1']),
+    "Grupo": lambda r: (r['conflito']['grupo1'], r['data_ordem']),
+    "Sem solução primeiro": lambda r: (r['resolvido'], r['data_ordem'], r['conflito']['horario1']),
+}
+
+def sort_conflict_ids(store: Dict[str, Dict], ids: List[str], ordem: str = "Data", decrescente: bool = False) -> List[str]:
+    """Ordena ids de conflito usando as chaves pré-calculadas do store"""
+    chave = CONFLICT_SORT_KEYS[ordem]
+    return sorted(ids, key=lambda i: chave(store[i]), reverse=decrescente)
@@ -0,0 +1,24 @@
+import io
+import pandas as pd
+
+# Formato -> (extensão, MIME)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+def build_export(df: pd.DataFrame, formato: str = "CSV") -> bytes:
+    """
+    Serializa o DataFrame no formato pedido. O arquivo é montado inteiro em memória: o
+    st.download_button precisa do conteúdo completo (guarda os bytes até o download), então
+    gerar em blocos não reduziria o pico.
+    """
+    buffer = io.BytesIO()
+    if formato == "Parquet":
+        df.to_parquet(buffer, index=False)
+    else:
+        df.to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
+
+def export_file_name(nome: str, formato: str) -> str:
+    return f"{nome}.{EXPORT_FORMATS[formato][0]}"
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, unquote, urlparse
+
+import pandas as pd
+from src.core.tenants import DEFAULT_TENANT
+from src.services.ical_service import build_feeds
+
+class FeedServer:
+    """
+    Servidor HTTP local dos feeds iCalendar (/salas/<sala>.ics e /grupos/<grupo>.ics;
+    outras unidades ficam em /<unidade>/salas/... e /<unidade>/grupos/...).
+    Os feeds só são regenerados quando a versão do dataset publicada muda, e cada
+    resposta leva um ETag para que os clientes revalidem com If-None-Match.
+    Sem autenticação: por padrão só atende a máquina local (127.0.0.1); para celulares na rede,
+    configure o host explicitamente (atrás de um proxy reverso, de preferência).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8502):
+        self.host = host
+        self.port = port
+        self.versoes: Dict[str, str] = {}
+        self._feeds: Dict[str, Dict[Tuple[str, str], Tuple[bytes, str]]] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    def publish(self, versao: str, df_reservas: pd.DataFrame, tenant: str = DEFAULT_TENANT) -> bool:
+        """Publica uma nova versão dos dados da unidade. Retorna True se os feeds foram regenerados."""
+        if versao == self.versoes.get(tenant):
+            return False
+        with self._lock:
+            if versao == self.versoes.get(tenant):
+                return False
+            feeds = {}
+            for chave, conteudo in build_feeds(df_reservas).items():
+                etag = f'"{versao}-{hashlib.md5(conteudo).hexdigest()[:8]}"'
+                feeds[chave] = (conteudo, etag)
+            # Troca atômica: leitores veem a versão antiga ou a nova, nunca uma mistura
+            self._feeds = {**self._feeds, tenant: feeds}
+            self.versoes = {**self.versoes, tenant: versao}
+        return True
+
+    def remove(self, tenant: str):
+        """Libera os feeds de uma unidade (ex.: descartada do cache)"""
+        with self._lock:
+            self._feeds = {t: f for t, f in self._feeds.items() if t != tenant}
+            self.versoes = {t: v for t, v in self.versoes.items() if t != tenant}
+
+    def get_feed(self, tipo: str, nome: str, tenant: str = DEFAULT_TENANT) -> Optional[Tuple[bytes, str]]:
+        return self._feeds.get(tenant, {}).get((tipo, nome))
+
+    def list_feeds(self, tenant: str = DEFAULT_TENANT) -> Dict[str, list]:
+        feeds = self._feeds.get(tenant, {})
+        return {
+            tipo: sorted(nome for (t, nome) in feeds if t == tipo)
+            for tipo in ('salas', 'grupos')
+        }
+
+    @staticmethod
+    def feed_path(tipo: str, nome: str, tenant: str = DEFAULT_TENANT) -> str:
+        prefixo = "" if tenant == DEFAULT_TENANT else f"/{quote(tenant)}"
+        return f"{prefixo}/{tipo}/{quote(nome)}.ics"
+
+    def start(self):
+        if self._httpd is not None:
+            return
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name="ical-feed-server", daemon=True).start()
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+def _make_handler(server: FeedServer):
+    class FeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            caminho = unquote(urlparse(self.path).path).strip('/')
+
+            if caminho == "":
+                corpo = json.dumps({t: {'versao': v, **server.list_feeds(t)} for t, v in server.versoes.items()},
+                                   ensure_ascii=False).encode('utf-8')
+                self._responder(200, corpo, "application/json; charset=utf-8")
+                return
+
+            partes = caminho.split('/')
+            tenant = DEFAULT_TENANT if len(partes) == 2 else partes[0]
+            tipo, arquivo = partes[-2:] if len(partes) in (2, 3) else ("", "")
+            if not arquivo.endswith('.ics'):
+                self._responder(404, b"Not found", "text/plain")
+                return
+            feed = server.get_feed(tipo, arquivo[:-len('.ics')], tenant)
+            if feed is None:
+                self._responder(404, b"Not found", "text/plain")
+                return
+
+            conteudo, etag = feed
+            if etag in [t.strip() for t in self.headers.get('If-None-Match', '').split(',')]:
+                self._responder(304, b"", None, etag)
+                return
+            self._responder(200, conteudo, "text/calendar; charset=utf-8", etag)
+
+        def _responder(self, status: int, corpo: bytes, content_type: Optional[str], etag: Optional[str] = None):
+            self.send_response(status)
+            if content_type:
+                self.send_header("Content-Type", content_type)
+            if etag:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "max-age=300")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            if corpo:
+                self.wfile.write(corpo)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FeedHandler
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from functools import reduce
+from typing import Dict, List, Iterable, Optional
+
+DIAS_SEMANA = ["Domingo", "Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado"]
+
+EMPTY_IDS = np.array([], dtype=np.int64)
+
+def build_filter_index(df: pd.DataFrame, campos: Dict[str, List[str]],
+                       campo_dia_semana: Optional[str] = None) -> Dict:
+    """
+    Monta índices invertidos (valor -> posições das linhas) para os campos informados.
+    `campos` mapeia o nome do filtro para uma ou mais colunas; com várias colunas
+    (ex.: grupo1 e grupo2 de um conflito) as posições são unidas.
+    Se `campo_dia_semana` for informado, indexa também os dias da semana pelo texto da coluna.
+    As posições são relativas à ordem das linhas de `df` (0..n-1), sempre ordenadas.
+    """
+    df = df.reset_index(drop=True)
+    index = {'total': len(df), 'campos': {}}
+
+    for nome, colunas in campos.items():
+        valores = {}
+        for col in colunas:
+            for valor, posicoes in df.groupby(col, sort=False).indices.items():
+                posicoes = posicoes.astype(np.int64)
+                valores[valor] = np.union1d(valores[valor], posicoes) if valor in valores else posicoes
+        index['campos'][nome] = valores
+
+    if campo_dia_semana:
+        texto = df[campo_dia_semana].astype(str).str.lower()
+        index['campos']['dia_semana'] = {
+            dia: np.flatnonzero(texto.str.contains(dia.lower(), regex=False).to_numpy())
+            for dia in DIAS_SEMANA
+        }
+
+    return index
+
+def filter_ids(index: Dict, filtros: Dict[str, Iterable]) -> np.ndarray:
+    """
+    Combina os índices: valores de um mesmo campo são unidos (OU) e
+    campos diferentes são intersectados (E). Filtros vazios são ignorados.
+    Retorna as posições ordenadas das linhas selecionadas.
+    """
+    resultado = None
+    for campo, valores in filtros.items():
+        if valores is None or (isinstance(valores, (list, tuple, set)) and not valores):
+            continue
+        if not isinstance(valores, (list, tuple, set)):
+            valores = [valores]
+
+        por_valor = index['campos'][campo]
+        ids = reduce(np.union1d, [por_valor.get(v, EMPTY_IDS) for v in valores])
+        resultado = ids if resultado is None else np.intersect1d(resultado, ids, assume_unique=True)
+
+        if len(resultado) == 0:
+            break
+
+    if resultado is None:
+        return np.arange(index['total'], dtype=np.int64)
+    return resultado
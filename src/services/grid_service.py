@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+def _permutation(df: pd.DataFrame, colunas: List[str], crescente: bool):
+    """Permutação das linhas (estável) e o rank de cada linha; valores ausentes sempre no fim"""
+    perm = df.sort_values(colunas, ascending=crescente, kind='mergesort', na_position='last').index.to_numpy()
+    rank = np.empty(len(perm), dtype=np.int64)
+    rank[perm] = np.arange(len(perm))
+    return perm, rank
+
+def build_sorted_grid(df: pd.DataFrame, ordens: Dict[str, List[str]]) -> Dict:
+    """
+    Prepara uma grade ordenável: para cada ordenação (nome -> colunas tipadas) guarda
+    a permutação das linhas e o rank de cada linha nessa ordem, crescente e decrescente
+    (inverter a crescente levaria as datas/valores ausentes para o topo).
+    Assim, ordenar um subconjunto filtrado custa apenas ordenar os ranks dele.
+    """
+    df = df.reset_index(drop=True)
+    permutacoes = {}
+    for nome, colunas in ordens.items():
+        permutacoes[nome] = (_permutation(df, colunas, True), _permutation(df, colunas, False))
+    return {'frame': df, 'ordens': permutacoes}
+
+def sorted_positions(grid: Dict, posicoes: np.ndarray, ordem: str, decrescente: bool = False) -> np.ndarray:
+    """Ordena as posições filtradas segundo uma das ordenações pré-calculadas"""
+    perm, rank = grid['ordens'][ordem][decrescente]
+    return perm[np.sort(rank[posicoes])]
+
+def grid_page(grid: Dict, posicoes_ordenadas: np.ndarray, inicio: int, fim: int) -> pd.DataFrame:
+    """Materializa apenas as linhas da página pedida"""
+    return grid['frame'].iloc[posicoes_ordenadas[inicio:fim]]
@@ -1,21 +1,26 @@
-import streamlit as st
 import pandas as pd
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from typing import Dict, List, Optional
+from src.core import diagnostics as diag
+from src.core.diagnostics import Diagnostic
 
-@st.cache_data
-def conn_gsheets(spreadsheet_id: str, worksheet_name: str = "Reservas") -> pd.DataFrame:
+SCOPE = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+
+RESERVAS_COLUMNS = ['Sala', 'Dia da semana', 'Data Início', 'Data Fim', 'Hora Início', 'Hora fim', 'Recorrência',
+                    'Grupo', 'Atividade', 'Responsável', 'Status']
+
+def authorize(creds_dict: Dict):
+    """Cria o cliente gspread a partir do dicionário da service account"""
+    # gspread/oauth2client custam ~0,4s de import: só carregam quando a planilha é de fato acessada
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(dict(creds_dict), SCOPE)
+    return gspread.authorize(creds)
+
+def conn_gsheets(spreadsheet_id: str, creds_dict: Dict, worksheet_name: str = "Reservas",
+                 diagnostics: Optional[List[Diagnostic]] = None) -> pd.DataFrame:
     try:
         # Configurar credenciais
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        # Usar secrets do Streamlit
-        creds_dict = st.secrets["gcp_service_account"]
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client = gspread.authorize(creds)
+        client = authorize(creds_dict)
         
         # Abrir planilha
         sheet = client.open_by_key(spreadsheet_id)
@@ -50,19 +55,17 @@ def conn_gsheets(spreadsheet_id: str, worksheet_name: str = "Reservas") -> pd.Da
         
         colunas_faltantes = set(colunas_esperadas) - set(df.columns)
         if colunas_faltantes:
-            st.error(f"❌ Colunas faltantes no Google Sheet: {colunas_faltantes}")
+            diag.add(diagnostics, 'error', 'load', f"Colunas faltantes no Google Sheet: {colunas_faltantes}")
             return pd.DataFrame()
         
-        print("Original dtypes:\n", df.dtypes)
-
         return df
     
     except Exception as e:
-        st.error(f"❌ Erro ao conectar com Google Sheets: {str(e)}")
-        st.info("💡 Verifique se as credenciais estão configuradas corretamente em secrets.toml")
+        diag.add(diagnostics, 'error', 'load', f"Erro ao conectar com Google Sheets: {str(e)}. "
+                 "Verifique se as credenciais estão configuradas corretamente em secrets.toml")
         return pd.DataFrame()
 
-def process_worksheet(worksheet, ex_columns) -> pd.DataFrame:
+def process_worksheet(worksheet, ex_columns, diagnostics: Optional[List[Diagnostic]] = None) -> pd.DataFrame:
     data = worksheet.get_all_records()
     if not data: 
         return pd.DataFrame(columns=ex_columns)
@@ -72,20 +75,18 @@ def process_worksheet(worksheet, ex_columns) -> pd.DataFrame:
     # Validação rápida de colunas
     faltantes = set(ex_columns) - set(df.columns)
     if faltantes:
-        st.error(f"❌ Colunas faltantes na aba '{worksheet.title}': {faltantes}")
+        diag.add(diagnostics, 'error', 'load', f"Colunas faltantes na aba '{worksheet.title}': {faltantes}")
         return pd.DataFrame()
     
     # Seleciona as colunas e converte tudo para string de uma vez (.astype(str))
     return df[ex_columns].astype(str)
 
-@st.cache_data
-def load_all_data_gsheets(spreadsheet_id: str):
+def load_all_data_gsheets(spreadsheet_id: str, creds_dict: Dict,
+                         diagnostics: Optional[List[Diagnostic]] = None) -> Dict[str, pd.DataFrame]:
+    from gspread import WorksheetNotFound
     try:
         # 1. Autenticação (Apenas uma vez)
-        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        creds_dict = st.secrets["gcp_service_account"]
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client = gspread.authorize(creds)
+        client = authorize(creds_dict)
         
         # 2. Abrir a Planilha (Apenas uma vez)
         spreadsheet = client.open_by_key(spreadsheet_id)
@@ -95,19 +96,21 @@ def load_all_data_gsheets(spreadsheet_id: str):
         dict_dataframes = {}
         
         try:
-            dict_dataframes['Reservas'] = process_worksheet(spreadsheet.worksheet("Reservas"),
-                                                                 ['Sala', 'Dia da semana', 'Data Início', 'Data Fim', 'Hora Início', 
-                                                                  'Hora fim', 'Recorrência', 'Grupo', 'Atividade','Responsável',
-                                                                  'Status'])
-            dict_dataframes['Salas'] = process_worksheet(spreadsheet.worksheet("Salas"), ['Sala', 'Capacidade'])
-            dict_dataframes['Grupos'] = process_worksheet(spreadsheet.worksheet("Controle de Pastorais"), ['Grupo', '# Participantes'])
+            dict_dataframes['Reservas'] = process_worksheet(spreadsheet.worksheet("Reservas"), RESERVAS_COLUMNS,
+                                                                 diagnostics)
+            dict_dataframes['Salas'] = process_worksheet(spreadsheet.worksheet("Salas"), ['Sala', 'Capacidade'], diagnostics)
+            dict_dataframes['Grupos'] = process_worksheet(spreadsheet.worksheet("Controle de Pastorais"), ['Grupo', '# Participantes'], diagnostics)
 
             # Adicione outras conforme necessário
-        except gspread.WorksheetNotFound as e:
-            st.warning(f"⚠️ Uma das abas não foi encontrada: {str(e)}")
+        except WorksheetNotFound as e:
+            diag.add(diagnostics, 'warning', 'load', f"Uma das abas não foi encontrada: {str(e)}")
 
         return dict_dataframes
     
     except Exception as e:
-        st.error(f"❌ Erro na conexão principal: {str(e)}")
+        diag.add(diagnostics, 'error', 'load', f"Erro na conexão principal: {str(e)}")
         return {}
+
+def open_worksheet(spreadsheet_id: str, creds_dict: Dict, worksheet_name: str = "Reservas"):
+    """Abre uma aba para escrita (ex.: aplicar realocações aceitas); erros do gspread são propagados"""
+    return authorize(creds_dict).open_by_key(spreadsheet_id).worksheet(worksheet_name)
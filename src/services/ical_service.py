@@ -0,0 +1,160 @@
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from src.services.conflicts_service import calculate_end_hour
+from src.utils import sequence_generator
+
+TZID = "America/Sao_Paulo"
+UTC_OFFSET = timedelta(hours=-3)  # Sem horário de verão desde 2019
+
+# Mesmo calendário usado na expansão das recorrências
+DIAS_RRULE = {
+    'Domingo': 'SU', 'Segunda': 'MO', 'Terça': 'TU', 'Quarta': 'WE',
+    'Quinta': 'TH', 'Sexta': 'FR', 'Sábado': 'SA'
+}
+DIAS_PYTHON = {'Domingo': 6, 'Segunda': 0, 'Terça': 1, 'Quarta': 2, 'Quinta': 3, 'Sexta': 4, 'Sábado': 5}
+FIM_PADRAO = datetime(2026, 12, 31)
+
+VTIMEZONE = [
+    "BEGIN:VTIMEZONE",
+    f"TZID:{TZID}",
+    "BEGIN:STANDARD",
+    "DTSTART:19700101T000000",
+    "TZOFFSETFROM:-0300",
+    "TZOFFSETTO:-0300",
+    "TZNAME:-03",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+]
+
+def escape_text(valor) -> str:
+    """Escapa texto conforme RFC 5545 (barra, vírgula, ponto e vírgula e quebras de linha)"""
+    texto = "" if valor is None or pd.isna(valor) else str(valor)
+    return (texto.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+def fold_line(linha: str) -> str:
+    """Quebra linhas com mais de 75 octetos (continuação começa com espaço)"""
+    dados = linha.encode('utf-8')
+    if len(dados) <= 75:
+        return linha
+    partes, atual, limite = [], b"", 75
+    for char in linha:
+        c = char.encode('utf-8')
+        if len(atual) + len(c) > limite:
+            partes.append(atual.decode('utf-8'))
+            atual, limite = b"", 74
+        atual += c
+    partes.append(atual.decode('utf-8'))
+    return "\r\n ".join(partes)
+
+def nth_weekday(ano: int, mes: int, ordem: int, dia_semana: int) -> Optional[datetime]:
+    """N-ésimo dia da semana (0=segunda) do mês, ou None se não existir"""
+    primeiro = datetime(ano, mes, 1)
+    data = primeiro + timedelta(days=(dia_semana - primeiro.weekday()) % 7 + 7 * (ordem - 1))
+    return data if data.month == mes else None
+
+def until_utc(data_fim: datetime) -> str:
+    """Último instante do dia local de término, em UTC (exigido quando DTSTART tem TZID)"""
+    fim_local = datetime(data_fim.year, data_fim.month, data_fim.day, 23, 59, 59)
+    return (fim_local - UTC_OFFSET).strftime('%Y%m%dT%H%M%SZ')
+
+def recurrence_rule(row) -> Tuple[Optional[datetime], Optional[str]]:
+    """
+    Converte o campo Recorrência em (data da primeira ocorrência, RRULE).
+    Segue as mesmas regras de expand_recurring_events; recorrências não reconhecidas
+    ou inválidas viram evento único (RRULE None).
+    """
+    recorrencia = str(row['Recorrência']).strip() if pd.notna(row['Recorrência']) else ''
+    data_inicio = pd.to_datetime(row['Data Início'], dayfirst=True, errors='coerce')
+    if pd.isna(data_inicio):
+        return None, None
+    data_inicio = data_inicio.to_pydatetime()
+
+    if not recorrencia or recorrencia == 'nan':
+        return data_inicio, None
+
+    partes = recorrencia.split('-')
+    tipo = partes[0]
+    data_fim = pd.to_datetime(row.get('Data Fim'), dayfirst=True, errors='coerce')
+    data_fim = FIM_PADRAO if pd.isna(data_fim) else data_fim.to_pydatetime()
+
+    if tipo == 'Semanal' and len(partes) >= 2:
+        return data_inicio, f"FREQ=WEEKLY;UNTIL={until_utc(data_fim)}"
+    if tipo == 'Quinzenal' and len(partes) >= 2:
+        return data_inicio, f"FREQ=WEEKLY;INTERVAL=2;UNTIL={until_utc(data_fim)}"
+    if tipo == 'Mensal' and len(partes) >= 3:
+        try:
+            ordem = int(partes[1].replace('º', ''))
+        except ValueError:
+            return data_inicio, None
+        dia_nome = partes[2] if partes[2] in DIAS_RRULE else 'Domingo'
+        # A expansão mensal cobre todos os meses de 2026
+        for mes in range(1, 13):
+            primeira = nth_weekday(2026, mes, ordem, DIAS_PYTHON[dia_nome])
+            if primeira:
+                return primeira, f"FREQ=MONTHLY;BYDAY={ordem}{DIAS_RRULE[dia_nome]};UNTIL={until_utc(FIM_PADRAO)}"
+        return None, None
+
+    return data_inicio, None
+
+def build_vevent(row, dtstamp: str) -> List[str]:
+    data, rrule = recurrence_rule(row)
+    if data is None:
+        return []
+    hora_fim = calculate_end_hour(row['Hora Início'], row['Hora fim'])
+    try:
+        h_ini, m_ini = map(int, str(row['Hora Início']).split(':'))
+        h_fim, m_fim = map(int, hora_fim.split(':'))
+    except ValueError:
+        return []
+
+    inicio = data.replace(hour=h_ini, minute=m_ini)
+    fim = data.replace(hour=h_fim, minute=m_fim)
+    if fim <= inicio:
+        fim += timedelta(days=1)
+
+    uid = sequence_generator.generate_id([row['Grupo'], row['Sala'], row['Data Início'], row['Hora Início'],
+                                          row['Recorrência']])
+    linhas = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}@reservas-salas",
+        f"DTSTAMP:{dtstamp}",
+        f"DTSTART;TZID={TZID}:{inicio.strftime('%Y%m%dT%H%M%S')}",
+        f"DTEND;TZID={TZID}:{fim.strftime('%Y%m%dT%H%M%S')}",
+        f"SUMMARY:{escape_text(row['Grupo'])} - {escape_text(row['Atividade'])}",
+        f"LOCATION:{escape_text(row['Sala'])}",
+        f"DESCRIPTION:Responsável: {escape_text(row['Responsável'])}\\nStatus: {escape_text(row['Status'])}",
+    ]
+    if rrule:
+        linhas.append(f"RRULE:{rrule}")
+    linhas.append("END:VEVENT")
+    return linhas
+
+def build_calendar(df_reservas: pd.DataFrame, nome: str, dtstamp: Optional[str] = None) -> bytes:
+    """Monta um VCALENDAR com um VEVENT (com RRULE quando recorrente) por reserva"""
+    dtstamp = dtstamp or datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    linhas = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Sistema de Reservas de Salas//PT-BR",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(nome)}",
+        f"X-WR-TIMEZONE:{TZID}",
+        *VTIMEZONE,
+    ]
+    for _, row in df_reservas.iterrows():
+        linhas.extend(build_vevent(row, dtstamp))
+    linhas.append("END:VCALENDAR")
+    return ("\r\n".join(fold_line(l) for l in linhas) + "\r\n").encode('utf-8')
+
+def build_feeds(df_reservas: pd.DataFrame) -> Dict[Tuple[str, str], bytes]:
+    """Gera um feed por sala e um por grupo, chaveados por ('salas'|'grupos', nome)"""
+    dtstamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    feeds = {}
+    for sala, df_sala in df_reservas.groupby('Sala'):
+        feeds[('salas', sala)] = build_calendar(df_sala, f"Reservas - {sala}", dtstamp)
+    for grupo, df_grupo in df_reservas.groupby('Grupo'):
+        feeds[('grupos', grupo)] = build_calendar(df_grupo, f"Agenda - {grupo}", dtstamp)
+    return feeds
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from src.services.conflicts_service import calculate_end_hours, convert_series_to_minutes, convert_to_minutes
+
+# Janela de funcionamento considerada no cálculo de utilização (mesma do calendário)
+HORA_ABERTURA = 7
+HORA_FECHAMENTO = 22
+
+def occupancy_period(df_expandido: pd.DataFrame) -> Optional[Tuple[np.datetime64, np.datetime64]]:
+    """Primeira e última data com ocorrência (datetime64[D]); None se não houver datas válidas"""
+    datas = pd.to_datetime(df_expandido['Data Ocorrência'], dayfirst=True, errors='coerce').dropna()
+    if datas.empty:
+        return None
+    return datas.min().to_datetime64().astype('datetime64[D]'), datas.max().to_datetime64().astype('datetime64[D]')
+
+def build_occupancy_cube(df_expandido: pd.DataFrame, salas: Optional[List[str]] = None,
+                         periodo: Optional[Tuple] = None) -> Dict:
+    """
+    Monta o cubo de ocupação: minutos reservados por (sala, data, hora).
+    O eixo de datas é o calendário inteiro do período (inclusive dias sem reserva), para que a
+    utilização seja medida sobre todos os dias: `periodo` = (início, fim) ou, se omitido, da
+    primeira à última ocorrência. Ocorrências fora do período são ignoradas.
+    Lê apenas as colunas necessárias, sem alterar df_expandido.
+    Retorna {'salas': [...], 'datas': datetime64[D], 'minutos': ndarray (salas x datas x 24)}.
+    """
+    datas = pd.to_datetime(df_expandido['Data Ocorrência'], dayfirst=True, errors='coerce')
+    dias = datas.to_numpy().astype('datetime64[D]')
+
+    periodo = periodo if periodo is not None else occupancy_period(df_expandido)
+    if periodo is None:
+        datas_periodo = np.array([], dtype='datetime64[D]')
+    else:
+        inicio_periodo, fim_periodo = (np.datetime64(pd.Timestamp(d).date(), 'D') for d in periodo)
+        datas_periodo = np.arange(inicio_periodo, fim_periodo + 1, dtype='datetime64[D]')
+    validas = datas.notna().to_numpy()
+    if len(datas_periodo):
+        validas &= (dias >= datas_periodo[0]) & (dias <= datas_periodo[-1])
+
+    inicio = convert_series_to_minutes(df_expandido['Hora Início']).to_numpy()[validas]
+    fim = convert_series_to_minutes(
+        calculate_end_hours(df_expandido['Hora Início'], df_expandido['Hora fim'])).to_numpy()[validas]
+    # Reservas que passam da meia-noite são limitadas ao fim do dia
+    fim = np.where(fim <= inicio, 24 * 60, fim)
+
+    nomes_salas = sorted(set(salas or []) | set(df_expandido['Sala'][validas]))
+    sala_idx = pd.Index(nomes_salas).get_indexer(df_expandido['Sala'][validas])
+    data_idx = (dias[validas] - datas_periodo[0]).astype(int) if len(datas_periodo) else np.array([], dtype=int)
+
+    # Sobreposição de cada reserva com cada hora do dia: (n, 24)
+    horas = np.arange(24) * 60
+    sobreposicao = np.clip(np.minimum(fim[:, None], horas + 60) - np.maximum(inicio[:, None], horas), 0, 60)
+
+    minutos = np.zeros((len(nomes_salas), len(datas_periodo), 24), dtype=np.int32)
+    np.add.at(minutos, (sala_idx, data_idx), sobreposicao.astype(np.int32))
+
+    return {'salas': nomes_salas, 'datas': datas_periodo, 'minutos': minutos}
+
+def _janela(cube: Dict) -> np.ndarray:
+    """Minutos ocupados dentro do horário de funcionamento, sem contar sobreposições (máx. 60 por hora)"""
+    return np.minimum(cube['minutos'][:, :, HORA_ABERTURA:HORA_FECHAMENTO], 60)
+
+def room_utilization(cube: Dict) -> pd.Series:
+    """Percentual de utilização de cada sala em todos os dias do período do cubo"""
+    if cube['minutos'].size == 0:
+        return pd.Series(0.0, index=cube['salas'], name='Utilização (%)')
+    disponivel = len(cube['datas']) * (HORA_FECHAMENTO - HORA_ABERTURA) * 60
+    ocupado = _janela(cube).sum(axis=(1, 2))
+    return pd.Series(ocupado / disponivel * 100, index=cube['salas'], name='Utilização (%)').round(1)
+
+def overall_utilization(cube: Dict) -> float:
+    """Percentual médio de utilização de todas as salas"""
+    if cube['minutos'].size == 0:
+        return 0.0
+    disponivel = len(cube['salas']) * len(cube['datas']) * (HORA_FECHAMENTO - HORA_ABERTURA) * 60
+    return round(float(_janela(cube).sum()) / disponivel * 100, 1)
+
+def booked_hours(cube: Dict) -> float:
+    """Total de horas reservadas (somando reservas sobrepostas)"""
+    return round(float(cube['minutos'].sum()) / 60, 1)
+
+def room_hour_heatmap(cube: Dict) -> pd.DataFrame:
+    """Ocupação média (%) por sala e hora do dia, na janela de funcionamento"""
+    horas = [f"{h:02d}h" for h in range(HORA_ABERTURA, HORA_FECHAMENTO)]
+    if cube['minutos'].size == 0:
+        return pd.DataFrame(0.0, index=cube['salas'], columns=horas)
+    media = _janela(cube).mean(axis=1) / 60 * 100
+    return pd.DataFrame(media.round(1), index=cube['salas'], columns=horas)
+
+def monthly_booked_hours(cube: Dict) -> pd.Series:
+    """Horas reservadas por mês (AAAA-MM)"""
+    por_data = cube['minutos'].sum(axis=(0, 2)) / 60
+    meses = cube['datas'].astype('datetime64[M]').astype(str)
+    return pd.Series(por_data, index=meses, name='Horas').groupby(level=0).sum().round(1)
+
+def build_availability_index(df_expandido: pd.DataFrame, df_salas: pd.DataFrame) -> Dict:
+    """
+    Índice de disponibilidade por data (DD/MM/AAAA) e sala, para consultas pontuais rápidas.
+    Cada (data, sala) guarda as reservas ordenadas pelo início, os fins e o máximo acumulado
+    dos fins: uma sala está livre em [ini, fim) se nenhuma reserva que começa antes de `fim`
+    termina depois de `ini` — uma busca binária por sala.
+    """
+    salas = sorted(set(df_salas['Sala']) if not df_salas.empty else set())
+    por_dia: Dict[str, Dict] = {}
+    if not df_expandido.empty:
+        hora_fim = calculate_end_hours(df_expandido['Hora Início'], df_expandido['Hora fim'])
+        df = pd.DataFrame({
+            'data': df_expandido['Data Ocorrência'],
+            'sala': df_expandido['Sala'],
+            'inicio': convert_series_to_minutes(df_expandido['Hora Início']),
+            'fim': convert_series_to_minutes(hora_fim),
+            'hora_inicio': df_expandido['Hora Início'],
+            'hora_fim': hora_fim,
+            'grupo': df_expandido['Grupo'],
+            'atividade': df_expandido['Atividade'],
+            'responsavel': df_expandido['Responsável'],
+            'status': df_expandido['Status'],
+            'id_reserva': df_expandido['id_reserva'].astype(str),
+        })
+        # Reservas que passam da meia-noite ocupam até o fim do dia (como no cubo de ocupação)
+        df['fim'] = df['fim'].where(df['fim'] > df['inicio'], 24 * 60)
+        df = df.sort_values(['data', 'sala', 'inicio'], kind='stable').reset_index(drop=True)
+        inicios, fins = df['inicio'].to_numpy(), df['fim'].to_numpy()
+        registros = df[['hora_inicio', 'hora_fim', 'grupo', 'atividade', 'responsavel', 'status',
+                        'id_reserva']].to_dict('records')
+        for (data, sala), posicoes in df.groupby(['data', 'sala'], sort=False).indices.items():
+            por_dia.setdefault(data, {})[sala] = {
+                'inicios': inicios[posicoes],
+                'fins_max': np.maximum.accumulate(fins[posicoes]),
+                'reservas': [registros[i] for i in posicoes],
+            }
+    return {'salas': salas, 'por_dia': por_dia}
+
+def free_rooms(index: Dict, data: str, hora_inicio: str, hora_fim: str) -> List[str]:
+    """Salas sem reserva sobreposta a [hora_inicio, hora_fim) na data (mesma regra de search_available_rooms)"""
+    ini = convert_to_minutes(hora_inicio)
+    fim = convert_to_minutes(hora_fim)
+    do_dia = index['por_dia'].get(data, {})
+    livres = []
+    for sala in index['salas']:
+        ocupacao = do_dia.get(sala)
+        if ocupacao is not None:
+            # Reservas que começam antes do fim da consulta: prefixo [0, n)
+            n = int(np.searchsorted(ocupacao['inicios'], fim, 'left'))
+            if n and ocupacao['fins_max'][n - 1] > ini:
+                continue
+        livres.append(sala)
+    return livres
+
+def room_schedule(index: Dict, sala: str, data: str) -> List[Dict]:
+    """Reservas da sala na data, ordenadas pelo início"""
+    ocupacao = index['por_dia'].get(data, {}).get(sala)
+    return ocupacao['reservas'] if ocupacao else []
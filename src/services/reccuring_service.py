@@ -1,10 +1,11 @@
 import pandas as pd
-import streamlit as st
 from datetime import datetime, timedelta
+from typing import List, Optional
 import src.utils.sequence_generator as sequence_generator
+from src.core import diagnostics as diag
+from src.core.diagnostics import Diagnostic
 
-@st.cache_data
-def expand_recurring_events(df: pd.DataFrame) -> pd.DataFrame:
+def expand_recurring_events(df: pd.DataFrame, diagnostics: Optional[List[Diagnostic]] = None) -> pd.DataFrame:
     ocorrencias_expandidas = []
     
     for idx, row in df.iterrows():
@@ -78,11 +79,15 @@ def expand_recurring_events(df: pd.DataFrame) -> pd.DataFrame:
                 ocorrencias_expandidas.append(row_copy)
         
         except Exception as e:
-            st.warning(f"⚠️ Erro ao expandir recorrência na linha {idx}: {str(e)}")
+            diag.add(diagnostics, 'warning', 'expand', f"Erro ao expandir recorrência na linha {idx}: {str(e)}", idx)
             row_copy = row.copy()
             row_copy['Data Ocorrência'] = row['Data Início']
             ocorrencias_expandidas.append(row_copy)
     
+    if not ocorrencias_expandidas:
+        # Nenhuma reserva (ou todas descartadas na validação): frame vazio com as colunas esperadas
+        return pd.DataFrame(columns=list(df.columns) + ['Data Ocorrência', 'id_reserva'])
+
     df_expandido = pd.DataFrame(ocorrencias_expandidas)
     df_expandido['id_reserva'] = df_expandido.apply(
             lambda row: sequence_generator.generate_id([row['Grupo'], row['Sala'], row['Data Ocorrência'], 
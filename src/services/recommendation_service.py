@@ -1,20 +1,41 @@
 import pandas as pd
-from typing import List, Dict
+from typing import Callable, Iterable, List, Dict, Optional
 from datetime import datetime, timedelta
+from src.services.conflicts_service import calculate_end_hour
+from src.services.room_catalog_service import COLUNA_REQUISITOS, build_room_catalog, nearest_fit, parse_requirements
 
-import streamlit as st
-import app as app
-
-@st.cache_data
 def generate_recommendations(df_expandido: pd.DataFrame, df_salas: pd.DataFrame, 
-                    df_grupos: pd.DataFrame, conflitos: List[Dict]) -> List[Dict]:
+                    df_grupos: pd.DataFrame, conflitos: List[Dict],
+                    available_rooms: Optional[Callable[[str, str, str], List[str]]] = None,
+                    catalog: Optional[Dict] = None) -> List[Dict]:
     """
-    Gera sugestões de melhor opção de sala quando há múltiplas opções
+    Gera sugestões de melhor opção de sala quando há múltiplas opções.
+    `available_rooms(data, hora_inicio, hora_fim)` substitui a busca de salas livres nos DataFrames
+    (ex.: consulta indexada do OccurrenceStore). `catalog` (build_room_catalog) evita remontar o
+    catálogo de salas; grupos com a coluna 'Requisitos' só recebem salas que os atendem.
     """
     sugestoes = []
     
-    # Garantir que a capacidade em df_salas seja numérica
-    df_salas['Capacidade'] = pd.to_numeric(df_salas['Capacidade'], errors='coerce').fillna(0)
+    if catalog is None:
+        catalog = build_room_catalog(df_salas)
+    
+    # Participantes e requisitos por grupo (primeira linha de cada grupo, como no filtro por nome)
+    grupos = {}
+    if not df_grupos.empty:
+        for _, g in df_grupos.drop_duplicates('Grupo').iterrows():
+            grupos[g['Grupo']] = (pd.to_numeric(g['# Participantes'], errors='coerce') or 0,
+                                  parse_requirements(g.get(COLUNA_REQUISITOS)))
+    
+    # Memoriza consultas de disponibilidade repetidas (mesma data e horário)
+    salas_livres_cache = {}
+    def salas_livres(data, hora_inicio, hora_fim):
+        chave = (data, hora_inicio, hora_fim)
+        if chave not in salas_livres_cache:
+            if available_rooms is not None:
+                salas_livres_cache[chave] = available_rooms(data, hora_inicio, hora_fim)
+            else:
+                salas_livres_cache[chave] = search_available_rooms(df_expandido, df_salas, data, hora_inicio, hora_fim)
+        return salas_livres_cache[chave]
 
     for conf in conflitos:
         data = conf['data']
@@ -24,19 +45,15 @@ def generate_recommendations(df_expandido: pd.DataFrame, df_salas: pd.DataFrame,
         h_fim_g2 = conf['horario2'].split("-")[1]
         
         # 1. Obter a capacidade da sala original
-        cap_original = 0
-        info_sala_orig = df_salas[df_salas['Sala'] == conf['sala']]
-        if not info_sala_orig.empty:
-            cap_original = info_sala_orig.iloc[0]['Capacidade']
+        cap_original = catalog['capacidade'].get(conf['sala'], 0)
             
         participantes_g1 = 0
         participantes_g2 = 0
-        if not df_grupos.empty:
-            info_g1 = df_grupos[df_grupos['Grupo'] == conf['grupo1']]
-            info_g2 = df_grupos[df_grupos['Grupo'] == conf['grupo2']]
-            if not info_g1.empty and not info_g2.empty:
-                participantes_g1 = pd.to_numeric(info_g1.iloc[0]['# Participantes'], errors='coerce') or 0
-                participantes_g2 = pd.to_numeric(info_g2.iloc[0]['# Participantes'], errors='coerce') or 0
+        if conf['grupo1'] in grupos and conf['grupo2'] in grupos:
+            participantes_g1 = grupos[conf['grupo1']][0]
+            participantes_g2 = grupos[conf['grupo2']][0]
+        requisitos_g1 = grupos.get(conf['grupo1'], (0, []))[1]
+        requisitos_g2 = grupos.get(conf['grupo2'], (0, []))[1]
             
         # 2. Calcular o limite mínimo aceitável (Tolerância)
         # Regra: ref = Mínimo entre Capacidade da Sala e Número de Participantes
@@ -48,18 +65,15 @@ def generate_recommendations(df_expandido: pd.DataFrame, df_salas: pd.DataFrame,
         limite_minimo_g2 = max(ref_g2 * 0.9, ref_g2 - 5)
 
         # 3. Buscar salas fisicamente disponíveis no horário
-        salas_livres_g1 = search_available_rooms(df_expandido, df_salas, data, h_inicio_g1, h_fim_g1)
-        salas_livres_g2 = search_available_rooms(df_expandido, df_salas, data, h_inicio_g2, h_fim_g2)
+        salas_livres_g1 = salas_livres(data, h_inicio_g1, h_fim_g1)
+        salas_livres_g2 = salas_livres(data, h_inicio_g2, h_fim_g2)
         
         # 4. Filtrar salas livres que suportam o número de participantes
-        sugestoes_salas_g1 = set()
-        sugestoes_salas_g2 = set()
-        if not df_salas.empty:
-            sugestoes_salas_g1 = analyze_relocation(
-                df_salas, salas_livres_g1, cap_original, limite_minimo_g1)
-           
-            sugestoes_salas_g2 = analyze_relocation(
-                    df_salas, salas_livres_g2, cap_original, limite_minimo_g2)
+        #    (e, se o grupo tiver requisitos, que atendem a todos eles)
+        sugestoes_salas_g1 = analyze_relocation(
+            catalog, salas_livres_g1, cap_original, limite_minimo_g1, requisitos_g1)
+        sugestoes_salas_g2 = analyze_relocation(
+            catalog, salas_livres_g2, cap_original, limite_minimo_g2, requisitos_g2)
 
         # 5. Cálculo de Duração do Conflito para ajuste de tempo
         # Transformamos em datetime para calcular a diferença
@@ -91,19 +105,11 @@ def generate_recommendations(df_expandido: pd.DataFrame, df_salas: pd.DataFrame,
         
     return sugestoes
 
-def analyze_relocation(df_salas: pd.DataFrame, salas_livres_nomes: List[str], 
-                       cap_original: int, limite_minimo: int) -> List[str]:
-     # Filtro: Está livre E Capacidade >= limite_minimo
-    condicao = (df_salas['Sala'].isin(salas_livres_nomes)) & (df_salas['Capacidade'] >= limite_minimo)
-    
-    # Ordenação: Queremos as mais próximas da original primeiro. 
-    # Calculamos a diferença absoluta para ordenar
-    salas_possiveis = df_salas[condicao].copy()
-    salas_possiveis['diff'] = (salas_possiveis['Capacidade'] - cap_original).abs()
-    
-    # Ordenamos pela menor diferença absoluta, priorizando as maiores em caso de empate
-    sugestoes_salas_df = salas_possiveis.sort_values(by=['diff', 'Capacidade'], ascending=[True, False])
-    return sugestoes_salas_df['Sala'].tolist()
+def analyze_relocation(catalog: Dict, salas_livres_nomes: List[str], 
+                       cap_original: int, limite_minimo: int, requisitos: Iterable[str] = ()) -> List[str]:
+    # Filtro: Está livre E Capacidade >= limite_minimo (E atende aos requisitos)
+    # Ordenação: as mais próximas da original primeiro, priorizando as maiores em caso de empate
+    return nearest_fit(catalog, cap_original, limite_minimo, salas_livres_nomes, requisitos)
 
 def analyze_short_conflict(h_inicio_g1: str, h_fim_g1: str, 
                            h_inicio_g2: str, h_fim_g2: str) -> float:
@@ -126,7 +132,6 @@ def analyze_short_conflict(h_inicio_g1: str, h_fim_g1: str,
         
     return duracao_conflito_min
 
-@st.cache_data
 def search_available_rooms(df_expandido, df_salas, data, hora_inicio, hora_fim):
     """Retorna lista de salas sem reservas que sobreponham o horário informado."""
     # Converter para comparação numérica/time para evitar erros de string
@@ -141,7 +146,7 @@ def search_available_rooms(df_expandido, df_salas, data, hora_inicio, hora_fim):
     ocupadas = []
     for _, res in reservas_dia.iterrows():
         res_ini = datetime.strptime(res['Hora Início'], fmt).time()
-        res_fim = datetime.strptime(res['Hora fim'], fmt).time()
+        res_fim = datetime.strptime(calculate_end_hour(res['Hora Início'], res['Hora fim']), fmt).time()
         
         if h_ini_query < res_fim and h_fim_query > res_ini:
             ocupadas.append(res['Sala'])
@@ -0,0 +1,137 @@
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+# Colunas opcionais da aba Salas com atributos das salas (todas podem faltar)
+COLUNA_PREDIO = 'Prédio'
+COLUNA_ANDAR = 'Andar'
+COLUNA_ACESSIVEL = 'Acessível'
+COLUNA_EQUIPAMENTOS = 'Equipamentos'   # lista separada por vírgula ou ponto e vírgula
+
+# Coluna opcional da aba Grupos com os requisitos de sala do grupo (ver parse_requirements)
+COLUNA_REQUISITOS = 'Requisitos'
+
+# Valores da coluna Acessível considerados "sim"
+VERDADEIROS = {'sim', 's', 'x', 'true', 'verdadeiro', '1', 'yes'}
+
+SEPARADORES = re.compile(r'[;,]')
+
+def _texto(valor) -> str:
+    texto = '' if pd.isna(valor) else str(valor).strip().lower()
+    return '' if texto == 'nan' else texto
+
+def _tags_sala(sala: pd.Series) -> List[str]:
+    """Atributos de uma linha da aba Salas como etiquetas ('predio:bloco a', 'acessivel', 'equipamento:projetor')"""
+    tags = []
+    for coluna, chave in ((COLUNA_PREDIO, 'predio'), (COLUNA_ANDAR, 'andar')):
+        valor = _texto(sala.get(coluna))
+        if valor:
+            tags.append(f"{chave}:{valor}")
+    if _texto(sala.get(COLUNA_ACESSIVEL)) in VERDADEIROS:
+        tags.append('acessivel')
+    for item in SEPARADORES.split(_texto(sala.get(COLUNA_EQUIPAMENTOS))):
+        if item.strip():
+            tags.append(f"equipamento:{item.strip()}")
+    return tags
+
+def parse_requirements(texto) -> List[str]:
+    """
+    Converte um texto de requisitos (ex.: "acessível; prédio: Bloco A; projetor") nas etiquetas
+    do catálogo. 'prédio:'/'andar:' filtram por local, 'acessível' por acessibilidade e qualquer
+    outro item é um equipamento.
+    """
+    tags = []
+    for item in SEPARADORES.split(_texto(texto)):
+        item = item.strip()
+        if not item:
+            continue
+        chave, sep, valor = (p.strip() for p in item.partition(':'))
+        if sep and chave in ('prédio', 'predio', 'andar'):
+            tags.append(f"{'andar' if chave == 'andar' else 'predio'}:{valor}")
+        elif item in ('acessível', 'acessivel'):
+            tags.append('acessivel')
+        else:
+            tags.append(f"equipamento:{item}")
+    return tags
+
+def build_room_catalog(df_salas: pd.DataFrame) -> Dict:
+    """
+    Catálogo das salas para buscas por capacidade sem operações em DataFrame:
+    - capacidades distintas em ordem crescente (busca binária da mais próxima) e, para cada uma,
+      as salas na ordem da aba;
+    - atributos opcionais (prédio, andar, acessibilidade, equipamentos) pré-calculados como
+      máscaras de bits por sala, para testar requisitos com um AND.
+    """
+    catalog = {'capacidade': {}, 'mascara': {}, 'bits': {}, 'capacidades': [], 'salas_por_capacidade': []}
+    if df_salas.empty or 'Sala' not in df_salas:
+        return catalog
+
+    capacidades = (pd.to_numeric(df_salas['Capacidade'], errors='coerce').fillna(0)
+                   if 'Capacidade' in df_salas else pd.Series(0, index=df_salas.index))
+    por_capacidade: Dict[float, List[str]] = {}
+    for (_, sala), capacidade in zip(df_salas.iterrows(), capacidades):
+        nome = sala['Sala']
+        if nome in catalog['capacidade']:
+            continue  # sala repetida: vale a primeira linha, como em df_salas[df_salas['Sala'] == ...].iloc[0]
+        catalog['capacidade'][nome] = capacidade
+        por_capacidade.setdefault(capacidade, []).append(nome)
+        mascara = 0
+        for tag in _tags_sala(sala):
+            bit = catalog['bits'].setdefault(tag, len(catalog['bits']))
+            mascara |= 1 << bit
+        catalog['mascara'][nome] = mascara
+
+    catalog['capacidades'] = sorted(por_capacidade)
+    catalog['salas_por_capacidade'] = [por_capacidade[c] for c in catalog['capacidades']]
+    return catalog
+
+def requirement_mask(catalog: Dict, requisitos: Iterable[str]) -> Optional[int]:
+    """Máscara dos requisitos (etiquetas); None se algum requisito não existe em nenhuma sala"""
+    mascara = 0
+    for tag in requisitos:
+        if tag not in catalog['bits']:
+            return None
+        mascara |= 1 << catalog['bits'][tag]
+    return mascara
+
+def nearest_fit(catalog: Dict, capacidade_ref: float, limite_minimo: float,
+                livres: Optional[Iterable[str]] = None, requisitos: Iterable[str] = (),
+                limite: Optional[int] = None) -> List[str]:
+    """
+    Salas com capacidade >= limite_minimo, da capacidade mais próxima de `capacidade_ref` para a
+    mais distante (empate: a maior primeira; mesma capacidade: ordem da aba), restritas às
+    `livres` (se informado) e às que atendem aos `requisitos`. Parte da posição de `capacidade_ref`
+    (busca binária) e anda para os dois lados, parando em `limite` salas.
+    """
+    mascara = requirement_mask(catalog, requisitos)
+    if mascara is None:
+        return []
+    livres = None if livres is None else set(livres)
+    capacidades = catalog['capacidades']
+    grupos = catalog['salas_por_capacidade']
+
+    resultado: List[str] = []
+    def adicionar(salas: List[str]) -> bool:
+        for sala in salas:
+            if (livres is None or sala in livres) and catalog['mascara'][sala] & mascara == mascara:
+                resultado.append(sala)
+                if limite is not None and len(resultado) >= limite:
+                    return True
+        return False
+
+    acima = max(bisect_left(capacidades, capacidade_ref), bisect_left(capacidades, limite_minimo))
+    abaixo = acima - 1
+    while True:
+        tem_acima = acima < len(capacidades)
+        tem_abaixo = abaixo >= 0 and capacidades[abaixo] >= limite_minimo
+        if not tem_acima and not tem_abaixo:
+            return resultado
+        if tem_acima and (not tem_abaixo or
+                          capacidades[acima] - capacidade_ref <= capacidade_ref - capacidades[abaixo]):
+            completo, acima = adicionar(grupos[acima]), acima + 1
+        else:
+            completo, abaixo = adicionar(grupos[abaixo]), abaixo - 1
+        if completo:
+            return resultado
@@ -0,0 +1,106 @@
+import pandas as pd
+from typing import List, Optional, Tuple
+from src.services.filter_service import DIAS_SEMANA
+
+# Colunas sem as quais as reservas não podem ser expandidas
+COLUNAS_OBRIGATORIAS = ['Sala', 'Data Início', 'Hora Início', 'Hora fim', 'Recorrência', 'Grupo']
+
+# Relatório de validação: um problema por linha/coluna
+REPORT_COLUMNS = ['linha', 'coluna', 'valor', 'nivel', 'mensagem']
+
+_DIA = '|'.join(DIAS_SEMANA)
+RECORRENCIA = rf'^(?:(?:Semanal|Quinzenal)-(?:{_DIA})|Mensal-[1-5]º-(?:{_DIA}))$'
+HORARIO = r'^(\d{1,2}):(\d{2})$'
+
+def validar_estrutura_dados(df: pd.DataFrame) -> Tuple[bool, List[str]]:
+    """Valida se os dados do Google Sheets estão no formato correto (aba não vazia e colunas obrigatórias)"""
+    erros = []
+
+    if df.empty:
+        erros.append("DataFrame vazio")
+        return False, erros
+
+    faltantes = [c for c in COLUNAS_OBRIGATORIAS if c not in df.columns]
+    if faltantes:
+        erros.append(f"Colunas obrigatórias ausentes na aba Reservas: {', '.join(faltantes)}")
+
+    return len(erros) == 0, erros
+
+def _texto(coluna: pd.Series) -> pd.Series:
+    texto = coluna.astype(str).str.strip()
+    return texto.where(coluna.notna() & (texto != 'nan'), '')
+
+def _minutos(texto: pd.Series) -> pd.Series:
+    """Minutos desde a meia-noite; NaN se não for um horário HH:MM válido"""
+    partes = texto.str.extract(HORARIO)
+    h = pd.to_numeric(partes[0], errors='coerce')
+    m = pd.to_numeric(partes[1], errors='coerce')
+    return (h * 60 + m).where((h <= 23) & (m <= 59))
+
+def _datas(texto: pd.Series) -> pd.Series:
+    return pd.to_datetime(texto.where(texto != ''), dayfirst=True, errors='coerce', format='mixed')
+
+def validate_reservations(df: pd.DataFrame, df_salas: Optional[pd.DataFrame] = None,
+                          df_grupos: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Valida todas as linhas da aba Reservas de uma vez (operações vetorizadas por coluna) e devolve
+    o relatório com uma linha por problema (colunas REPORT_COLUMNS; `linha` é o índice da reserva).
+    - 'error': a reserva não pode ser expandida (horário ou data inválidos, fim antes do início,
+      sala vazia) e deve ficar fora do processamento;
+    - 'warning': a reserva segue, mas algo merece revisão (recorrência não reconhecida, que vira
+      evento único; sala/grupo não cadastrados; data fim antes do início).
+    Espera as COLUNAS_OBRIGATORIAS (ver validar_estrutura_dados).
+    """
+    problemas = []
+
+    def marcar(mascara: pd.Series, coluna: str, nivel: str, mensagem: str):
+        if mascara.any():
+            problemas.append(pd.DataFrame({
+                'linha': df.index[mascara.to_numpy()],
+                'coluna': coluna,
+                'valor': df.loc[mascara.to_numpy(), coluna].astype(str).to_numpy() if coluna in df else '',
+                'nivel': nivel,
+                'mensagem': mensagem,
+            }))
+
+    inicio_txt, fim_txt = _texto(df['Hora Início']), _texto(df['Hora fim'])
+    inicio, fim = _minutos(inicio_txt), _minutos(fim_txt)
+    marcar(inicio.isna(), 'Hora Início', 'error', "Horário inválido ou vazio (use HH:MM)")
+    marcar((fim_txt != '') & fim.isna(), 'Hora fim', 'error', "Horário inválido (use HH:MM)")
+    marcar(fim.notna() & inicio.notna() & (fim <= inicio), 'Hora fim', 'error',
+           "Hora fim igual ou anterior à Hora Início")
+
+    data_inicio_txt = _texto(df['Data Início'])
+    data_inicio = _datas(data_inicio_txt)
+    marcar(data_inicio.isna(), 'Data Início', 'error', "Data inválida ou vazia (use DD/MM/AAAA)")
+    if 'Data Fim' in df:
+        data_fim_txt = _texto(df['Data Fim'])
+        data_fim = _datas(data_fim_txt)
+        marcar((data_fim_txt != '') & data_fim.isna(), 'Data Fim', 'error', "Data inválida (use DD/MM/AAAA)")
+        marcar(data_fim.notna() & data_inicio.notna() & (data_fim < data_inicio), 'Data Fim', 'warning',
+               "Data Fim anterior à Data Início")
+
+    recorrencia = _texto(df['Recorrência'])
+    marcar((recorrencia != '') & ~recorrencia.str.match(RECORRENCIA), 'Recorrência', 'warning',
+           "Recorrência não reconhecida (tratada como evento único); "
+           "use Semanal-<dia>, Quinzenal-<dia> ou Mensal-<n>º-<dia>")
+
+    sala, grupo = _texto(df['Sala']), _texto(df['Grupo'])
+    marcar(sala == '', 'Sala', 'error', "Sala vazia")
+    if df_salas is not None and 'Sala' in df_salas and not df_salas.empty:
+        marcar((sala != '') & ~sala.isin(_texto(df_salas['Sala'])), 'Sala', 'warning',
+               "Sala não cadastrada na aba Salas")
+    marcar(grupo == '', 'Grupo', 'warning', "Grupo vazio")
+    if df_grupos is not None and 'Grupo' in df_grupos and not df_grupos.empty:
+        marcar((grupo != '') & ~grupo.isin(_texto(df_grupos['Grupo'])), 'Grupo', 'warning',
+               "Grupo não cadastrado")
+
+    if not problemas:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    relatorio = pd.concat(problemas, ignore_index=True)
+    ordem = pd.Index(df.index).get_indexer(relatorio['linha'])
+    return relatorio.iloc[ordem.argsort(kind='stable')].reset_index(drop=True)[REPORT_COLUMNS]
+
+def invalid_rows(relatorio: pd.DataFrame) -> pd.Index:
+    """Índices das reservas com erro (ficam fora da expansão)"""
+    return pd.Index(relatorio.loc[relatorio['nivel'] == 'error', 'linha'].unique())
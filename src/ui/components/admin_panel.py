@@ -0,0 +1,119 @@
+import hmac
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+
+import streamlit as st
+import pandas as pd
+from src.core import instrumentation
+from src.core.tenants import TenantRegistry
+from src.core.worker import Snapshot
+from src.ui.session import SessionRegistry, session_state_breakdown, session_state_size
+
+HISTORY_SIZE = 20
+
+def is_enabled() -> bool:
+    """
+    Painel ativado por `admin_panel = true` em secrets.toml. Pela URL, só com `admin_token`
+    configurado e ?admin=<token> igual a ele (o painel expõe métricas de todas as sessões e o profiler).
+    """
+    if st.secrets.get("admin_panel", False):
+        return True
+    token = str(st.secrets.get("admin_token", ""))
+    return bool(token) and hmac.compare_digest(st.query_params.get("admin", ""), token)
+
+@contextmanager
+def profiling():
+    """Perfila esta execução se isso foi solicitado no painel (vale para um único rerun)"""
+    ferramenta = st.session_state.pop("admin_profile_next_run", None)
+    if not ferramenta:
+        yield
+        return
+    with instrumentation.profile(ferramenta) as resultado:
+        yield
+    st.session_state["admin_profile_report"] = resultado
+
+def render_metrics_table(etapas):
+    df = pd.DataFrame(etapas, columns=['nome', 'nivel', 'segundos', 'linhas_entrada', 'linhas_saida',
+                                       'cache', 'memoria_delta_mb'])
+    df['nome'] = ["  " * n + nome for nome, n in zip(df['nome'], df['nivel'])]
+    st.dataframe(
+        df.drop(columns='nivel'),
+        width="stretch",
+        hide_index=True,
+        column_config={
+            'nome': "Etapa",
+            'segundos': st.column_config.NumberColumn("Tempo (s)", format="%.3f"),
+            'linhas_entrada': "Entrada",
+            'linhas_saida': "Saída",
+            'cache': "Cache",
+            'memoria_delta_mb': st.column_config.NumberColumn("Δ Memória (MB)", format="%.1f"),
+        }
+    )
+
+def render_admin_panel(recorder: instrumentation.Recorder, snapshot: Optional[Snapshot] = None,
+                       registry: Optional[TenantRegistry] = None, sessoes: Optional[SessionRegistry] = None):
+    """Tempos por etapa da última execução, histórico exportável em JSON e perfilamento sob demanda"""
+    if not is_enabled():
+        return
+
+    execucao = recorder.to_dict()
+    historico = st.session_state.setdefault("admin_history", deque(maxlen=HISTORY_SIZE))
+    historico.append(execucao)
+
+    with st.sidebar.expander(f"🛠️ Desempenho ({execucao['total_s']:.2f}s)"):
+        render_metrics_table(execucao['etapas'])
+
+        if snapshot is not None and snapshot.metricas:
+            st.caption(f"Pipeline (worker) • geração {snapshot.geracao} • versão {snapshot.versao[:12]} • "
+                       f"{time.strftime('%H:%M:%S', time.localtime(snapshot.gerado_em))} • origem: {snapshot.origem}")
+            render_metrics_table(snapshot.metricas['etapas'])
+
+        if registry is not None:
+            uso = registry.usage()
+            st.caption(f"Unidades em memória: {len(uso)}/{len(registry.tenants)} • "
+                       f"{sum(uso.values()):.1f} de {registry.memoria_max_mb:g} MB • {registry.descartes} descartes")
+            st.dataframe(pd.DataFrame({'Unidade': list(uso), 'MB': list(uso.values())}), width="stretch",
+                         hide_index=True)
+
+        if sessoes is not None:
+            uso = sessoes.usage()
+            st.caption(f"Sessões ativas: {len(uso)} • estado desta sessão: {session_state_size() / 1024:.1f} KB • "
+                       f"todas: {sum(uso.values()) / 1024:.1f} KB • {sessoes.descartes} descartadas por ociosidade "
+                       f"(> {sessoes.max_idle_s / 60:g} min)")
+            st.dataframe(session_state_breakdown(), width="stretch", hide_index=True,
+                         column_config={'KB': st.column_config.NumberColumn(format="%.1f")})
+
+        st.download_button(
+            "📥 Exportar métricas (JSON)",
+            json.dumps({'execucao_atual': execucao, 'historico': list(historico),
+                        'pipeline': snapshot.metricas if snapshot is not None else None},
+                       ensure_ascii=False, indent=2),
+            "metricas_desempenho.json",
+            "application/json",
+            key="admin_export_metrics",
+            on_click="ignore",
+            width="stretch"
+        )
+
+        st.markdown("**Perfilamento**")
+        ferramenta = st.selectbox("Ferramenta", instrumentation.available_profilers(), key="admin_profiler")
+        if st.button("Perfilar próxima execução", key="admin_profile_button", width="stretch"):
+            st.session_state["admin_profile_next_run"] = ferramenta
+            st.rerun()
+
+        relatorio = st.session_state.get("admin_profile_report")
+        if relatorio:
+            st.caption(f"Último perfil ({relatorio['ferramenta']})")
+            st.code(relatorio['relatorio'][:20000], language=None)
+            st.download_button(
+                "📥 Baixar perfil",
+                relatorio['relatorio'],
+                "perfil.txt",
+                "text/plain",
+                key="admin_export_profile",
+                on_click="ignore",
+                width="stretch"
+            )
@@ -0,0 +1,39 @@
+import logging
+from typing import Optional
+
+import streamlit as st
+from src.core.tenants import DEFAULT_TENANT
+from src.core.worker import Snapshot
+
+logger = logging.getLogger(__name__)
+
+@st.cache_resource
+def get_availability_api(port: int, host: str = "127.0.0.1", cors_origin: Optional[str] = None):
+    """Uma única API de disponibilidade por processo, compartilhada por todas as sessões"""
+    from src.services.availability_api import AvailabilityApi  # asyncio só quando a API está habilitada
+    api = AvailabilityApi(host, port, cors_origin)
+    try:
+        api.start()
+    except OSError as e:
+        logger.warning("API de disponibilidade não iniciada em %s:%s: %s", host, port, e)
+        return None
+    return api
+
+def configured_availability_api():
+    """
+    API de disponibilidade configurada em secrets.toml, ou None se desabilitada/indisponível.
+    `availability_api_port` habilita; `availability_api_host` (padrão 127.0.0.1, só a máquina local)
+    e `availability_api_cors_origin` (padrão: sem CORS) controlam quem pode consultá-la.
+    """
+    port = st.secrets.get("availability_api_port")
+    if not port:
+        return None
+    return get_availability_api(int(port), st.secrets.get("availability_api_host", "127.0.0.1"),
+                                st.secrets.get("availability_api_cors_origin"))
+
+def publish_availability(snapshot: Snapshot, tenant: str = DEFAULT_TENANT):
+    """Publica o snapshot atual da unidade na API JSON de disponibilidade (quiosque, formulários)"""
+    api = configured_availability_api()
+    if api is not None:
+        # Só reconstrói o índice quando a versão dos dados muda
+        api.publish(snapshot.versao, snapshot.result.df_expandido, snapshot.result.df_salas, tenant)
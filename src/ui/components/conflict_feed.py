@@ -0,0 +1,45 @@
+import json
+import time
+from typing import Set
+
+import streamlit as st
+from src.core.conflict_feed import ConflictFeed
+
+def new_conflict_ids(feed: ConflictFeed) -> Set[str]:
+    """Conflitos que surgiram na última atualização dos dados (para destacar na lista)"""
+    ultima = feed.ultima
+    if ultima is None or ultima.versao != feed.versao:
+        return set()
+    return {c['id'] for c in ultima.novos}
+
+def render_feed_badge(feed: ConflictFeed):
+    """Selo com os conflitos novos/resolvidos na última atualização e o feed de mudanças em JSON"""
+    ultima = feed.ultima
+    if ultima is None:
+        return
+    atual = ultima.versao == feed.versao
+    with st.container(horizontal=True):
+        if ultima.novos:
+            st.badge(f"+{len(ultima.novos)} novos", icon="🆕", color="red")
+        if ultima.resolvidos:
+            st.badge(f"{len(ultima.resolvidos)} resolvidos", icon="✅", color="green")
+    st.caption(f"{'Na última atualização' if atual else 'Na atualização anterior'} "
+               f"({time.strftime('%d/%m %H:%M', time.localtime(ultima.gerado_em))}) • {ultima.mantidos} mantidos")
+
+    with st.popover("Mudanças nos conflitos", width="stretch"):
+        for delta in reversed(feed.since()):
+            st.markdown(f"**{time.strftime('%d/%m %H:%M', time.localtime(delta.gerado_em))}** • "
+                        f"+{len(delta.novos)} / -{len(delta.resolvidos)} • {delta.mantidos} mantidos")
+            for c in delta.novos[:10]:
+                st.caption(f"🆕 {c['sala']} {c['data']}: {c['grupo1']} × {c['grupo2']}")
+            for c in delta.resolvidos[:10]:
+                st.caption(f"✅ {c['sala']} {c['data']}: {c['grupo1']} × {c['grupo2']}")
+        st.download_button(
+            "📥 Feed de mudanças (JSON)",
+            json.dumps(feed.to_dict(), ensure_ascii=False, indent=2),
+            "mudancas_conflitos.json",
+            "application/json",
+            key="conflict_feed_download",
+            on_click="ignore",
+            width="stretch"
+        )
@@ -0,0 +1,55 @@
+import logging
+
+import streamlit as st
+import pandas as pd
+from src.core.tenants import DEFAULT_TENANT
+from src.services.feed_server import FeedServer
+from src.utils.sequence_generator import generate_version
+
+logger = logging.getLogger(__name__)
+
+@st.cache_resource
+def get_feed_server(port: int, host: str = "127.0.0.1"):
+    """Um único servidor de feeds por processo, compartilhado por todas as sessões"""
+    server = FeedServer(host, port)
+    try:
+        server.start()
+    except OSError as e:
+        logger.warning("Servidor de feeds iCalendar não iniciado em %s:%s: %s", host, port, e)
+        return None
+    return server
+
+def configured_feed_server():
+    """
+    Servidor de feeds configurado em secrets.toml, ou None se desabilitado/indisponível.
+    `ical_feed_port` habilita; `ical_feed_host` (padrão 127.0.0.1, só a máquina local) define a interface.
+    """
+    port = st.secrets.get("ical_feed_port")
+    if not port:
+        return None
+    return get_feed_server(int(port), st.secrets.get("ical_feed_host", "127.0.0.1"))
+
+def render_feed_links(df_reservas: pd.DataFrame, tenant: str = DEFAULT_TENANT):
+    """
+    Publica a versão atual das reservas no servidor de feeds e mostra os links de assinatura.
+    Habilitado apenas quando `ical_feed_port` está configurado em secrets.toml.
+    """
+    port = st.secrets.get("ical_feed_port")
+    if not port:
+        return
+
+    server = configured_feed_server()
+    if server is None:
+        st.caption("⚠️ Feeds iCalendar indisponíveis (porta em uso).")
+        return
+    # Só regenera os feeds quando a versão dos dados muda
+    server.publish(generate_version(df_reservas), df_reservas, tenant)
+
+    base_url = st.secrets.get("ical_feed_base_url", f"http://localhost:{port}").rstrip('/')
+    with st.expander("📆 Agenda no celular (iCalendar)"):
+        tipo = st.radio("Feed por", ["Grupo", "Sala"], horizontal=True, key="ical_feed_tipo")
+        tipo_feed = 'grupos' if tipo == "Grupo" else 'salas'
+        nome = st.selectbox(tipo, server.list_feeds(tenant)[tipo_feed], key="ical_feed_nome")
+        if nome:
+            st.code(base_url + FeedServer.feed_path(tipo_feed, nome, tenant), language=None)
+            st.caption("Assine este endereço no aplicativo de calendário do celular.")
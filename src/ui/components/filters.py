@@ -0,0 +1,12 @@
+import streamlit as st
+from src.services.filter_service import build_filter_index
+from src.ui.pipeline import CACHE_MAX_ENTRIES
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def get_cached_reservation_index(df_expandido):
+    """Índices invertidos das ocorrências (sala, grupo, data, dia da semana), montados uma vez por versão dos dados"""
+    return build_filter_index(df_expandido, {
+        'sala': ['Sala'],
+        'grupo': ['Grupo'],
+        'data': ['Data Ocorrência'],
+    }, campo_dia_semana='Dia da semana')
@@ -0,0 +1,40 @@
+import math
+import streamlit as st
+from typing import Tuple
+
+def paginate(total: int, page: int, page_size: int) -> Tuple[int, int, int]:
+    """
+    Calcula a fatia [início, fim) da página pedida.
+    Retorna (início, fim, total de páginas), com a página limitada ao intervalo válido.
+    """
+    n_pages = max(1, math.ceil(total / page_size))
+    page = min(max(int(page), 1), n_pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total), n_pages
+
+def render_pagination(total: int, key: str, page_sizes=(10, 25, 50), reset_on=None) -> Tuple[int, int]:
+    """
+    Desenha os controles de paginação e devolve a fatia [início, fim) a renderizar.
+    Quando `reset_on` muda (ex.: filtros alterados), volta para a primeira página.
+    """
+    page_key = f"{key}_page"
+    signature_key = f"{key}_signature"
+    if reset_on is not None and st.session_state.get(signature_key) != reset_on:
+        st.session_state[signature_key] = reset_on
+        st.session_state[page_key] = 1
+
+    col_tamanho, col_pagina = st.columns(2)
+    with col_tamanho:
+        page_size = st.selectbox("Por página", page_sizes, key=f"{key}_page_size")
+
+    n_pages = max(1, math.ceil(total / page_size))
+    # O total pode ter diminuído desde a última execução
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+
+    with col_pagina:
+        page = st.number_input("Página", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    start, end, _ = paginate(total, page, page_size)
+    st.caption(f"Mostrando {start + 1 if total else 0}–{end} de {total}")
+    return start, end
@@ -0,0 +1,70 @@
+import streamlit as st
+from typing import Dict
+from src.core import writeback
+from src.core.pipeline import PipelineResult
+import src.ui.pipeline as pipeline_ui
+
+# Alterações aceitas aguardando gravação, por linha da planilha (a última aceita vale)
+PENDING_KEY = "writeback_pendentes"
+LAST_RESULT_KEY = "writeback_ultimo_resultado"
+
+def pending() -> Dict[int, writeback.Change]:
+    return st.session_state.setdefault(PENDING_KEY, {})
+
+def _accept(change_factory, *args):
+    change = change_factory(*args)
+    pending()[change.linha] = change
+
+def render_accept_controls(resultado: PipelineResult, conf: Dict, sug: Dict, num: int):
+    """Aceitar a realocação (ou o ajuste de horário) de uma das reservas do conflito"""
+    id_reserva = conf[f'id_reserva{num}']
+    sugeridas = list(sug[f'salas_recomendadas_g{num}']) + sorted(sug[f'outras_salas_livres_g{num}']) if sug else []
+    # As sugestões valem para a data do conflito; a realocação muda a série inteira
+    opcoes = writeback.series_free_rooms(resultado, id_reserva, sugeridas) if sugeridas else []
+    chave = f"wb_{conf['id']}_{num}"
+    if sugeridas and not opcoes:
+        st.caption("Nenhuma sala sugerida está livre em todas as datas da série.")
+    # Callbacks (on_click): a barra de pendências, desenhada antes dos cards, já vê a alteração aceita
+    if opcoes:
+        col_sala, col_botao = st.columns([2, 1], vertical_alignment="bottom")
+        sala = col_sala.selectbox("Mover para", opcoes, key=f"{chave}_sala")
+        col_botao.button("Aceitar", key=f"{chave}_aceitar", width="stretch",
+                         on_click=_accept, args=(writeback.relocation, resultado, id_reserva, sala))
+    if sug and sug.get('ajuste_tempo'):
+        try:
+            writeback.time_shift(resultado, id_reserva, 30)
+            motivo = None
+        except ValueError as e:
+            motivo = str(e)
+        st.button("⏱️ Adiar 30 min", key=f"{chave}_adiar", disabled=motivo is not None, help=motivo,
+                  on_click=_accept, args=(writeback.time_shift, resultado, id_reserva, 30))
+
+def render_pending_bar():
+    """Alterações aceitas e o botão que grava todas de uma vez na planilha"""
+    ultimo = st.session_state.pop(LAST_RESULT_KEY, None)
+    if ultimo is not None:
+        if ultimo.aplicadas:
+            st.success(f"✅ {len(ultimo.aplicadas)} alteração(ões) gravada(s) na planilha.")
+        for change, motivo in ultimo.rejeitadas:
+            st.warning(f"⚠️ {change.descricao}: {motivo}")
+
+    alteracoes = pending()
+    if not alteracoes:
+        return
+    with st.container(border=True):
+        st.markdown(f"**📝 {len(alteracoes)} alteração(ões) aceita(s)** (reservas recorrentes mudam na série inteira)")
+        for change in alteracoes.values():
+            st.markdown(f"- {change.descricao}")
+        col_aplicar, col_descartar = st.columns(2)
+        if col_aplicar.button("Gravar na planilha", type="primary", width="stretch", key="wb_aplicar"):
+            try:
+                with st.spinner("Gravando na planilha..."):
+                    st.session_state[LAST_RESULT_KEY] = pipeline_ui.apply_changes(list(alteracoes.values()))
+                alteracoes.clear()
+            except Exception as e:
+                st.error(f"Erro ao gravar na planilha: {e}")
+                return
+            st.rerun()
+        if col_descartar.button("Descartar", width="stretch", key="wb_descartar"):
+            alteracoes.clear()
+            st.rerun()
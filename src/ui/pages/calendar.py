@@ -1,23 +1,63 @@
 import streamlit as st
 import pandas as pd
 from streamlit_calendar import calendar
-from typing import List, Dict
-from src.services.calendar_service import prepare_events, prepare_resources, generate_calendar_options, generate_color_palette, get_calendar_modes
-from src.services.conflicts_service import calculate_end_hour
+from typing import List, Dict, Set
+from src.services.calendar_service import prepare_resources, generate_calendar_options, get_calendar_modes
+from src.services.conflicts_service import calculate_end_hours
+from src.services.filter_service import build_filter_index, filter_ids
+from src.ui.components.filters import get_cached_reservation_index
+from src.ui.components.pagination import render_pagination
+from src.ui.pipeline import CACHE_MAX_ENTRIES
+from src.ui.session import tracked_fragment
 
-@st.cache_data
-def get_cached_calendar_data(df_expandido, df_salas, groups, ids_em_conflito):
-    colors = generate_color_palette(groups)
-    events = prepare_events(df_expandido, colors, ids_em_conflito)
-    resources = prepare_resources(df_salas)
-    df_expandido["Data Ocorrência View"] = pd.to_datetime(df_expandido["Data Ocorrência"], dayfirst=True).dt.tz_localize(None)
-    return events, resources, df_expandido
+# Intervalo visível do calendário (activeStart, activeEnd): o único estado da página na sessão
+VIEW_KEY = "calendar_visible_range"
 
-def generate_calendar_page(df_expandido: pd.DataFrame, df_salas: pd.DataFrame, conflitos:List[Dict], sugestoes: List[Dict]):
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def get_cached_resources(df_salas):
+    return prepare_resources(df_salas)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def get_cached_event_list(versao, _df_expandido, _ids_em_conflito):
+    """
+    Pré-calcula, uma única vez por versão dos dados (`versao` de result_version; o DataFrame e o
+    conjunto não entram no hash), as colunas de exibição da lista lateral (data, hora fim, conflito)
+    já ordenadas, para que cada página seja apenas uma fatia.
+    Retorna também os índices invertidos da lista (grupo, conflito, dia da semana).
+    """
+    df_lista = _df_expandido[['id_reserva', 'Sala', 'Grupo', 'Atividade', 'Hora Início', 'Hora fim',
+                             'Data Ocorrência']].copy()
+    df_lista['Data Ocorrência View'] = pd.to_datetime(df_lista['Data Ocorrência'], dayfirst=True).dt.tz_localize(None)
+    df_lista['Hora Fim Calculada'] = calculate_end_hours(df_lista['Hora Início'], df_lista['Hora fim'])
+    df_lista['Data Exibição'] = df_lista['Data Ocorrência View'].dt.strftime('%d/%m')
+    df_lista['id_reserva'] = df_lista['id_reserva'].astype(str)
+    df_lista['Conflito'] = df_lista['id_reserva'].isin(_ids_em_conflito)
+    df_lista = df_lista.sort_values(['Data Ocorrência View', 'Hora Início']).reset_index(drop=True)
+    df_lista['Dia Semana View'] = df_lista['Data Ocorrência View'].dt.weekday
+    index_lista = build_filter_index(df_lista, {
+        'grupo': ['Grupo'],
+        'conflito': ['Conflito'],
+        'weekday': ['Dia Semana View'],
+    })
+    return df_lista, index_lista
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def get_cached_conflict_lookup(versao, _conflitos, _sugestoes):
+    """Mapeia id_reserva -> (conflito, sugestão, lado) para consulta O(1) na renderização (uma vez por `versao`)."""
+    dict_sugestoes = {str(s['id_conflito']): s for s in _sugestoes}
+    lookup = {}
+    for c in _conflitos:
+        sug = dict_sugestoes.get(str(c['id']))
+        lookup[str(c['id_reserva1'])] = (c, sug, 'g1')
+        lookup[str(c['id_reserva2'])] = (c, sug, 'g2')
+    return lookup
+
+@tracked_fragment
+def generate_calendar_page(versao: str, df_expandido: pd.DataFrame, df_salas: pd.DataFrame, conflitos:List[Dict],
+                           sugestoes: List[Dict], eventos: List[Dict]):
+    index_reservas = get_cached_reservation_index(df_expandido)
     # IDs em conflito (Set é O(1) - busca instantânea)
     ids_em_conflito = set([c['id_reserva1'] for c in conflitos]).union(set([c['id_reserva2'] for c in conflitos]))
-    if "last_df_view" not in st.session_state:
-        st.session_state["last_df_view"] = pd.DataFrame()  # Inicializa vazio
 
     # col1, col2, col3 = st.columns(3)
     # with col1:
@@ -44,7 +84,7 @@ def generate_calendar_page(df_expandido: pd.DataFrame, df_salas: pd.DataFrame, c
                                             index=0, key="calendar_start_weekday")
             
             group_filter = st.selectbox("Grupos:", 
-                                        options=['Todas'] + sorted(df_expandido['Grupo'].unique()))
+                                        options=['Todas'] + sorted(index_reservas['campos']['grupo'].keys()))
             
             apenas_conflitos = st.toggle("Apenas Conflitos", value=False, key="calendar_only_conflicts")
         
@@ -54,9 +94,9 @@ def generate_calendar_page(df_expandido: pd.DataFrame, df_salas: pd.DataFrame, c
         if weekday_filter != "Todos":
                 hidden_days = [d for d in range(7) if d != weekday_map[weekday_filter]]
         
-        # Cache dos eventos e recursos
-        unique_groups = tuple(df_expandido['Grupo'].unique())
-        events_base, resources, df_expandido = get_cached_calendar_data(df_expandido, df_salas, unique_groups, ids_em_conflito)
+        # Eventos já vêm prontos do pipeline (na mesma ordem das linhas de df_expandido)
+        events_base = eventos
+        resources = get_cached_resources(df_salas)
         calendar_options = generate_calendar_options(resources, mode)
         
         if hidden_days:
@@ -106,12 +146,13 @@ def generate_calendar_page(df_expandido: pd.DataFrame, df_salas: pd.DataFrame, c
         """
         
         if group_filter != "Todas":
-            st.session_state["events"] = [e for e in events_base if e['extendedProps']['grupo'] == group_filter]
+            # Os eventos seguem a ordem das linhas de df_expandido, então as posições do índice valem para ambos
+            eventos_visiveis = [events_base[i] for i in filter_ids(index_reservas, {'grupo': group_filter})]
         else:
-            st.session_state["events"] = events_base
+            eventos_visiveis = events_base
             
         state = calendar(
-            events=st.session_state.get("events", events_base),
+            events=eventos_visiveis,
             options=calendar_options,
             custom_css= full_custom_css,
             key=f"full_calendar_{mode}_{weekday_filter}_{apenas_conflitos}_{group_filter}",
@@ -119,94 +160,81 @@ def generate_calendar_page(df_expandido: pd.DataFrame, df_salas: pd.DataFrame, c
         
         # st.write(state)
 
-    with col_lista:            
-        if state and "eventsSet" in state and "view" in state["eventsSet"]:
-            v_start = pd.to_datetime(state["eventsSet"]["view"]["activeStart"]).tz_localize(None)
-            v_end = pd.to_datetime(state["eventsSet"]["view"]["activeEnd"]).tz_localize(None)
-            
-            mask = (df_expandido['Data Ocorrência View'] >= v_start) & (df_expandido['Data Ocorrência View'] < v_end)
-            df_filtrado = df_expandido.loc[mask].copy()
-            
-            if hidden_days:
-                shown_days = set(range(7)) - set(hidden_days)
-                shown_days_pd = [(d - 1) % 7 for d in shown_days]
-                df_filtrado = df_filtrado[df_filtrado['Data Ocorrência View'].dt.weekday.isin(shown_days_pd)]
-            
-            if apenas_conflitos:
-                df_filtrado = df_filtrado[df_filtrado['id_reserva'].isin(ids_em_conflito)]
-                
-            if group_filter != "Todas":
-                df_filtrado = df_filtrado[df_filtrado['Grupo'] == group_filter]
-            
-            st.session_state["last_df_view"] = df_filtrado.sort_values(['Data Ocorrência View', 'Hora Início'])
+    # A sessão guarda só o intervalo visível; a lista é refeita a partir dos dados compartilhados
+    if state and "eventsSet" in state and "view" in state["eventsSet"]:
+        st.session_state[VIEW_KEY] = (state["eventsSet"]["view"]["activeStart"],
+                                      state["eventsSet"]["view"]["activeEnd"])
 
-        df_view = st.session_state.get("last_df_view", pd.DataFrame())
+    with col_lista:
+        render_event_list(versao, df_expandido, conflitos, sugestoes, ids_em_conflito,
+                          mode, weekday_filter, group_filter, apenas_conflitos, hidden_days)
 
-        # --- OTIMIZAÇÃO DE PERFORMANCE (Lookup Tables) ---
-        # 1. Transformar Series em Set para busca instantânea O(1)
-        set_view_ids = set(df_view['id_reserva'].astype(str))
+@tracked_fragment
+def render_event_list(versao: str, df_expandido: pd.DataFrame, conflitos: List[Dict], sugestoes: List[Dict], ids_em_conflito: Set,
+                      mode: str, weekday_filter: str, group_filter: str, apenas_conflitos: bool, hidden_days: List[int]):
+    """Lista lateral dos eventos no intervalo visível do calendário; a paginação reexecuta só a lista"""
+    df_lista, index_lista = get_cached_event_list(versao, df_expandido, ids_em_conflito)
 
-        # 2. Pré-filtrar conflitos e criar um dicionário de busca por ID de reserva
-        # Isso elimina o loop aninhado dentro da renderização
-        dict_conflitos = {}
-        for c in conflitos:
-            id1, id2 = str(c['id_reserva1']), str(c['id_reserva2'])
-            if id1 in set_view_ids or id2 in set_view_ids:
-                dict_conflitos[id1] = c
-                dict_conflitos[id2] = c
+    df_view = df_lista.iloc[0:0]
+    if VIEW_KEY in st.session_state:
+        v_start, v_end = (pd.to_datetime(d).tz_localize(None) for d in st.session_state[VIEW_KEY])
+        
+        # df_lista já vem ordenada por data: o intervalo visível é uma fatia contínua
+        datas = df_lista['Data Ocorrência View'].to_numpy()
+        inicio_janela = datas.searchsorted(v_start.to_datetime64(), 'left')
+        fim_janela = datas.searchsorted(v_end.to_datetime64(), 'left')
+        
+        filtros = {}
+        if hidden_days:
+            shown_days = set(range(7)) - set(hidden_days)
+            filtros['weekday'] = [(d - 1) % 7 for d in shown_days]
+        if apenas_conflitos:
+            filtros['conflito'] = True
+        if group_filter != "Todas":
+            filtros['grupo'] = group_filter
+        
+        posicoes = filter_ids(index_lista, filtros)
+        posicoes = posicoes[(posicoes >= inicio_janela) & (posicoes < fim_janela)]
+        df_view = df_lista.iloc[posicoes]
 
-        # 3. Criar dicionário de sugestões mapeado pelo ID do conflito
-        dict_sugestoes = {str(s['id_conflito']): s for s in sugestoes}
+    conflitos_por_reserva = get_cached_conflict_lookup(versao, conflitos, sugestoes)
 
-        st.markdown(f"##### 📋 Lista de Eventos ({len(df_view)})")
-        st.space(1)
-        with st.container(height=900):
-            if df_view.empty:
-                st.info("Nenhum evento visível.")
-            else:
-                # Iteração eficiente
-                for idx, row in df_view.head(50).iterrows():
-                    id_atual = str(row.get('id_reserva') or row.get('id'))
-                    
-                    # Busca instantânea nos dicionários (O(1))
-                    conflito_data = dict_conflitos.get(id_atual)
-                    conf_pres = id_atual in ids_em_conflito
-                    
-                    emoji = "🔴" if conf_pres else "🟢"
-                    h_fim = calculate_end_hour(row['Hora Início'], row['Hora fim'])
-                    data_str = row['Data Ocorrência View'].strftime('%d/%m')
-                    
-                    st.markdown(f"""
-                    **{emoji} {row['Sala']}** | ⏰ {data_str} • {row['Hora Início']}-{h_fim}  
-                    👥 {row['Grupo']} | {row['Atividade']}
-                    """)
-                    
-                    if conf_pres and conflito_data:
-                        st.error("⚠️ Conflito!")
-                        # Busca a sugestão usando o ID do conflito encontrado
-                        sug = dict_sugestoes.get(str(conflito_data['id']))
-                        if sug:
-                            if id_atual == conflito_data['id_reserva1']:
-                                salas_recomendadas = sug['salas_recomendadas_g1']
-                                salas_livres = sug['outras_salas_livres_g1']
-                            else:
-                                salas_recomendadas = sug['salas_recomendadas_g2']
-                                salas_livres = sug['outras_salas_livres_g2']
-                                
-                            salas_recomendadas = [s for s in salas_recomendadas if s and str(s).strip()]
-                            salas_livres = [s for s in salas_livres if s and str(s).strip()]
+    st.markdown(f"##### 📋 Lista de Eventos ({len(df_view)})")
+    inicio, fim = render_pagination(len(df_view), key="calendar_event_list",
+                                    reset_on=(mode, weekday_filter, group_filter, apenas_conflitos,
+                                              len(df_view)))
+    with st.container(height=900):
+        if df_view.empty:
+            st.info("Nenhum evento visível.")
+        else:
+            # Apenas a página atual é renderizada; as colunas de exibição já vêm prontas
+            for row in df_view.iloc[inicio:fim].to_dict('records'):
+                id_atual = row['id_reserva']
+                emoji = "🔴" if row['Conflito'] else "🟢"
+                
+                st.markdown(f"""
+                **{emoji} {row['Sala']}** | ⏰ {row['Data Exibição']} • {row['Hora Início']}-{row['Hora Fim Calculada']}  
+                👥 {row['Grupo']} | {row['Atividade']}
+                """)
+                
+                # Busca instantânea no dicionário pré-calculado (O(1))
+                conflito_info = conflitos_por_reserva.get(id_atual)
+                if row['Conflito'] and conflito_info:
+                    st.error("⚠️ Conflito!")
+                    _, sug, lado = conflito_info
+                    if sug:
+                        salas_recomendadas = sug[f'salas_recomendadas_{lado}']
+                        salas_livres = sug[f'outras_salas_livres_{lado}']
                             
-                            if salas_recomendadas or salas_livres:
-                                salas_recomendadas_f = " ".join([f":green-badge[{s}]" for s in sorted(salas_recomendadas)])
-                                salas_livres_f = " ".join([f":orange-badge[{s}]" for s in sorted(salas_livres)])
-                                st.markdown(f"{salas_recomendadas_f} {salas_livres_f}")
-                            else:
-                                st.caption("⚠️ **Atenção:** Não há outras salas disponíveis para este horário.")
-                                                    
-                    st.divider()
-
-
-    # Sincroniza o estado global
-    if state.get("eventsSet") is not None:
-        st.session_state["events"] = state["eventsSet"]
-                        
\ No newline at end of file
+                        salas_recomendadas = [s for s in salas_recomendadas if s and str(s).strip()]
+                        salas_livres = [s for s in salas_livres if s and str(s).strip()]
+                        
+                        if salas_recomendadas or salas_livres:
+                            salas_recomendadas_f = " ".join([f":green-badge[{s}]" for s in sorted(salas_recomendadas)])
+                            salas_livres_f = " ".join([f":orange-badge[{s}]" for s in sorted(salas_livres)])
+                            st.markdown(f"{salas_recomendadas_f} {salas_livres_f}")
+                        else:
+                            st.caption("⚠️ **Atenção:** Não há outras salas disponíveis para este horário.")
+                                                
+                st.divider()
+                    
\ No newline at end of file
@@ -0,0 +1,149 @@
+import streamlit as st
+import pandas as pd
+from typing import List, Dict, Optional, Set
+from src.core.pipeline import PipelineResult
+from src.services.conflicts_service import build_conflict_store, sort_conflict_ids, CONFLICT_SORT_KEYS
+from src.services.filter_service import build_filter_index, filter_ids
+from src.ui.components.pagination import render_pagination
+from src.ui.components import writeback as writeback_component
+from src.ui.pipeline import CACHE_MAX_ENTRIES
+from src.ui.session import tracked_fragment
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def get_cached_conflict_store(versao, _conflitos, _sugestoes):
+    """
+    Store indexado por id + índices invertidos dos filtros, montados uma vez por versão dos dados
+    (`versao` de result_version; as listas não entram no hash)
+    """
+    store = build_conflict_store(_conflitos, _sugestoes)
+    ids = list(store.keys())
+    df_filtros = pd.DataFrame([{
+        'sala': r['conflito']['sala'],
+        'grupo1': r['conflito']['grupo1'],
+        'grupo2': r['conflito']['grupo2'],
+        'data': r['conflito']['data'],
+        'dia_semana': r['conflito']['dia_semana'],
+        'conflito_curto': r['conflito_curto'],
+    } for r in store.values()], columns=['sala', 'grupo1', 'grupo2', 'data', 'dia_semana', 'conflito_curto'])
+    index = build_filter_index(df_filtros, {
+        'sala': ['sala'],
+        'grupo': ['grupo1', 'grupo2'],
+        'data': ['data'],
+        'conflito_curto': ['conflito_curto'],
+    }, campo_dia_semana='dia_semana')
+    return store, ids, index
+
+def render_reserva(conf: Dict, sug: Dict, num: int, resultado: Optional[PipelineResult] = None):
+    """Renderiza uma das reservas do conflito com suas salas sugeridas"""
+    st.markdown(f"**Reserva {num}**")
+    with st.container():
+        texto = f"""
+        **{conf[f'grupo{num}']}** *{conf[f'atividade{num}']}* 🕒 {conf[f'horario{num}']}  
+        👤 {conf[f'responsavel{num}']}
+        """
+        # Usamos 'warning' para diferenciar a segunda reserva e criar o tom laranja
+        if num == 1:
+            st.info(texto)
+        else:
+            st.warning(texto)
+
+        salas_recomendadas = sug[f'salas_recomendadas_g{num}'] if sug else []
+        salas_livres = sug[f'outras_salas_livres_g{num}'] if sug else []
+        if salas_recomendadas:
+            with st.success("💡 **Sugestão de realocação:**"):
+                st.markdown(f"Salas recomendadas neste dia e horário:")
+                # Exibe as salas como "tags" usando st.write ou markdown
+                salas_formatadas = " ".join([f":green-badge[{s}]" for s in sorted(salas_recomendadas)])
+                st.markdown(f"**Salas Recomendadas:** {salas_formatadas}")
+        if salas_livres:
+            salas_formatadas = " ".join([f":orange-badge[{s}]" for s in sorted(salas_livres)])
+            st.markdown(f"**Demais salas Livres:** {salas_formatadas}")
+        else:
+            with st.warning("⚠️ **Atenção:** Não há outras salas disponíveis para este horário."):
+                st.markdown("Considere ajustar o horário ou entrar em contato com a administração.")
+        if resultado is not None:
+            writeback_component.render_accept_controls(resultado, conf, sug, num)
+
+@tracked_fragment
+def generate_conflicts_page(versao: str, conflitos: List[Dict], sugestoes: List[Dict],
+                            resultado: Optional[PipelineResult] = None, novos: Optional[Set[str]] = None):
+    """
+    `versao` (result_version do snapshot) chaveia os caches da página; `resultado` habilita aceitar realocações e gravá-las na planilha (write-back);
+    `novos` são os ids dos conflitos surgidos na última atualização (destacados com 🆕).
+    Fragmento: filtros, ordenação e paginação reexecutam só esta aba.
+    """
+    # Cabeçalho com ícone e contagem
+    st.subheader(f"⚠️ Conflitos Identificados ({len(conflitos)})")
+    if resultado is not None:
+        writeback_component.render_pending_bar()
+
+    if not conflitos:
+        # Layout de Sucesso (CheckCircle do React)
+        container_sucesso = st.container(border=True)
+        with container_sucesso:
+            st.markdown("<h1 style='text-align: center;'>✅</h1>", unsafe_allow_html=True)
+            st.markdown("<h3 style='text-align: center; color: #166534;'>Parabéns!</h3>", unsafe_allow_html=True)
+            st.markdown("<p style='text-align: center; color: #666;'>Nenhum conflito encontrado</p>", unsafe_allow_html=True)
+        return
+
+    # Índice por id do conflito (O(1) para achar a sugestão de cada card)
+    store, ids, index = get_cached_conflict_store(versao, conflitos, sugestoes)
+
+    # --- ÁREA DE FILTROS ---
+    col_f1, col_f2, col_f3, col_f4, col_f5 = st.columns(5)
+    with col_f1:
+        salas = sorted(index['campos']['sala'].keys())
+        filtro_sala = st.selectbox("Filtrar por Sala", ["Todas"] + salas)
+    with col_f2:
+        grupos = sorted(index['campos']['grupo'].keys())
+        filtro_grupo = st.selectbox("Filtrar por Grupo", ["Todos"] + grupos)
+    with col_f3:
+        filtro_duracao = st.selectbox("Filtrar por Duração do conflito", ["Todos", "Menos de 30min"])
+    with col_f4:
+        filtro_dia_semana = st.selectbox("Filtrar por Dia da Semana", ["Todos", "Domingo", "Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado"])
+    with col_f5:
+        filtro_data = st.date_input("Filtrar por Data", value=None, format="DD/MM/YYYY")
+
+    # Filtros lógicos (interseção dos índices invertidos)
+    posicoes = filter_ids(index, {
+        'sala': [] if filtro_sala == "Todas" else [filtro_sala],
+        'grupo': [] if filtro_grupo == "Todos" else [filtro_grupo],
+        'conflito_curto': [] if filtro_duracao == "Todos" else [True],
+        'dia_semana': [] if filtro_dia_semana == "Todos" else [filtro_dia_semana],
+        'data': [filtro_data.strftime('%d/%m/%Y')] if filtro_data else [],
+    })
+
+    # --- ORDENAÇÃO E PAGINAÇÃO ---
+    col_ordem, col_sentido, col_paginas = st.columns([1, 1, 2])
+    with col_ordem:
+        ordem = st.selectbox("Ordenar por", list(CONFLICT_SORT_KEYS.keys()), key="conflicts_sort")
+    with col_sentido:
+        st.space("small")
+        decrescente = st.toggle("Decrescente", value=False, key="conflicts_sort_desc")
+
+    ids_ordenados = sort_conflict_ids(store, [ids[p] for p in posicoes], ordem, decrescente)
+    with col_paginas:
+        inicio, fim = render_pagination(len(ids_ordenados), key="conflicts_list",
+                                        reset_on=(filtro_sala, filtro_grupo, filtro_duracao,
+                                                  filtro_dia_semana, filtro_data, ordem, decrescente))
+
+    # --- LISTAGEM DE CONFLITOS (CARD STYLE NATIVO) ---
+    # Apenas os cards da página atual são renderizados
+    for id_conflito in ids_ordenados[inicio:fim]:
+        registro = store[id_conflito]
+        conf, sug = registro['conflito'], registro['sugestao']
+        cor = "🟢" if registro['resolvido'] else "🔴"
+        ajuste_tempo = sug['ajuste_tempo'] if sug else ""
+        # Usamos um container com borda para simular o "card"
+        novo = "🆕 " if novos and id_conflito in novos else ""
+        with st.expander(f"{novo}{cor} {conf['sala']} | {conf['grupo1']} & {conf['grupo2']} ({conf['data']})"):
+            # Cabeçalho do Card
+            st.markdown(f"### 📍 {conf['sala']} :violet-badge[{ajuste_tempo}]")
+            st.markdown(f"📅 Data: {conf['data']}")
+
+            # Corpo do Card (As duas reservas lado a lado)
+            res1_col, res2_col = st.columns(2)
+            with res1_col:
+                render_reserva(conf, sug, 1, resultado)
+            with res2_col:
+                render_reserva(conf, sug, 2, resultado)
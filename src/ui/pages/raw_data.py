@@ -0,0 +1,234 @@
+import streamlit as st
+import pandas as pd
+from typing import List, Dict
+from src.services.conflicts_service import convert_series_to_minutes
+from src.services.export_service import EXPORT_FORMATS, build_export, export_file_name
+from src.services.filter_service import DIAS_SEMANA, filter_ids
+from src.services.grid_service import build_sorted_grid, sorted_positions, grid_page
+from src.ui.components.filters import get_cached_reservation_index
+from src.ui.components.pagination import render_pagination
+from src.ui.pages.conflicts import get_cached_conflict_store
+from src.ui.pipeline import CACHE_MAX_ENTRIES
+from src.ui.session import tracked_fragment
+
+GRID_PAGE_SIZES = (50, 100, 250)
+
+RESERVAS_COLUMN_ORDER = ["Data", 'Dia da semana', "Sala", "Hora Início", "Hora fim", "Grupo", "Atividade",
+                         "Responsável"]
+
+CONFLITOS_COLUMN_ORDER = [
+    "data", "dia_semana", "sala",
+    "horario1", "Grupo A (Responsáveis)", "atividade1",
+    "horario2", "Grupo B (Responsáveis)", "atividade2"
+]
+
+CONFLITOS_COLUMN_NAMES = {
+    "data": "Data",
+    "dia_semana": "Dia da Semana",
+    "sala": "Sala",
+    "horario1": "Horário A",
+    "horario2": "Horário B",
+    "atividade1": "Atividade A",
+    "atividade2": "Atividade B",
+    "Grupo A (Responsáveis)": "Grupo A (Responsáveis)",
+    "Grupo B (Responsáveis)": "Grupo B (Responsáveis)"
+}
+
+def formatar_grupo_resp(grupo: str, resps_raw: str) -> str:
+    # Divide pela barra, pega até 2 nomes e limpa espaços (ex: "João/Maria/José")
+    resps_lista = [r.strip() for r in str(resps_raw).split('/') if r.strip()][:2]
+    if resps_lista:
+        return f"{grupo} ({' / '.join(resps_lista)})"
+    return grupo
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def get_cached_reservation_grid(df_expandido):
+    """
+    Grade tipada das ocorrências (mesma ordem de linhas do índice de filtros),
+    com as ordenações pré-calculadas uma vez por versão dos dados.
+    """
+    df = df_expandido[['Data Ocorrência'] + RESERVAS_COLUMN_ORDER[1:]].reset_index(drop=True)
+    df['Data'] = pd.to_datetime(df['Data Ocorrência'], dayfirst=True, format='%d/%m/%Y', errors='coerce')
+    df['Início (min)'] = convert_series_to_minutes(df['Hora Início'])
+    grid = build_sorted_grid(df, {
+        "Data": ['Data', 'Início (min)'],
+        "Sala": ['Sala', 'Data', 'Início (min)'],
+        "Grupo": ['Grupo', 'Data', 'Início (min)'],
+    })
+    return grid
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def get_cached_conflict_grid(versao, _conflitos, _sugestoes):
+    """Grade tipada dos conflitos, com as colunas de exibição já formatadas (uma vez por `versao`)"""
+    store, ids, _ = get_cached_conflict_store(versao, _conflitos, _sugestoes)
+    df = pd.DataFrame([store[i]['conflito'] for i in ids],
+                      columns=['data', 'dia_semana', 'sala', 'horario1', 'grupo1', 'responsavel1', 'atividade1',
+                               'horario2', 'grupo2', 'responsavel2', 'atividade2'])
+    df['Grupo A (Responsáveis)'] = [formatar_grupo_resp(g, r) for g, r in zip(df['grupo1'], df['responsavel1'])]
+    df['Grupo B (Responsáveis)'] = [formatar_grupo_resp(g, r) for g, r in zip(df['grupo2'], df['responsavel2'])]
+    df['data'] = pd.to_datetime(df['data'], dayfirst=True, format='%d/%m/%Y', errors='coerce')
+    df['Início (min)'] = convert_series_to_minutes(df['horario1'].str.split('-').str[0])
+    df = df[CONFLITOS_COLUMN_ORDER + ['Início (min)']]
+    grid = build_sorted_grid(df, {
+        "Data": ['data', 'Início (min)'],
+        "Sala": ['sala', 'data', 'Início (min)'],
+    })
+    return grid
+
+def export_grid(grid, posicoes, colunas, formato, renomear=None) -> bytes:
+    """
+    Gera o arquivo de exportação sob demanda (só quando o botão é clicado). Sem cache: o Streamlit
+    já guarda os bytes do download na sessão, e uma segunda cópia por filtro/formato só ocuparia memória.
+    """
+    df = grid['frame'].iloc[posicoes][colunas]
+    if renomear:
+        df = df.rename(columns=renomear)
+    return build_export(df, formato)
+
+def render_grid_controls(ordens, key: str):
+    """Seletores de ordenação da grade"""
+    col_ordem, col_sentido = st.columns(2)
+    with col_ordem:
+        ordem = st.selectbox("Ordenar por", ordens, key=f"{key}_sort")
+    with col_sentido:
+        st.space("small")
+        decrescente = st.toggle("Decrescente", value=False, key=f"{key}_sort_desc")
+    return ordem, decrescente
+
+def render_export_button(nome: str, grid, posicoes, colunas, renomear=None):
+    """Botão de exportação com escolha de formato; o arquivo só é gerado no clique"""
+    with st.popover("📥 Exportar", width="stretch"):
+        formato = st.radio("Formato", list(EXPORT_FORMATS.keys()), horizontal=True, key=f"{nome}_export_format")
+        st.download_button(
+                    f"Baixar {formato}",
+                    lambda: export_grid(grid, posicoes, colunas, formato, renomear),
+                    export_file_name(nome, formato),
+                    EXPORT_FORMATS[formato][1],
+                    key=f"{nome}_export_download",
+                    on_click="ignore",
+                    width="stretch"
+                )
+
+@tracked_fragment
+def generate_raw_data_page(versao: str, df_expandido: pd.DataFrame, conflitos: List[Dict], sugestoes: List[Dict],
+                           conflitos_prontos: bool = True):
+    """
+    `versao` (result_version do snapshot) chaveia os caches derivados dos conflitos.
+    `conflitos_prontos=False` enquanto o resultado ainda é parcial (conflitos em detecção).
+    Cada grade é um fragmento: filtrar/ordenar/paginar uma não reexecuta a outra.
+    """
+    st.subheader("📋 Dados Brutos")
+
+    tab_reservas, tab_conflitos = st.tabs([
+        "Reservas",
+        "Conflitos"
+    ])
+
+    with tab_reservas:
+        render_reservations_grid(df_expandido)
+
+    with tab_conflitos:
+        render_conflicts_grid(versao, conflitos, sugestoes, conflitos_prontos)
+
+@tracked_fragment
+def render_reservations_grid(df_expandido: pd.DataFrame):
+    """Grade das ocorrências: filtros, ordenação, paginação e exportação"""
+    index_reservas = get_cached_reservation_index(df_expandido)
+    grid = get_cached_reservation_grid(df_expandido)
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        salas = st.multiselect("Salas", options=sorted(index_reservas['campos']['sala'].keys()), placeholder="Todas")
+    with col2:
+        grupos = st.multiselect("Grupos", options=sorted(index_reservas['campos']['grupo'].keys()), placeholder="Todos")
+    with col3:
+        dias = st.multiselect("Dias", options=DIAS_SEMANA, placeholder="Todos")
+    with col4:
+        data = st.date_input("Data", value=None, format="DD/MM/YYYY")
+
+    # Filtros combinados por interseção dos índices invertidos
+    posicoes = filter_ids(index_reservas, {
+        'sala': salas,
+        'grupo': grupos,
+        'dia_semana': dias,
+        'data': [data.strftime('%d/%m/%Y')] if data else [],
+    })
+
+    col_ordem, col_paginas = st.columns(2)
+    with col_ordem:
+        ordem, decrescente = render_grid_controls(list(grid['ordens'].keys()), key="raw_reservas")
+    posicoes = sorted_positions(grid, posicoes, ordem, decrescente)
+    with col_paginas:
+        inicio, fim = render_pagination(len(posicoes), key="raw_reservas", page_sizes=GRID_PAGE_SIZES,
+                                        reset_on=(tuple(salas), tuple(grupos), tuple(dias), data,
+                                                  ordem, decrescente))
+
+    with col5:
+        st.space("small")
+        render_export_button("reservas", grid, posicoes, RESERVAS_COLUMN_ORDER)
+
+    # Só a página atual é enviada ao navegador
+    st.dataframe(
+        grid_page(grid, posicoes, inicio, fim)[RESERVAS_COLUMN_ORDER],
+        width="stretch",
+        height=400,
+        hide_index=True,
+        column_config={
+            "Data": st.column_config.DateColumn(format="DD/MM/YYYY")
+        }
+    )
+
+@tracked_fragment
+def render_conflicts_grid(versao: str, conflitos: List[Dict], sugestoes: List[Dict], conflitos_prontos: bool):
+    """Grade dos conflitos: filtros, ordenação, paginação e exportação"""
+    if not conflitos_prontos:
+        st.info("🔎 Detectando conflitos...")
+        return
+    if not conflitos:
+        st.info("Nenhum conflito detectado.")
+        return
+
+    _, _, index_conf = get_cached_conflict_store(versao, conflitos, sugestoes)
+    grid_conf = get_cached_conflict_grid(versao, conflitos, sugestoes)
+
+    c1, c2, c3, c4, c5 = st.columns(5)
+    with c1: salas_conf = st.multiselect("Salas", sorted(index_conf['campos']['sala'].keys()), key="c_s", placeholder="Todas")
+    with c2: grupos_conf = st.multiselect("Grupos", sorted(index_conf['campos']['grupo'].keys()), key="c_g", placeholder="Todos")
+    with c3: dias_conf = st.multiselect("Dias", options=DIAS_SEMANA, key="c_d", placeholder="Todos")
+    with c4: data_conf = st.date_input("Data", value=None, format="DD/MM/YYYY", key="c_dt")
+
+    # --- FILTRAGEM ---
+    posicoes_conf = filter_ids(index_conf, {
+        'sala': salas_conf,
+        'grupo': grupos_conf,
+        'dia_semana': dias_conf,
+        'data': [data_conf.strftime('%d/%m/%Y')] if data_conf else [],
+    })
+
+    col_ordem, col_paginas = st.columns(2)
+    with col_ordem:
+        ordem_conf, decrescente_conf = render_grid_controls(list(grid_conf['ordens'].keys()), key="raw_conflitos")
+    posicoes_conf = sorted_positions(grid_conf, posicoes_conf, ordem_conf, decrescente_conf)
+    with col_paginas:
+        inicio, fim = render_pagination(len(posicoes_conf), key="raw_conflitos", page_sizes=GRID_PAGE_SIZES,
+                                        reset_on=(tuple(salas_conf), tuple(grupos_conf), tuple(dias_conf),
+                                                  data_conf, ordem_conf, decrescente_conf))
+
+    with c5:
+        st.space("small")
+        render_export_button("conflitos", grid_conf, posicoes_conf, CONFLITOS_COLUMN_ORDER,
+                             renomear=CONFLITOS_COLUMN_NAMES)
+
+    column_config = {**CONFLITOS_COLUMN_NAMES}
+    column_config['data'] = st.column_config.DateColumn(
+        "Data",
+        format="DD/MM/YYYY"
+    )
+    # --- EXIBIÇÃO ---
+    st.dataframe(
+        grid_page(grid_conf, posicoes_conf, inicio, fim)[CONFLITOS_COLUMN_ORDER],
+        width="stretch",
+        height=400,
+        hide_index=True,
+        column_config=column_config
+    )
@@ -0,0 +1,157 @@
+import streamlit as st
+import pandas as pd
+from typing import List, Tuple
+from src.core import pipeline, writeback
+from src.core.diagnostics import Diagnostic
+from src.core.result_cache import ResultCache
+from src.core.tenants import Tenant, TenantRegistry, parse_tenants
+from src.core.worker import PipelineWorker, Snapshot
+from src.services import gsheet_service
+
+# Ponte entre o Streamlit e o pipeline headless (src/core/pipeline.py).
+# Um TenantRegistry por processo (st.cache_resource) mantém um PipelineWorker por unidade,
+# que calcula os dados e publica snapshots imutáveis; as sessões apenas leem o snapshot atual.
+
+# Limite de entradas dos st.cache_data das páginas: as chaves dependem do conteúdo,
+# então cada unidade/versão gera entradas novas e o limite mantém a memória estável.
+CACHE_MAX_ENTRIES = 16
+
+DEFAULT_RESULT_CACHE_DIR = ".cache/pipeline"
+
+# Chaves de sessão mantidas ao trocar de unidade (filtros e paginação são descartados)
+SESSION_KEYS_KEPT = ("tenant", "calendar_reset_token")
+
+# Intervalo de consulta ao worker enquanto o resultado ainda é parcial (partida a frio)
+PROGRESS_POLL_SECONDS = 0.5
+PROGRESS_STEPS = {
+    pipeline.FASE_OCORRENCIAS: (1 / 3, "📅 Ocorrências prontas • detectando conflitos..."),
+    pipeline.FASE_CONFLITOS: (2 / 3, "⚠️ Conflitos prontos • calculando sugestões de realocação..."),
+}
+
+@st.cache_resource(show_spinner=False)
+def get_tenant_registry(_tenants: Tuple[Tenant, ...], chave: Tuple, memoria_max_mb: float, max_cargas: int,
+                        intervalo_s=None, cache_dir: str = "", sqlite_dir: str = "") -> TenantRegistry:
+    cache = ResultCache(cache_dir) if cache_dir else None
+    registry = TenantRegistry(list(_tenants), memoria_max_mb, max_cargas, intervalo_s, cache, sqlite_dir or None)
+    from src.ui.components.feeds import configured_feed_server
+    server = configured_feed_server()
+    if server is not None:
+        registry.on_evict(server.remove)
+    from src.ui.components.availability import configured_availability_api
+    api = configured_availability_api()
+    if api is not None:
+        registry.on_evict(api.remove)
+    return registry
+
+def get_tenants() -> List[Tenant]:
+    """
+    Unidades configuradas em secrets.toml ([tenants.<id>] com spreadsheet_id ou snapshot_dir).
+    Sem [tenants], a unidade única vem de `snapshot_dir` (gerado com `python -m src.cli pull`)
+    ou de `spreadsheet_id` + `gcp_service_account`.
+    """
+    return parse_tenants(st.secrets)
+
+def get_registry() -> TenantRegistry:
+    tenants = tuple(get_tenants())
+    intervalo = st.secrets.get("pipeline_refresh_seconds")
+    return get_tenant_registry(
+        tenants,
+        tuple((t.id, t.tipo, t.chave) for t in tenants),
+        float(st.secrets.get("tenant_memory_mb", 512)),
+        int(st.secrets.get("max_concurrent_loads", 4)),
+        float(intervalo) if intervalo else None,
+        # Resultados em disco para partidas a frio instantâneas ("" desativa)
+        st.secrets.get("result_cache_dir", DEFAULT_RESULT_CACHE_DIR),
+        # Banco SQLite por unidade para conflitos/salas livres indexados (vazio = DataFrames em memória)
+        st.secrets.get("sqlite_dir", "")
+    )
+
+def current_tenant() -> Tenant:
+    tenants = {t.id: t for t in get_tenants()}
+    escolhido = st.session_state.get("tenant") or st.query_params.get("tenant")
+    return tenants.get(escolhido) or next(iter(tenants.values()))
+
+def _on_tenant_change():
+    for chave in list(st.session_state.keys()):
+        if chave not in SESSION_KEYS_KEPT and not str(chave).startswith("admin_"):
+            del st.session_state[chave]
+    st.session_state.calendar_reset_token = st.session_state.get("calendar_reset_token", 0) + 1
+    st.query_params["tenant"] = st.session_state["tenant"]
+
+def render_tenant_selector():
+    """Seletor de unidade (só aparece com mais de uma configurada)"""
+    tenants = get_tenants()
+    if len(tenants) < 2:
+        return
+    nomes = {t.id: t.nome for t in tenants}
+    if st.session_state.get("tenant") not in nomes:
+        st.session_state["tenant"] = current_tenant().id
+    st.selectbox("🏛️ Unidade", list(nomes), format_func=nomes.get, key="tenant", on_change=_on_tenant_change)
+
+def get_worker() -> PipelineWorker:
+    return get_registry().get(current_tenant().id)
+
+def get_snapshot() -> Snapshot:
+    """Snapshot atual da unidade; no primeiro acesso espera o worker terminar"""
+    worker = get_worker()
+    return worker.snapshot or worker.wait_for(1)
+
+def result_version(snapshot: Snapshot) -> str:
+    """
+    Chave dos caches da interface derivados do resultado: versão dos dados + fase (os resultados
+    parciais compartilham a versão). Com ela, st.cache_data não precisa hashear listas e DataFrames
+    inteiros a cada clique — os argumentos com "_" ficam fora do hash.
+    """
+    return f"{snapshot.versao}:{snapshot.result.fase}"
+
+def refresh() -> Snapshot:
+    """Pede um novo cálculo ao worker da unidade e espera o snapshot correspondente"""
+    worker = get_worker()
+    return worker.wait_for(worker.request_refresh())
+
+@st.fragment(run_every=PROGRESS_POLL_SECONDS)
+def _poll_snapshot(exibido: int):
+    """Reexecuta o app quando o worker publicar um snapshot diferente do que está na tela"""
+    atual = get_worker().snapshot
+    if atual is not None and id(atual) != exibido:
+        st.rerun(scope="app")
+
+def render_progress(snapshot: Snapshot):
+    """Barra de progresso enquanto o resultado é parcial; some quando o pipeline termina"""
+    if snapshot.result.completo:
+        return
+    valor, texto = PROGRESS_STEPS.get(snapshot.result.fase, (0.0, "Processando..."))
+    st.progress(valor, text=texto)
+    _poll_snapshot(id(snapshot))
+
+def writeback_enabled() -> bool:
+    """Gravação de realocações na planilha: `writeback = true` em secrets.toml e unidade ligada a uma planilha"""
+    return bool(st.secrets.get("writeback", False)) and current_tenant().tipo == 'gsheets'
+
+def apply_changes(changes: List[writeback.Change]) -> writeback.ApplyResult:
+    """Grava as alterações na aba Reservas (um único batch) e corrige o snapshot em memória, sem recarregar"""
+    tenant = current_tenant()
+    worker = get_worker()
+    diagnostics: List[Diagnostic] = []
+    worksheet = gsheet_service.open_worksheet(tenant.chave, tenant.creds, "Reservas")
+    resultado = writeback.apply_changes(worksheet, changes, diagnostics)
+    if resultado.aplicadas:
+        worker.publish_patch(writeback.patch_result(worker.snapshot.result, resultado.aplicadas, diagnostics))
+    return resultado
+
+def render_diagnostics(diagnostics: List[Diagnostic]):
+    """Resumo dos avisos/erros do pipeline"""
+    if not diagnostics:
+        return
+    erros = [d for d in diagnostics if d.level == 'error']
+    avisos = [d for d in diagnostics if d.level != 'error']
+    titulo = f"⚠️ Diagnósticos ({len(erros)} erros, {len(avisos)} avisos)"
+    # `row` é a posição da reserva no DataFrame; a coluna mostra a linha na planilha (com o cabeçalho)
+    df = pd.DataFrame([d.to_dict() for d in diagnostics])
+    df['row'] = df['row'].astype('Int64') + writeback.PRIMEIRA_LINHA
+    with st.expander(titulo, expanded=bool(erros)):
+        st.dataframe(
+            df.rename(columns={'level': 'Nível', 'stage': 'Etapa', 'message': 'Mensagem', 'row': 'Linha'}),
+            width="stretch",
+            hide_index=True
+        )
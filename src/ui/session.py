@@ -0,0 +1,158 @@
+import functools
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from src.ui.components.writeback import PENDING_KEY
+from src.ui.pipeline import SESSION_KEYS_KEPT
+
+# Estado por sessão: só descritores pequenos (filtros, intervalo visível, página); os dados
+# (eventos, listas, índices) são compartilhados entre as sessões pelos caches do processo.
+# Este módulo mede o estado de cada sessão e descarta o de sessões ociosas.
+
+DEFAULT_IDLE_MINUTES = 30
+
+# Mantidos mesmo após a ociosidade (alterações aceitas ainda não gravadas não se perdem)
+IDLE_KEYS_KEPT = SESSION_KEYS_KEPT + (PENDING_KEY,)
+
+def state_size(valor, vistos: Optional[set] = None) -> int:
+    """Estimativa (bytes) da memória de um valor do session_state, incluindo o que ele referencia"""
+    vistos = set() if vistos is None else vistos
+    if id(valor) in vistos:
+        return 0
+    vistos.add(id(valor))
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        uso = valor.memory_usage(deep=True)
+        return int(uso.sum() if isinstance(uso, pd.Series) else uso)
+    if isinstance(valor, np.ndarray):
+        return int(valor.nbytes)
+    tamanho = sys.getsizeof(valor)
+    if isinstance(valor, dict):
+        tamanho += sum(state_size(k, vistos) + state_size(v, vistos) for k, v in valor.items())
+    elif isinstance(valor, (list, tuple, set, frozenset, deque)):
+        tamanho += sum(state_size(v, vistos) for v in valor)
+    elif hasattr(valor, '__dict__'):
+        tamanho += state_size(vars(valor), vistos)
+    return tamanho
+
+class SessionRegistry:
+    """
+    Sessões do processo com o último acesso e o tamanho do estado de cada uma. As referências ao
+    estado são fracas (a sessão encerrada pelo Streamlit some sozinha); as ociosas por mais de
+    `max_idle_s` têm o estado descartado, exceto IDLE_KEYS_KEPT.
+    """
+
+    def __init__(self, max_idle_s: float):
+        self.max_idle_s = max_idle_s
+        self.descartes = 0
+        self._sessoes: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, session_id: str, estado, tamanho: int, agora: Optional[float] = None):
+        agora = time.time() if agora is None else agora
+        with self._lock:
+            self._sessoes[session_id] = {'estado': weakref.ref(estado), 'ultimo_acesso': agora, 'bytes': tamanho}
+
+    def resize(self, session_id: str, tamanho: int):
+        with self._lock:
+            if session_id in self._sessoes:
+                self._sessoes[session_id]['bytes'] = tamanho
+
+    def last_access(self, session_id: str) -> Optional[float]:
+        sessao = self._sessoes.get(session_id)
+        return sessao['ultimo_acesso'] if sessao else None
+
+    def evict_idle(self, agora: Optional[float] = None) -> int:
+        """Descarta o estado das sessões ociosas; retorna quantas foram descartadas"""
+        agora = time.time() if agora is None else agora
+        with self._lock:
+            ociosas = [(sid, s) for sid, s in self._sessoes.items() if agora - s['ultimo_acesso'] > self.max_idle_s]
+            for sid, _ in ociosas:
+                del self._sessoes[sid]
+        for _, sessao in ociosas:
+            estado = sessao['estado']()
+            if estado is not None:
+                clear_state(estado)
+        self.descartes += len(ociosas)
+        return len(ociosas)
+
+    def usage(self) -> Dict[str, int]:
+        """Bytes do estado de cada sessão viva (medidos na última execução de cada uma)"""
+        with self._lock:
+            return {sid: s['bytes'] for sid, s in self._sessoes.items() if s['estado']() is not None}
+
+def clear_state(estado):
+    """Remove do estado da sessão tudo, exceto IDLE_KEYS_KEPT (widgets voltam ao padrão)"""
+    for chave in list(estado.filtered_state.keys()):
+        if chave not in IDLE_KEYS_KEPT:
+            try:
+                del estado[chave]
+            except KeyError:
+                pass
+
+@st.cache_resource(show_spinner=False)
+def get_session_registry(max_idle_s: float) -> SessionRegistry:
+    return SessionRegistry(max_idle_s)
+
+def get_registry() -> SessionRegistry:
+    return get_session_registry(float(st.secrets.get("session_idle_minutes", DEFAULT_IDLE_MINUTES)) * 60)
+
+def track_session():
+    """
+    Chamado no início de cada execução: se esta sessão ficou ociosa além do limite, começa com o
+    estado limpo; registra o acesso e o tamanho do estado, e descarta o das outras sessões ociosas.
+    """
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    registry = get_registry()
+    ultimo = registry.last_access(ctx.session_id)
+    if ultimo is not None and time.time() - ultimo > registry.max_idle_s:
+        clear_state(ctx.session_state)
+    # Referência ao SessionState da sessão (o invólucro de ctx.session_state muda a cada execução)
+    registry.touch(ctx.session_id, getattr(ctx.session_state, '_state', ctx.session_state), session_state_size())
+    registry.evict_idle()
+
+def measure_session():
+    """Atualiza o tamanho do estado desta sessão ao fim da execução (o que fica residente até a próxima)"""
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        get_registry().resize(ctx.session_id, session_state_size())
+
+def _fragment_only_run() -> bool:
+    """True quando esta execução é só do fragmento em andamento (interação dentro dele)"""
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run and ctx.current_fragment_id in ctx.fragment_ids_this_run)
+
+def tracked_fragment(func):
+    """
+    st.fragment que mantém o registro da sessão: as interações dentro dele reexecutam só a função
+    (com os argumentos da última execução completa) e não passam por main(), então o acesso e o
+    tamanho do estado são registrados aqui.
+    """
+    @functools.wraps(func)
+    def executar(*args, **kwargs):
+        if not _fragment_only_run():
+            return func(*args, **kwargs)
+        track_session()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            measure_session()
+    return st.fragment(executar)
+
+def session_state_size() -> int:
+    return sum(state_size(v) for v in st.session_state.to_dict().values())
+
+def session_state_breakdown() -> pd.DataFrame:
+    """Bytes por chave do estado desta sessão, da maior para a menor"""
+    tamanhos = {chave: state_size(valor) for chave, valor in st.session_state.to_dict().items()}
+    return (pd.DataFrame({'Chave': list(tamanhos), 'KB': [b / 1024 for b in tamanhos.values()]})
+            .sort_values('KB', ascending=False, ignore_index=True))
@@ -1,6 +1,13 @@
 import hashlib
+import pandas as pd
 from typing import List
 
 def generate_id(key_parts: List[str]) -> str:
     string_base = "-".join(map(str, key_parts))
-    return hashlib.md5(string_base.encode()).hexdigest()[:8]
\ No newline at end of file
+    return hashlib.md5(string_base.encode()).hexdigest()[:8]
+
+def generate_version(df: pd.DataFrame) -> str:
+    """Impressão digital do conteúdo (colunas + valores) de um DataFrame, usada como versão do dataset"""
+    digest = hashlib.md5("|".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:12]
\ No newline at end of file